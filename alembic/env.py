@@ -4,11 +4,15 @@ from sqlalchemy import engine_from_config, pool
 
 from alembic import context
 from src.pwcexercise.models.base import Base
+from src.pwcexercise.models.change import Change, ChangeLogState
 from src.pwcexercise.models.department import Department
 from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.job import Job
 from src.pwcexercise.models.job_title import JobTitle
 from src.pwcexercise.models.performance_review import PerformanceReview
+from src.pwcexercise.models.reference_version import ReferenceVersion
 from src.pwcexercise.models.salary import Salary
+from src.pwcexercise.utils.data_migration import CHECKPOINT_TABLE
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -26,6 +30,18 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names):
+    """Leave the FTS5 indexes, their shadow tables, the data migration
+    checkpoints and the employees kept by the emp_id merge out of
+    autogenerate."""
+    if type_ == "table":
+        return not name.startswith(
+            ("performance_reviews_fts", "performance_reviews_archive_fts",
+             "merged_employee"),
+        ) and name != CHECKPOINT_TABLE
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +64,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -71,7 +88,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,50 @@
+"""Add salary validity intervals
+
+Revision ID: 3b9d2c7f1a4e
+Revises: e8a1aaf43b61
+Create Date: 2025-03-20 10:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.pwcexercise.utils.data_migration import backfill, has_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d2c7f1a4e'
+down_revision: Union[str, None] = 'e8a1aaf43b61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not has_column('salaries', 'effective_to'):
+        op.add_column('salaries', sa.Column('effective_to', sa.Date(), nullable=False, server_default='9999-12-31'))
+    # Created first, it answers the lookup of the next salary of each row.
+    op.create_index('ix_salaries_employee_effective_date', 'salaries', ['employee_id', 'effective_date'], unique=False, if_not_exists=True)
+    # Each salary ends where the next salary of the same employee starts.
+    backfill(
+        '3b9d2c7f1a4e_salary_validity', 'salaries',
+        """
+        UPDATE salaries SET effective_to = COALESCE((
+            SELECT MIN(later.effective_date) FROM salaries AS later
+            WHERE later.employee_id = salaries.employee_id
+              AND (later.effective_date > salaries.effective_date
+                   OR (later.effective_date = salaries.effective_date
+                       AND later.id > salaries.id))
+        ), '9999-12-31')
+        WHERE id > :low AND id <= :high
+        """,
+    )
+    op.create_index('ix_salaries_validity', 'salaries', ['effective_to', 'effective_date', 'employee_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_salaries_employee_effective_date', table_name='salaries')
+    op.drop_index('ix_salaries_validity', table_name='salaries')
+    op.drop_column('salaries', 'effective_to')
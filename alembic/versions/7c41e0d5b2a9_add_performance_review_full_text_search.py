@@ -0,0 +1,87 @@
+"""Add performance review full-text search
+
+Revision ID: 7c41e0d5b2a9
+Revises: 3b9d2c7f1a4e
+Create Date: 2025-03-24 16:41:09.527613
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c41e0d5b2a9'
+down_revision: Union[str, None] = '3b9d2c7f1a4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    # Databases created by the application already have the index.
+    already_indexed = connection.execute(
+        sa.text(
+            "SELECT 1 FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'performance_reviews_fts'"
+        )
+    ).scalar() is not None
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS performance_reviews_fts USING fts5("
+        "comments, content='performance_reviews', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS performance_reviews_fts_ai "
+        "AFTER INSERT ON performance_reviews BEGIN "
+        "INSERT INTO performance_reviews_fts(rowid, comments) "
+        "VALUES (new.id, new.comments); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS performance_reviews_fts_ad "
+        "AFTER DELETE ON performance_reviews BEGIN "
+        "INSERT INTO performance_reviews_fts(performance_reviews_fts, rowid, comments) "
+        "VALUES ('delete', old.id, old.comments); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS performance_reviews_fts_au "
+        "AFTER UPDATE ON performance_reviews BEGIN "
+        "INSERT INTO performance_reviews_fts(performance_reviews_fts, rowid, comments) "
+        "VALUES ('delete', old.id, old.comments); "
+        "INSERT INTO performance_reviews_fts(rowid, comments) "
+        "VALUES (new.id, new.comments); END"
+    )
+
+    # Index the existing reviews in primary key batches.
+    last_id = 0
+    while not already_indexed:
+        batch_end = connection.execute(
+            sa.text(
+                "SELECT MAX(id) FROM (SELECT id FROM performance_reviews "
+                "WHERE id > :last_id ORDER BY id LIMIT :batch_size)"
+            ),
+            {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+        ).scalar()
+        if batch_end is None:
+            break
+        connection.execute(
+            sa.text(
+                "INSERT INTO performance_reviews_fts(rowid, comments) "
+                "SELECT id, comments FROM performance_reviews "
+                "WHERE id > :last_id AND id <= :batch_end"
+            ),
+            {"last_id": last_id, "batch_end": batch_end},
+        )
+        last_id = batch_end
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS performance_reviews_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS performance_reviews_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS performance_reviews_fts_ai")
+    op.execute("DROP TABLE IF EXISTS performance_reviews_fts")
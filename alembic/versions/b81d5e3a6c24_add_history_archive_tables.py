@@ -0,0 +1,129 @@
+"""Add history archive tables
+
+Revision ID: b81d5e3a6c24
+Revises: f4b7a2c9e150
+Create Date: 2025-04-01 10:12:48.203561
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d5e3a6c24'
+down_revision: Union[str, None] = 'f4b7a2c9e150'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_fts(content_table: str, fts_table: str) -> None:
+    """Create the full-text index of a reviews table and its triggers."""
+    op.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"comments, content='{content_table}', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai "
+        f"AFTER INSERT ON {content_table} BEGIN "
+        f"INSERT INTO {fts_table}(rowid, comments) "
+        "VALUES (new.id, new.comments); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad "
+        f"AFTER DELETE ON {content_table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, comments) "
+        "VALUES ('delete', old.id, old.comments); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au "
+        f"AFTER UPDATE ON {content_table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, comments) "
+        "VALUES ('delete', old.id, old.comments); "
+        f"INSERT INTO {fts_table}(rowid, comments) "
+        "VALUES (new.id, new.comments); END"
+    )
+
+
+def _set_autoincrement(table: str, enabled: bool) -> None:
+    """Rebuild ``table`` with or without ``AUTOINCREMENT``, keeping its rows and IDs."""
+    with op.batch_alter_table(
+        table, recreate='always', table_kwargs={'sqlite_autoincrement': enabled},
+    ):
+        pass
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # AUTOINCREMENT keeps the IDs of archived rows from being reused by new
+    # rows. Rebuilding performance_reviews drops its full-text triggers; the
+    # index itself still matches, as the IDs are kept.
+    _set_autoincrement('salaries', True)
+    _set_autoincrement('performance_reviews', True)
+    _create_fts('performance_reviews', 'performance_reviews_fts')
+    op.create_index(
+        'ix_performance_reviews_employee_review_date', 'performance_reviews',
+        ['employee_id', 'review_date'], unique=False,
+    )
+
+    op.create_table(
+        'salaries_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=True),
+        sa.Column('monthly_income', sa.Float(), nullable=False),
+        sa.Column('hourly_rate', sa.Float(), nullable=True),
+        sa.Column('effective_date', sa.Date(), nullable=False),
+        sa.Column('effective_to', sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_salaries_archive_validity', 'salaries_archive',
+        ['effective_to', 'effective_date', 'employee_id'], unique=False,
+    )
+    op.create_index(
+        'ix_salaries_archive_employee_validity', 'salaries_archive',
+        ['employee_id', 'effective_to'], unique=False,
+    )
+    op.create_table(
+        'performance_reviews_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('review_date', sa.Date(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('comments', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_performance_reviews_archive_employee_review_date',
+        'performance_reviews_archive', ['employee_id', 'review_date'], unique=False,
+    )
+    _create_fts('performance_reviews_archive', 'performance_reviews_archive_fts')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Archived rows go back to the hot tables before the archive is dropped.
+    op.execute("INSERT INTO salaries SELECT * FROM salaries_archive")
+    op.execute(
+        "INSERT INTO performance_reviews SELECT * FROM performance_reviews_archive"
+    )
+    op.execute("DROP TABLE IF EXISTS performance_reviews_archive_fts")
+    op.drop_index(
+        'ix_performance_reviews_archive_employee_review_date',
+        table_name='performance_reviews_archive',
+    )
+    op.drop_table('performance_reviews_archive')
+    op.drop_index('ix_salaries_archive_employee_validity', table_name='salaries_archive')
+    op.drop_index('ix_salaries_archive_validity', table_name='salaries_archive')
+    op.drop_table('salaries_archive')
+
+    op.drop_index(
+        'ix_performance_reviews_employee_review_date', table_name='performance_reviews',
+    )
+    _set_autoincrement('performance_reviews', False)
+    _create_fts('performance_reviews', 'performance_reviews_fts')
+    _set_autoincrement('salaries', False)
@@ -10,6 +10,8 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 
+from src.pwcexercise.utils.data_migration import backfill, has_column
+
 
 # revision identifiers, used by Alembic.
 revision: str = 'e8a1aaf43b61'
@@ -20,19 +22,52 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
+    # The new columns are committed before the backfill, so a resumed upgrade
+    # finds them already there.
+    if not has_column('salaries', 'monthly_income'):
+        op.add_column('salaries', sa.Column('monthly_income', sa.Float(), nullable=False, server_default='0.0'))
+    if not has_column('salaries', 'hourly_rate'):
+        op.add_column('salaries', sa.Column('hourly_rate', sa.Float(), nullable=True))
+    # Carry the amount and the employee's hourly rate over before dropping them.
+    backfill(
+        'e8a1aaf43b61_salaries', 'salaries',
+        """
+        UPDATE salaries SET
+            monthly_income = salary_amount,
+            hourly_rate = (
+                SELECT employees.hourly_rate FROM employees
+                WHERE employees.id = salaries.employee_id
+            )
+        WHERE id > :low AND id <= :high
+        """,
+    )
     op.drop_column('employees', 'hourly_rate')
-    op.add_column('salaries', sa.Column('monthly_income', sa.Float(), nullable=False, server_default='0.0'))
-    op.add_column('salaries', sa.Column('hourly_rate', sa.Float(), nullable=True))
     op.drop_column('salaries', 'salary_amount')
-    # ### end Alembic commands ###
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.add_column('salaries', sa.Column('salary_amount', sa.FLOAT(), nullable=False))
+    if not has_column('salaries', 'salary_amount'):
+        op.add_column('salaries', sa.Column('salary_amount', sa.FLOAT(), nullable=False, server_default='0.0'))
+    if not has_column('employees', 'hourly_rate'):
+        op.add_column('employees', sa.Column('hourly_rate', sa.FLOAT(), nullable=True))
+    backfill(
+        'e8a1aaf43b61_downgrade_salaries', 'salaries',
+        "UPDATE salaries SET salary_amount = monthly_income "
+        "WHERE id > :low AND id <= :high",
+    )
+    # Employees get back the hourly rate of their latest salary.
+    backfill(
+        'e8a1aaf43b61_downgrade_employees', 'employees',
+        """
+        UPDATE employees SET hourly_rate = (
+            SELECT salaries.hourly_rate FROM salaries
+            WHERE salaries.employee_id = employees.id
+            ORDER BY salaries.effective_date DESC, salaries.id DESC
+            LIMIT 1
+        )
+        WHERE id > :low AND id <= :high
+        """,
+    )
     op.drop_column('salaries', 'hourly_rate')
     op.drop_column('salaries', 'monthly_income')
-    op.add_column('employees', sa.Column('hourly_rate', sa.FLOAT(), nullable=True))
-    # ### end Alembic commands ###
@@ -0,0 +1,134 @@
+"""Make employee emp_id unique
+
+Revision ID: f4b7a2c9e150
+Revises: d2e6f4a8c913
+Create Date: 2025-03-29 11:05:37.642918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.pwcexercise.utils.data_migration import logger
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b7a2c9e150'
+down_revision: Union[str, None] = 'd2e6f4a8c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Employees merged away by the upgrade, the keeper of each, and the salaries
+# and reviews moved to it, so the downgrade can put them back.
+MERGED_EMPLOYEES = 'merged_employees'
+MERGED_IDS = 'merged_employee_ids'
+MOVED_ROWS = 'merged_employee_rows'
+HISTORY_TABLES = ('salaries', 'performance_reviews')
+
+# Every employee whose emp_id an older employee already has, with that one.
+DUPLICATES = """
+    SELECT duplicate.id AS old_id, MIN(keeper.id) AS new_id,
+           duplicate.emp_id AS emp_id
+    FROM employees AS duplicate
+    JOIN employees AS keeper ON keeper.emp_id = duplicate.emp_id
+    GROUP BY duplicate.id
+    HAVING MIN(keeper.id) < duplicate.id
+    ORDER BY duplicate.id
+"""
+
+# Validity intervals of the salaries of the given employees.
+RECOMPUTE_INTERVALS = """
+    UPDATE salaries SET effective_to = COALESCE((
+        SELECT MIN(later.effective_date) FROM salaries AS later
+        WHERE later.employee_id = salaries.employee_id
+          AND (later.effective_date > salaries.effective_date
+               OR (later.effective_date = salaries.effective_date
+                   AND later.id > salaries.id))
+    ), '9999-12-31')
+    WHERE employee_id IN ({employees})
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Employees sharing an emp_id are merged into the oldest row: their
+    # salaries and reviews move to it and the duplicates are deleted. Every
+    # row removed or moved is kept in the merged_employee* tables, which
+    # the downgrade restores, and each merge is logged.
+    merges = op.get_bind().execute(sa.text(DUPLICATES)).all()
+    if merges:
+        op.execute(f"CREATE TABLE {MERGED_IDS} AS {DUPLICATES}")
+        op.execute(
+            f"""
+            CREATE TABLE {MERGED_EMPLOYEES} AS
+            SELECT * FROM employees WHERE id IN (SELECT old_id FROM {MERGED_IDS})
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TABLE {MOVED_ROWS} (
+                table_name VARCHAR(64) NOT NULL,
+                row_id INTEGER NOT NULL,
+                employee_id INTEGER NOT NULL
+            )
+            """
+        )
+        for table in HISTORY_TABLES:
+            op.execute(
+                f"""
+                INSERT INTO {MOVED_ROWS} (table_name, row_id, employee_id)
+                SELECT '{table}', id, employee_id FROM {table}
+                WHERE employee_id IN (SELECT old_id FROM {MERGED_IDS})
+                """
+            )
+            op.execute(
+                f"""
+                UPDATE {table} SET employee_id = (
+                    SELECT new_id FROM {MERGED_IDS} WHERE old_id = {table}.employee_id
+                )
+                WHERE employee_id IN (SELECT old_id FROM {MERGED_IDS})
+                """
+            )
+        op.execute(f"DELETE FROM employees WHERE id IN (SELECT old_id FROM {MERGED_IDS})")
+        # The merged salary histories need their validity intervals recomputed.
+        op.execute(RECOMPUTE_INTERVALS.format(
+            employees=f"SELECT new_id FROM {MERGED_IDS}",
+        ))
+        for old_id, new_id, emp_id in merges:
+            logger.warning(
+                "Merged employee %d into %d, both with emp_id %s", old_id, new_id, emp_id,
+            )
+        logger.warning(
+            "Merged %d duplicate employees; they are kept in %s until the "
+            "downgrade restores them", len(merges), MERGED_EMPLOYEES,
+        )
+    op.drop_index('ix_employees_emp_id', table_name='employees')
+    op.create_index(op.f('ix_employees_emp_id'), 'employees', ['emp_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_employees_emp_id'), table_name='employees')
+    op.create_index(op.f('ix_employees_emp_id'), 'employees', ['emp_id'], unique=False)
+    if not sa.inspect(op.get_bind()).has_table(MERGED_EMPLOYEES):
+        return
+    # Put the merged employees back with their salaries and reviews.
+    op.execute(f"INSERT INTO employees SELECT * FROM {MERGED_EMPLOYEES}")
+    for table in HISTORY_TABLES:
+        op.execute(
+            f"""
+            UPDATE {table} SET employee_id = (
+                SELECT employee_id FROM {MOVED_ROWS}
+                WHERE table_name = '{table}' AND row_id = {table}.id
+            )
+            WHERE id IN (SELECT row_id FROM {MOVED_ROWS} WHERE table_name = '{table}')
+            """
+        )
+    op.execute(RECOMPUTE_INTERVALS.format(
+        employees=f"SELECT old_id FROM {MERGED_IDS} UNION SELECT new_id FROM {MERGED_IDS}",
+    ))
+    logger.warning("Restored the employees merged by the upgrade from %s", MERGED_EMPLOYEES)
+    for table in (MOVED_ROWS, MERGED_EMPLOYEES, MERGED_IDS):
+        op.drop_table(table)
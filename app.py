@@ -1,20 +1,39 @@
 """Set up the FastAPI application with various routers."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from src.pwcexercise.routes.analytics import analytics_router
+from src.pwcexercise.routes.batch import batch_router
+from src.pwcexercise.routes.change import change_router
 from src.pwcexercise.routes.department import department_router
 from src.pwcexercise.routes.employee import employee
+from src.pwcexercise.routes.export import export_router
+from src.pwcexercise.routes.job import job_router
 from src.pwcexercise.routes.job_title import job_title_router
 from src.pwcexercise.routes.performance_review import performance_review_router
 from src.pwcexercise.routes.salary import salary_router
 from src.pwcexercise.routes.status import status_router
+from src.pwcexercise.services import job_service
 from src.pwcexercise.utils.logger import logger
 
 logger.info("Setting up FastAPI application")
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Keep the change log compacted while the application runs."""
+    stop = job_service.schedule_compaction()
+    yield
+    stop.set()
+
+
 app = FastAPI(
     title = "Exercise for PwC",
     description = "FastAPI with SQLAlchemy.",
+    lifespan = lifespan,
     openapi_tags = [
         {
             "name": "employees",
@@ -36,6 +55,26 @@ app = FastAPI(
             "name": "job_titles",
             "description": "Operations related to job titles",
         },
+        {
+            "name": "analytics",
+            "description": "Vectorized aggregates over the current workforce.",
+        },
+        {
+            "name": "exports",
+            "description": "Columnar snapshots of the database.",
+        },
+        {
+            "name": "jobs",
+            "description": "Reports computed in the background.",
+        },
+        {
+            "name": "changes",
+            "description": "Feed of the rows written, for incremental sync.",
+        },
+        {
+            "name": "batch",
+            "description": "Several requests in one round trip.",
+        },
     ],
 )
 
@@ -44,6 +83,11 @@ app.include_router(department_router, prefix="/departments")
 app.include_router(performance_review_router, prefix="/performance_reviews")
 app.include_router(salary_router, prefix="/salaries")
 app.include_router(job_title_router, prefix="/job_titles")
+app.include_router(analytics_router, prefix="/analytics")
+app.include_router(export_router, prefix="/exports")
+app.include_router(job_router, prefix="/jobs")
+app.include_router(change_router, prefix="/changes")
+app.include_router(batch_router)
 app.include_router(status_router)
 
 logger.info("FastAPI application initialized successfully.")
@@ -0,0 +1,64 @@
+"""Compare the per-employee aggregate loops with the vectorized snapshot.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_analytics --employees 5000
+
+It reports the time of the department average salary computed with one
+``get_active_salary`` query per employee, the cost of building the snapshot,
+and the time of group-by queries answered from the warm snapshot.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from benchmarks.common import build_engine, new_session, timed
+from src.pwcexercise.services import analytics_service, employee_service
+from src.pwcexercise.services.department_service import get_employees_by_department
+
+
+def per_employee_average(department_id: int, db: object) -> float:
+    """The average salary of a department the way it was computed before."""
+    total = 0.0
+    count = 0
+    for employee in get_employees_by_department(department_id, db):
+        salary = employee_service.get_active_salary(employee.id, db)
+        if salary:
+            total += salary.monthly_income
+            count += 1
+    return round(total / count, 2) if count else 0
+
+
+def main() -> None:
+    """Run the analytics benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = build_engine(args.employees)
+    with new_session(engine) as db:
+        loop_time, loop_value = timed(lambda: per_employee_average(1, db), repeat=3)
+
+        def build() -> object:
+            analytics_service.workforce.reset()
+            return analytics_service.workforce.frame(db)
+
+        build_time, _ = timed(build, repeat=3)
+        mean_time, mean_value = timed(
+            lambda: analytics_service.group_mean(db, "monthly_income", department_id=1),
+        )
+        group_time, _ = timed(lambda: analytics_service.aggregate(
+            db, "monthly_income", "percentile", "job_title_id", 90))
+        histogram_time, _ = timed(lambda: analytics_service.histogram(
+            db, "monthly_income", 20, "department_id"))
+
+    print(f"per-employee loop average   {loop_time * 1000:9.2f} ms  ({loop_value})")
+    print(f"snapshot build              {build_time * 1000:9.2f} ms")
+    print(f"snapshot department average {mean_time * 1000:9.2f} ms  ({mean_value})")
+    print(f"snapshot p90 by job title   {group_time * 1000:9.2f} ms")
+    print(f"snapshot histogram by dept  {histogram_time * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
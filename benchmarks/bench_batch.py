@@ -0,0 +1,131 @@
+"""Compare loading a screen with one request per call and with ``POST /batch``.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_batch --screens 100 --rtt-ms 40
+
+A screen of an integration client needs a dozen reads across the employee,
+department and salary routes. For every screen it times those reads sent
+one after the other, then as a single batch, sequential and with
+``--concurrency`` reads at a time, through the ASGI app on an in-memory
+database. ``--rtt-ms`` adds the network round trip every HTTP call pays, so
+the time per screen is the server time plus one round trip per call.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections.abc import Iterator
+from unittest import mock
+
+from fastapi import Request
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import app
+from benchmarks.common import build_engine, session_factory
+from src.pwcexercise.config.db import BATCH_SESSION_KEY, get_db
+
+SCREEN = [
+    "/employees/{employee}",
+    "/employees/{employee}/active_salary",
+    "/employees/{employee}/latest_performance_review",
+    "/employees/{employee}/aguinaldo",
+    "/departments/",
+    "/departments/{department}",
+    "/departments/{department}/medium_salary",
+    "/departments/{department}/average_performance_score",
+    "/job_titles/",
+    "/job_titles/{job_title}/medium_salary",
+    "/salaries/current_average",
+    "/salaries/historic_average",
+]
+
+
+def screen(rng: random.Random, employees: int) -> list[str]:
+    """Return the paths read by one screen of a random employee."""
+    keys = {
+        "employee": rng.randint(1, employees),
+        "department": rng.randint(1, 3),
+        "job_title": rng.randint(1, 9),
+    }
+    return [path.format(**keys) for path in SCREEN]
+
+
+def server_time(
+        client: TestClient, screens: list[list[str]], mode: str, concurrency: int,
+    ) -> float:
+    """Return the mean server milliseconds per screen, without round trips."""
+    start = time.perf_counter()
+    for paths in screens:
+        if mode == "sequential":
+            for path in paths:
+                if client.get(path).status_code >= 500:
+                    msg = f"{path} failed"
+                    raise RuntimeError(msg)
+        else:
+            response = client.post("/batch", json={
+                "requests": [{"method": "GET", "path": path} for path in paths],
+                "concurrency": concurrency,
+            })
+            statuses = [sub["status"] for sub in response.json()["responses"]]
+            if response.status_code != 200 or max(statuses) >= 500:
+                msg = f"batch answered {response.status_code}: {statuses}"
+                raise RuntimeError(msg)
+    return (time.perf_counter() - start) / len(screens) * 1000
+
+
+def main() -> None:
+    """Run the batch benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--screens", type=int, default=100)
+    parser.add_argument("--rtt-ms", type=float, default=40.0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    engine = build_engine(args.employees, 12, 4)
+    factory = session_factory(engine)
+    rng = random.Random(7)
+    screens = [screen(rng, args.employees) for _ in range(args.screens)]
+
+    def bench_db(request: Request) -> Iterator[Session]:
+        shared = request.scope.get(BATCH_SESSION_KEY)
+        if shared is not None:
+            yield shared
+            return
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = bench_db
+    patch = mock.patch(
+        "src.pwcexercise.services.batch_service.SessionLocal", factory,
+    )
+    print(f"{len(SCREEN)} reads per screen, {args.rtt_ms:.0f} ms round trip")
+    print(f"{'mode':<26} {'calls':>6} {'ms/screen':>10} {'server ms':>10}")
+    try:
+        with patch, TestClient(app) as client:
+            server_time(client, screens[:10], "sequential", 1)
+            server_time(client, screens[:10], "batch", 1)
+            modes = [
+                ("sequential", "sequential", 1, len(SCREEN)),
+                ("batch", "batch", 1, 1),
+                (f"batch, concurrency {args.concurrency}", "batch",
+                 args.concurrency, 1),
+            ]
+            for label, mode, concurrency, calls in modes:
+                server = server_time(client, screens, mode, concurrency)
+                total = server + calls * args.rtt_ms
+                print(f"{label:<26} {calls:>6} {total:>10.1f} {server:>10.1f}")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Measure the filtered employee listing with and without its indexes.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_employee_filters --employees 20000
+
+Every filter is run against the database as created by the models and
+again after dropping the listing indexes. For each run it prints the
+SQLite query plan, the best wall time, the rows returned and the virtual
+machine steps SQLite executed, counted with a progress handler, which is a
+proxy for the rows the statement had to touch.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Engine
+
+from benchmarks.common import build_engine, new_session, timed
+from src.pwcexercise.schemas.employee import EmployeeFilterSchema
+from src.pwcexercise.services.employee_service import filtered_employees_statement
+
+LISTING_INDEXES = (
+    "ix_employees_emp_id",
+    "ix_employees_age",
+    "ix_employees_department_id",
+    "ix_employees_hire_date",
+    "ix_employees_job_title_id",
+    "ix_salaries_current_income",
+    "ix_salaries_employee_validity",
+)
+
+CASES = {
+    "age range": EmployeeFilterSchema(age_min=30, age_max=31),
+    "department, by age": EmployeeFilterSchema(department_id=2, sort="age"),
+    "emp_id prefix": EmployeeFilterSchema(emp_id_prefix="RM0001"),
+    "salary range": EmployeeFilterSchema(salary_min=19000, salary_max=19500),
+    "top salaries": EmployeeFilterSchema(sort="-salary", limit=20),
+    "page by hire date": EmployeeFilterSchema(sort="-hire_date", limit=50, offset=500),
+}
+
+
+def compiled(filters: EmployeeFilterSchema) -> str:
+    """Return the listing statement of ``filters`` with inlined parameters."""
+    return str(filtered_employees_statement(filters).compile(
+        dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True},
+    ))
+
+
+def run(engine: Engine, indexed: bool) -> None:
+    """Print the plan, timing and work of every case."""
+    print(f"\n== {'with' if indexed else 'without'} listing indexes ==")
+    for name, filters in CASES.items():
+        statement = filtered_employees_statement(filters)
+        with new_session(engine) as db:
+            plan = db.execute(text(f"EXPLAIN QUERY PLAN {compiled(filters)}")).all()
+
+            def query(db=db, statement=statement) -> list:
+                return db.execute(statement).all()
+
+            best, rows = timed(query)
+            steps = [0]
+
+            def count(steps: list = steps) -> int:
+                steps[0] += 1
+                return 0
+
+            connection = db.connection().connection.driver_connection
+            connection.set_progress_handler(count, 1000)
+            query()
+            connection.set_progress_handler(None, 1000)
+
+        print(f"\n{name}: {len(rows)} rows, best {best * 1000:.2f} ms, "
+              f"~{steps[0] * 1000} VM steps")
+        for row in plan:
+            print(f"    {row[-1]}")
+
+
+def main() -> None:
+    """Run the employee filter benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=20000)
+    parser.add_argument("--salaries", type=int, default=12)
+    args = parser.parse_args()
+
+    engine = build_engine(args.employees, args.salaries, 1)
+    run(engine, indexed=True)
+    with engine.begin() as conn:
+        for index in LISTING_INDEXES:
+            conn.exec_driver_sql(f"DROP INDEX {index}")
+    run(engine, indexed=False)
+
+
+if __name__ == "__main__":
+    main()
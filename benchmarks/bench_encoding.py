@@ -0,0 +1,79 @@
+"""Compare bytes on the wire and CPU cost of the response encodings.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_encoding --employees 2000
+
+For every list endpoint payload it encodes the body as JSON and, when the
+optional packages are installed, MessagePack, then compresses it with each
+available content coding. CPU time is measured with ``time.process_time``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.common import build_engine, new_session
+from src.pwcexercise.schemas.employee import EmployeeSchema
+from src.pwcexercise.schemas.performance_review import PerformanceReviewSchema
+from src.pwcexercise.schemas.salary import SalarySchema
+from src.pwcexercise.services import (
+    employee_service,
+    performance_review_service,
+    salary_service,
+)
+from src.pwcexercise.utils import encoding
+
+
+def cpu_ms(func: object, repeat: int = 5) -> tuple[float, bytes]:
+    """Return the best CPU time in milliseconds of ``func`` and its result."""
+    best = float("inf")
+    result = b""
+    for _ in range(repeat):
+        start = time.process_time()
+        result = func()
+        best = min(best, time.process_time() - start)
+    return best * 1000, result
+
+
+def main() -> None:
+    """Run the encoding benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = build_engine(args.employees)
+    with new_session(engine) as db:
+        payloads = [
+            ("employees", employee_service.get_all_employees(db),
+             list[EmployeeSchema]),
+            ("salaries", salary_service.get_all_salaries(db), list[SalarySchema]),
+            ("performance_reviews",
+             performance_review_service.get_all_performance_reviews(db),
+             list[PerformanceReviewSchema]),
+        ]
+
+    media_types = [encoding.JSON_MEDIA_TYPE]
+    if encoding.msgpack is not None:
+        media_types.append(encoding.MSGPACK_MEDIA_TYPES[0])
+    codings = [None, "gzip"] + (["br"] if encoding.brotli is not None else [])
+
+    print(f"{'listing':<20} {'media type':<22} {'coding':<9} "
+          f"{'bytes':>10} {'encode ms':>10} {'compress ms':>12}")
+    for name, content, schema in payloads:
+        adapter = encoding.adapter_for(schema)
+        for media_type in media_types:
+            encode_ms, body = cpu_ms(
+                lambda: encoding.encode_body(content, adapter, media_type),
+            )
+            for coding in codings:
+                compress_ms, wire = cpu_ms(
+                    lambda: encoding.compress_body(body, coding),
+                )
+                print(f"{name:<20} {media_type:<22} {coding or 'identity':<9} "
+                      f"{len(wire):>10} {encode_ms:>10.1f} {compress_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
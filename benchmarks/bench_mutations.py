@@ -0,0 +1,358 @@
+"""Compare the previous ORM write paths with the RETURNING based services.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_mutations --writes 200
+
+Every create, update and delete of employees, salaries, performance reviews
+and departments is run ``--writes`` times on a file backed SQLite database,
+once with the ORM code the services used before (load the row, mutate it,
+flush, then read it back) and once through the services, which issue single
+``INSERT/UPDATE/DELETE ... RETURNING`` statements. Both paths go through the
+write queue and serialize their result with the response schema, like a
+request does, and each write gets a fresh session. For each it prints the
+SQL statements per write (savepoints excluded) and the latency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from benchmarks.common import build_engine, new_session, session_factory
+from src.pwcexercise.config.write_queue import write_queue
+from src.pwcexercise.models.department import Department
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.performance_review import PerformanceReview
+from src.pwcexercise.models.salary import Salary
+from src.pwcexercise.schemas.department import DepartmentCreateSchema, DepartmentSchema
+from src.pwcexercise.schemas.employee import EmployeeCreateSchema, EmployeeSchema
+from src.pwcexercise.schemas.performance_review import (
+    PerformanceReviewCreateSchema,
+    PerformanceReviewSchema,
+)
+from src.pwcexercise.schemas.salary import SalaryCreateSchema, SalarySchema
+from src.pwcexercise.services import (
+    department_service,
+    employee_service,
+    performance_review_service,
+    salary_service,
+)
+from src.pwcexercise.services.salary_service import refresh_validity_intervals
+
+Write = Callable[[Session, int], object]
+UPDATED = 1_000_000
+SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE", "ROLLBACK")
+
+
+def orm_create_employee(db: Session, n: int) -> Employee:
+    """Previous ``create_employee``: add, flush, then read the row back."""
+    data = employee_data(n)
+
+    def write(session: Session) -> int:
+        employee = Employee(**data.model_dump())
+        session.add(employee)
+        session.flush()
+        return employee.id
+
+    return db.get(Employee, write_queue.execute(write), populate_existing=True)
+
+
+def orm_update_employee(db: Session, employee_id: int) -> Employee:
+    """Previous ``update_employee``: load, set attributes, flush, read back."""
+    data = employee_data(employee_id + UPDATED)
+
+    def write(session: Session) -> bool:
+        employee = session.query(Employee).filter(Employee.id == employee_id).first()
+        for key, value in data.model_dump().items():
+            setattr(employee, key, value)
+        session.flush()
+        return True
+
+    write_queue.execute(write)
+    return db.get(Employee, employee_id, populate_existing=True)
+
+
+def orm_delete_employee(db: Session, employee_id: int) -> bool:
+    """Previous ``delete_employee``: load, then let the ORM cascade delete."""
+    def write(session: Session) -> bool:
+        employee = session.query(Employee).filter(Employee.id == employee_id).first()
+        session.delete(employee)
+        return True
+
+    return write_queue.execute(write)
+
+
+def orm_create_salary(db: Session, n: int) -> Salary:
+    """Previous ``create_salary``."""
+    data = salary_data(n)
+
+    def write(session: Session) -> int:
+        salary = Salary(**data.model_dump())
+        session.add(salary)
+        session.flush()
+        refresh_validity_intervals(session, [salary.employee_id])
+        return salary.id
+
+    return db.get(Salary, write_queue.execute(write), populate_existing=True)
+
+
+def orm_update_salary(db: Session, salary_id: int) -> Salary:
+    """Previous ``update_salary``."""
+    data = salary_data(salary_id)
+
+    def write(session: Session) -> None:
+        previous = (
+            session.query(Salary.employee_id, Salary.effective_date)
+            .filter(Salary.id == salary_id)
+            .first()
+        )
+        session.query(Salary).filter(Salary.id == salary_id).update(data.model_dump())
+        refresh_validity_intervals(session, [previous[0], data.employee_id])
+
+    write_queue.execute(write)
+    return db.get(Salary, salary_id, populate_existing=True)
+
+
+def orm_delete_salary(db: Session, salary_id: int) -> bool:
+    """Previous ``delete_salary``."""
+    def write(session: Session) -> bool:
+        salary = session.query(Salary).filter(Salary.id == salary_id).first()
+        session.delete(salary)
+        session.flush()
+        refresh_validity_intervals(session, [salary.employee_id])
+        return True
+
+    return write_queue.execute(write)
+
+
+def orm_create_review(db: Session, n: int) -> PerformanceReview:
+    """Previous ``create_performance_review``."""
+    data = review_data(n)
+
+    def write(session: Session) -> int:
+        review = PerformanceReview(**data.model_dump())
+        session.add(review)
+        session.flush()
+        return review.id
+
+    return db.get(PerformanceReview, write_queue.execute(write), populate_existing=True)
+
+
+def orm_update_review(db: Session, review_id: int) -> PerformanceReview:
+    """Previous ``update_performance_review``."""
+    data = review_data(review_id)
+
+    def write(session: Session) -> bool:
+        review = (
+            session.query(PerformanceReview)
+            .filter(PerformanceReview.id == review_id)
+            .first()
+        )
+        for key, value in data.model_dump().items():
+            setattr(review, key, value)
+        session.flush()
+        return True
+
+    write_queue.execute(write)
+    return db.get(PerformanceReview, review_id, populate_existing=True)
+
+
+def orm_delete_review(db: Session, review_id: int) -> bool:
+    """Previous ``delete_performance_review``."""
+    def write(session: Session) -> bool:
+        review = (
+            session.query(PerformanceReview)
+            .filter(PerformanceReview.id == review_id)
+            .first()
+        )
+        session.delete(review)
+        return True
+
+    return write_queue.execute(write)
+
+
+def orm_create_department(db: Session, n: int) -> Department:
+    """Previous ``create_department``: add, commit, refresh."""
+    department = Department(name=f"Department {n}")
+    db.add(department)
+    db.commit()
+    db.refresh(department)
+    return department
+
+
+def orm_update_department(db: Session, department_id: int) -> Department:
+    """Previous ``update_department``: load, commit, refresh."""
+    department = db.query(Department).filter(Department.id == department_id).first()
+    department.name = f"Renamed {department_id}"
+    db.commit()
+    db.refresh(department)
+    return department
+
+
+def orm_delete_department(db: Session, department_id: int) -> bool:
+    """Previous ``delete_department``: load, delete, commit."""
+    department = db.query(Department).filter(Department.id == department_id).first()
+    db.delete(department)
+    db.commit()
+    return True
+
+
+def employee_data(n: int) -> EmployeeCreateSchema:
+    return EmployeeCreateSchema(
+        emp_id=f"BENCH{n:07d}", age=30 + n % 30, department_id=1 + n % 3,
+        hire_date=date(2020, 1, 1), job_title_id=1 + n % 9,
+    )
+
+
+def salary_data(n: int) -> SalaryCreateSchema:
+    return SalaryCreateSchema(
+        employee_id=1 + n % 100, monthly_income=5000.0, hourly_rate=50.0,
+        effective_date=date(2030, 1, 1) + timedelta(days=n),
+    )
+
+
+def review_data(n: int) -> PerformanceReviewCreateSchema:
+    return PerformanceReviewCreateSchema(
+        employee_id=1 + n % 100, review_date=date(2030, 1, 1), score=1 + n % 5,
+        comments="Benchmark review",
+    )
+
+
+def count_statements(engine: Engine) -> list[int]:
+    """Count the SQL statements executed on ``engine``, savepoints excluded."""
+    statements = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def on_execute(conn: object, cursor: object, statement: str, *args: object) -> None:
+        if not statement.lstrip().upper().startswith(SAVEPOINT_STATEMENTS):
+            statements[0] += 1
+
+    return statements
+
+
+def run(
+        engine: Engine,
+        statements: list[int],
+        write: Write,
+        schema: type[BaseModel] | None,
+        keys: list[int],
+    ) -> tuple[float, float, float]:
+    """Apply ``write`` to every key; return statements per write, p50 and mean ms."""
+    latencies = []
+    statements[0] = 0
+    for key in keys:
+        started = time.perf_counter()
+        with new_session(engine) as db:
+            result = write(db, key)
+            if schema is not None:
+                schema.model_validate(result)
+        latencies.append(time.perf_counter() - started)
+    p50, mean = np.percentile(latencies, 50) * 1000, np.mean(latencies) * 1000
+    return statements[0] / len(keys), p50, mean
+
+
+def main() -> None:
+    """Run the mutation benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--employees", type=int, default=2000)
+    args = parser.parse_args()
+    n = args.writes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(
+            args.employees, url=f"sqlite:///{Path(tmp) / 'bench.db'}",
+        )
+        # The services write through the global queue: point it at the
+        # benchmark database, without the batching delay of a lone writer.
+        write_queue.session_factory = session_factory(engine)
+        write_queue.max_delay = 0
+        statements = count_statements(engine)
+        with new_session(engine) as db:
+            first_department = db.scalar(select(func.max(Department.id))) + 1
+        with engine.begin() as conn:
+            conn.execute(
+                insert(Department), [{"name": f"Spare {i}"} for i in range(2 * n)],
+            )
+
+        # Updates and deletes touch different rows on each path. Employees
+        # are deleted, with their whole history, from the end of the table;
+        # the salaries and reviews deleted belong to other employees.
+        cases = [
+            ("create employee", EmployeeSchema, range(n), range(n, 2 * n),
+             orm_create_employee,
+             lambda db, i: employee_service.create_employee(employee_data(i), db)),
+            ("update employee", EmployeeSchema, range(101, 101 + n),
+             range(101 + n, 101 + 2 * n), orm_update_employee,
+             lambda db, i: employee_service.update_employee(
+                 i, employee_data(i + UPDATED), db)),
+            ("delete employee", None, range(args.employees, args.employees - n, -1),
+             range(args.employees - n, args.employees - 2 * n, -1),
+             orm_delete_employee,
+             lambda db, i: employee_service.delete_employee(i, db)),
+            ("create salary", SalarySchema, range(n), range(n, 2 * n),
+             orm_create_salary,
+             lambda db, i: salary_service.create_salary(salary_data(i), db)),
+            ("update salary", SalarySchema, range(1, 1 + n), range(1 + n, 1 + 2 * n),
+             orm_update_salary,
+             lambda db, i: salary_service.update_salary(i, salary_data(i), db)),
+            ("delete salary", None, range(1 + 2 * n, 1 + 3 * n),
+             range(1 + 3 * n, 1 + 4 * n), orm_delete_salary,
+             lambda db, i: salary_service.delete_salary(i, db)),
+            ("create review", PerformanceReviewSchema, range(n), range(n, 2 * n),
+             orm_create_review,
+             lambda db, i: performance_review_service.create_performance_review(
+                 review_data(i), db)),
+            ("update review", PerformanceReviewSchema, range(1, 1 + n),
+             range(1 + n, 1 + 2 * n), orm_update_review,
+             lambda db, i: performance_review_service.update_performance_review(
+                 i, review_data(i), db)),
+            ("delete review", None, range(1 + 2 * n, 1 + 3 * n),
+             range(1 + 3 * n, 1 + 4 * n), orm_delete_review,
+             lambda db, i: performance_review_service.delete_performance_review(i, db)),
+            ("create department", DepartmentSchema, range(n), range(n, 2 * n),
+             orm_create_department,
+             lambda db, i: department_service.create_department(
+                 DepartmentCreateSchema(name=f"Department {i}"), db)),
+            ("update department", DepartmentSchema,
+             range(first_department, first_department + n),
+             range(first_department + n, first_department + 2 * n),
+             orm_update_department,
+             lambda db, i: department_service.update_department(
+                 i, DepartmentCreateSchema(name=f"Renamed {i}"), db)),
+            ("delete department", None,
+             range(first_department, first_department + n),
+             range(first_department + n, first_department + 2 * n),
+             orm_delete_department,
+             lambda db, i: department_service.delete_department(i, db)),
+        ]
+
+        print(f"writes per path: {n}, employees: {args.employees}")
+        print(f"{'operation':<18} {'path':<10} {'stmts':>6} "
+              f"{'p50 ms':>8} {'mean ms':>8}")
+        for label, schema, orm_keys, new_keys, orm_write, new_write in cases:
+            for path, write, keys in (
+                    ("orm", orm_write, orm_keys), ("returning", new_write, new_keys),
+                ):
+                per_write, p50, mean = run(
+                    engine, statements, write, schema, list(keys),
+                )
+                print(f"{label:<18} {path:<10} {per_write:>6.1f} "
+                      f"{p50:>8.2f} {mean:>8.2f}")
+        write_queue.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
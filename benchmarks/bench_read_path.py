@@ -0,0 +1,89 @@
+"""Compare the ORM and Core read paths of the list endpoints.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_read_path --employees 5000
+
+For each listing it reports the best wall time and the peak memory traced
+by ``tracemalloc`` while the rows are loaded and serialized, both in total
+and per row.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+from collections.abc import Callable
+
+from pydantic import TypeAdapter
+
+from benchmarks.common import build_engine, new_session, timed
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.performance_review import PerformanceReview
+from src.pwcexercise.models.salary import Salary
+from src.pwcexercise.schemas.employee import EmployeeSchema
+from src.pwcexercise.schemas.performance_review import PerformanceReviewSchema
+from src.pwcexercise.schemas.salary import SalarySchema
+from src.pwcexercise.services import (
+    employee_service,
+    performance_review_service,
+    salary_service,
+)
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """Return the peak traced memory, in bytes, while running ``func``."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    """Run the read path benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--salaries", type=int, default=12)
+    parser.add_argument("--reviews", type=int, default=4)
+    args = parser.parse_args()
+
+    engine = build_engine(args.employees, args.salaries, args.reviews)
+    cases = [
+        ("employees", Employee, employee_service.get_all_employees,
+         list[EmployeeSchema]),
+        ("salaries", Salary, salary_service.get_all_salaries,
+         list[SalarySchema]),
+        ("performance_reviews", PerformanceReview,
+         performance_review_service.get_all_performance_reviews,
+         list[PerformanceReviewSchema]),
+    ]
+
+    print(f"{'listing':<20} {'path':<5} {'rows':>7} {'best ms':>9} "
+          f"{'us/row':>8} {'peak KiB':>10} {'B/row':>8}")
+    for name, model, core_reader, schema in cases:
+        adapter = TypeAdapter(schema)
+
+        def orm_path(model: type = model, adapter: TypeAdapter = adapter) -> list:
+            with new_session(engine) as db:
+                return adapter.dump_python(
+                    adapter.validate_python(db.query(model).all(), from_attributes=True),
+                )
+
+        def core_path(
+                reader: Callable = core_reader, adapter: TypeAdapter = adapter,
+            ) -> list:
+            with new_session(engine) as db:
+                return adapter.dump_python(adapter.validate_python(reader(db)))
+
+        for label, path in (("orm", orm_path), ("core", core_path)):
+            best, rows = timed(path)
+            peak = peak_memory(path)
+            count = max(len(rows), 1)
+            print(f"{name:<20} {label:<5} {len(rows):>7} {best * 1000:>9.1f} "
+                  f"{best * 1e6 / count:>8.1f} {peak / 1024:>10.0f} "
+                  f"{peak / count:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
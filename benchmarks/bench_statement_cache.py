@@ -0,0 +1,273 @@
+"""Compare rebuilding the hot lookups per call with statements built once.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_statement_cache --calls 5000 --requests 2000
+
+The by-ID and per-employee lookups used to build a legacy ``Query`` (or a
+new ``select()``) on every call; they are now module-level statements with
+bound parameters. For each lookup it prints the time per call of the
+previous code and of the services on the same in-memory database, then the
+requests per second of the routes built on them, through the ASGI app, with
+the previous lookups patched in and with the current ones.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack
+from datetime import date
+from unittest import mock
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import app
+from benchmarks.common import build_engine, new_session, session_factory
+from src.pwcexercise.config.db import get_db
+from src.pwcexercise.models.department import Department
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.job_title import JobTitle
+from src.pwcexercise.models.performance_review import PerformanceReview
+from src.pwcexercise.models.salary import Salary
+from src.pwcexercise.services import (
+    department_service,
+    employee_service,
+    job_title_service,
+    performance_review_service,
+    salary_service,
+)
+from src.pwcexercise.services.archive_service import review_history, salary_history
+
+
+def previous_get_employee_by_id(employee_id: int, db: Session) -> Employee | None:
+    return db.query(Employee).filter(Employee.id == employee_id).first()
+
+
+def previous_get_active_salary(
+        employee_id: int, db: Session, as_of: date | None = None,
+    ) -> Salary | dict | None:
+    if as_of is not None:
+        history = salary_history()
+        salary = db.execute(
+            select(history).where(
+                history.c.employee_id == employee_id,
+                history.c.effective_to > as_of,
+                history.c.effective_date <= as_of,
+            ),
+        ).mappings().first()
+        return None if salary is None else dict(salary)
+    return (
+        db.query(Salary)
+        .filter(Salary.employee_id == employee_id)
+        .order_by(Salary.effective_date.desc())
+        .first()
+    )
+
+
+def previous_get_latest_performance_review(
+        employee_id: int, db: Session,
+    ) -> PerformanceReview | None:
+    return (
+        db.query(PerformanceReview)
+        .filter(PerformanceReview.employee_id == employee_id)
+        .order_by(PerformanceReview.review_date.desc())
+        .first()
+    )
+
+
+def previous_get_highest_salary_in_last_six_months(
+        employee_id: int, db: Session,
+    ) -> Salary | None:
+    salaries = db.query(Salary).filter(
+        Salary.employee_id == employee_id,
+        Salary.effective_date >= salary_service.six_months_ago(),
+    ).all()
+    if not salaries:
+        return None
+    return max(salaries, key=lambda s: s.monthly_income)
+
+
+def previous_get_salary_by_id(salary_id: int, db: Session) -> dict | None:
+    history = salary_history()
+    salary = db.execute(
+        select(history).where(history.c.id == salary_id),
+    ).mappings().first()
+    return None if salary is None else dict(salary)
+
+
+def previous_get_performance_review_by_id(
+        performance_review_id: int, db: Session,
+    ) -> dict | None:
+    history = review_history()
+    review = db.execute(
+        select(history).where(history.c.id == performance_review_id),
+    ).mappings().first()
+    return None if review is None else dict(review)
+
+
+def previous_get_department_by_id(department_id: int, db: Session) -> Department | None:
+    return db.query(Department).filter(Department.id == department_id).first()
+
+
+def previous_get_job_title_by_id(job_title_id: int, db: Session) -> JobTitle | None:
+    return db.query(JobTitle).filter(JobTitle.id == job_title_id).first()
+
+
+# (label, current function, previous function, key range)
+LOOKUPS = [
+    ("get_employee_by_id", employee_service.get_employee_by_id,
+     previous_get_employee_by_id, "employees"),
+    ("get_active_salary", employee_service.get_active_salary,
+     previous_get_active_salary, "employees"),
+    ("get_active_salary as_of",
+     lambda key, db: employee_service.get_active_salary(key, db, date.today()),
+     lambda key, db: previous_get_active_salary(key, db, date.today()), "employees"),
+    ("get_latest_performance_review", employee_service.get_latest_performance_review,
+     previous_get_latest_performance_review, "employees"),
+    ("get_highest_salary_in_last_six_months",
+     salary_service.get_highest_salary_in_last_six_months,
+     previous_get_highest_salary_in_last_six_months, "employees"),
+    ("get_salary_by_id", salary_service.get_salary_by_id,
+     previous_get_salary_by_id, "salaries"),
+    ("get_performance_review_by_id",
+     performance_review_service.get_performance_review_by_id,
+     previous_get_performance_review_by_id, "reviews"),
+    ("get_department_by_id", department_service.get_department_by_id,
+     previous_get_department_by_id, "departments"),
+    ("get_job_title_by_id", job_title_service.get_job_title_by_id,
+     previous_get_job_title_by_id, "job_titles"),
+]
+
+# Names the routes call the lookups by, and the previous implementation.
+PATCHES = [
+    ("src.pwcexercise.services.employee_service.get_employee_by_id",
+     previous_get_employee_by_id),
+    ("src.pwcexercise.routes.salary.get_employee_by_id", previous_get_employee_by_id),
+    ("src.pwcexercise.routes.performance_review.get_employee_by_id",
+     previous_get_employee_by_id),
+    ("src.pwcexercise.services.employee_service.get_active_salary",
+     previous_get_active_salary),
+    ("src.pwcexercise.services.employee_service.get_latest_performance_review",
+     previous_get_latest_performance_review),
+    ("src.pwcexercise.services.salary_service.get_highest_salary_in_last_six_months",
+     previous_get_highest_salary_in_last_six_months),
+    ("src.pwcexercise.services.salary_service.get_salary_by_id",
+     previous_get_salary_by_id),
+    ("src.pwcexercise.services.performance_review_service.get_performance_review_by_id",
+     previous_get_performance_review_by_id),
+    ("src.pwcexercise.services.department_service.get_department_by_id",
+     previous_get_department_by_id),
+    ("src.pwcexercise.services.job_title_service.get_job_title_by_id",
+     previous_get_job_title_by_id),
+]
+
+ROUTES = [
+    ("/employees/{employees}/active_salary", "employees"),
+    ("/employees/{employees}/latest_performance_review", "employees"),
+    ("/employees/{employees}/aguinaldo", "employees"),
+    ("/employees/{employees}/hours_worked", "employees"),
+    ("/salaries/{salaries}", "salaries"),
+    ("/performance_reviews/{reviews}", "reviews"),
+    ("/departments/{departments}", "departments"),
+    ("/job_titles/{job_titles}", "job_titles"),
+]
+
+
+def per_call(
+        lookup: Callable[[int, Session], object],
+        db: Session,
+        keys: list[int],
+        repeat: int = 3,
+    ) -> float:
+    """Return the best time per call in microseconds over ``keys``."""
+    for key in keys[:100]:
+        lookup(key, db)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for key in keys:
+            lookup(key, db)
+        best = min(best, time.perf_counter() - start)
+        db.rollback()
+    return best / len(keys) * 1e6
+
+
+def throughput(client: TestClient, paths: list[str]) -> float:
+    """Return the requests per second of ``paths``, failing on an error."""
+    for path in paths[:50]:
+        client.get(path)
+    start = time.perf_counter()
+    for path in paths:
+        response = client.get(path)
+        if response.status_code >= 500:
+            msg = f"{path} answered {response.status_code}"
+            raise RuntimeError(msg)
+    return len(paths) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Run the statement cache benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = build_engine(args.employees, 12, 4)
+    factory = session_factory(engine)
+    rng = random.Random(7)
+    sizes = {
+        "employees": args.employees,
+        "salaries": args.employees * 12,
+        "reviews": args.employees * 4,
+        "departments": 3,
+        "job_titles": 9,
+    }
+
+    def keys(kind: str, count: int) -> list[int]:
+        return [rng.randint(1, sizes[kind]) for _ in range(count)]
+
+    print(f"{'lookup':<40} {'previous us':>12} {'cached us':>10} {'speedup':>8}")
+    with new_session(engine) as db:
+        for label, current, previous, kind in LOOKUPS:
+            sample = keys(kind, args.calls)
+            before = per_call(previous, db, sample)
+            after = per_call(current, db, sample)
+            print(f"{label:<40} {before:>12.1f} {after:>10.1f} {before / after:>7.1f}x")
+
+    def bench_db() -> Iterator[Session]:
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = bench_db
+    print()
+    print(f"{'route':<48} {'previous r/s':>13} {'cached r/s':>11} {'gain':>7}")
+    try:
+        with TestClient(app) as client:
+            for template, kind in ROUTES:
+                paths = [
+                    template.format(**{kind: key})
+                    for key in keys(kind, args.requests)
+                ]
+                with ExitStack() as stack:
+                    for target, previous in PATCHES:
+                        stack.enter_context(mock.patch(target, previous))
+                    before = throughput(client, paths)
+                after = throughput(client, paths)
+                print(f"{template:<48} {before:>13.0f} {after:>11.0f} "
+                      f"{(after / before - 1) * 100:>6.0f}%")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Compare the throughput of one server process with a pool of workers.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_workers --workers 4 --duration 10
+
+A synthetic database is written to a temporary directory and the launcher
+is started there twice, once with a single worker and once with
+``--workers``. Both runs get the same closed-loop load: ``--concurrency``
+client threads, each sending requests back to back over a keep-alive
+connection. Requests per second and latency percentiles are printed for
+both. The client shares the machine with the server, so use at most about
+half of the cores for workers to keep it from becoming the bottleneck.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.common import build_engine
+
+ROOT = Path(__file__).resolve().parent.parent
+PATHS = (
+    "/employees/?limit=50",
+    "/employees/?department_id=2&sort=-salary&limit=20",
+    "/departments/1/medium_salary",
+)
+
+
+def wait_until_ready(port: int, timeout: float = 30) -> None:
+    """Block until the server answers ``/health``."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    msg = f"server on port {port} did not start"
+    raise RuntimeError(msg)
+
+
+def load(port: int, concurrency: int, duration: float) -> tuple[int, int, np.ndarray]:
+    """Send requests for ``duration`` seconds; return ok, errors and latencies."""
+    latencies: list[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(index: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        own: list[float] = []
+        failed = 0
+        sent = index
+        while time.monotonic() < deadline:
+            path = PATHS[sent % len(PATHS)]
+            sent += 1
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                # Recycled workers close their keep-alive connections.
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            own.append(time.perf_counter() - start)
+        conn.close()
+        with lock:
+            latencies.extend(own)
+            errors[0] += failed
+
+    threads = [
+        threading.Thread(target=client, args=(i,)) for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies), errors[0], np.array(latencies)
+
+
+def run(
+        workdir: Path, workers: int, port: int, args: argparse.Namespace,
+    ) -> None:
+    """Start the launcher with ``workers`` workers, load it and print the results."""
+    command = [
+        sys.executable, "-m", "src.pwcexercise.server.launcher",
+        "--port", str(port), "--workers", str(workers), "--no-access-log",
+        "--max-requests", str(args.max_requests),
+    ]
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    server = subprocess.Popen(
+        command, cwd=workdir, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(port)
+        load(port, args.concurrency, min(2.0, args.duration))  # warm up
+        ok, errors, latencies = load(port, args.concurrency, args.duration)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    p50, p99 = (np.percentile(latencies, [50, 99]) * 1000) if ok else (0, 0)
+    print(f"{workers:>7} {ok:>9} {errors:>6} {ok / args.duration:>9.1f} "
+          f"{p50:>8.1f} {p99:>8.1f}")
+
+
+def main() -> None:
+    """Run the worker pool benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--max-requests", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        build_engine(
+            args.employees, url=f"sqlite:///{workdir / 'hr_database.db'}",
+        ).dispose()
+        print(f"cpus: {os.cpu_count()}, concurrency: {args.concurrency}, "
+              f"duration: {args.duration:g}s")
+        print(f"{'workers':>7} {'requests':>9} {'errors':>6} {'req/s':>9} "
+              f"{'p50 ms':>8} {'p99 ms':>8}")
+        for workers in sorted({1, args.workers}):
+            run(workdir, workers, args.port, args)
+
+
+if __name__ == "__main__":
+    main()
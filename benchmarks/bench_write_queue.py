@@ -0,0 +1,140 @@
+"""Compare per-request commits with the group-committing write queue.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_write_queue --writers 100 --writes 20
+
+``--writers`` threads each create ``--writes`` salaries on a file backed
+SQLite database, the way concurrent ``POST /salaries/`` requests do. The
+direct path opens a session per write and commits it, like the services
+used to; the queued path hands the same mutation to a ``WriteQueue``. For
+both it prints writes per second, failed writes (``database is locked``),
+latency percentiles and the number of commits.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from benchmarks.common import build_engine, session_factory
+from src.pwcexercise.config.write_queue import WriteQueue
+from src.pwcexercise.models.salary import Salary
+from src.pwcexercise.services.salary_service import refresh_validity_intervals
+
+
+def add_salary(session: Session, employee_id: int, day: date) -> int:
+    """Insert a salary and recompute the employee's validity intervals."""
+    salary = Salary(
+        employee_id=employee_id, monthly_income=5000.0, hourly_rate=50.0,
+        effective_date=day,
+    )
+    session.add(salary)
+    session.flush()
+    refresh_validity_intervals(session, [employee_id])
+    return salary.id
+
+
+def count_commits(engine: Engine) -> list[int]:
+    """Count the transactions committed on ``engine``."""
+    commits = [0]
+
+    @event.listens_for(engine, "commit")
+    def on_commit(conn: object) -> None:
+        commits[0] += 1
+
+    return commits
+
+
+def run(
+        label: str,
+        write: Callable[[int, date], None],
+        writers: int,
+        writes: int,
+        employees: int,
+        commits: list[int],
+    ) -> None:
+    """Run ``writers`` threads of ``writes`` each and print the results."""
+    latencies: list[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    start_gate = threading.Barrier(writers)
+    commits[0] = 0
+
+    def writer(index: int) -> None:
+        own, failed = [], 0
+        start_gate.wait()
+        for n in range(writes):
+            day = date(2030, 1, 1) + timedelta(days=index * writes + n)
+            started = time.perf_counter()
+            try:
+                write((index * writes + n) % employees + 1, day)
+            except OperationalError:
+                failed += 1
+                continue
+            own.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(own)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ok = len(latencies)
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000 if ok else (0, 0)
+    print(f"{label:<8} {ok:>7} {errors[0]:>7} {ok / elapsed:>9.1f} "
+          f"{p50:>8.1f} {p99:>8.1f} {commits[0]:>8}")
+
+
+def main() -> None:
+    """Run the write queue benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=100)
+    parser.add_argument("--writes", type=int, default=20)
+    parser.add_argument("--employees", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(
+            args.employees, 2, 1, url=f"sqlite:///{Path(tmp) / 'bench.db'}",
+        )
+        commits = count_commits(engine)
+        factory = session_factory(engine)
+
+        def direct(employee_id: int, day: date) -> None:
+            with factory() as session:
+                add_salary(session, employee_id, day)
+                session.commit()
+
+        queue = WriteQueue(factory)
+
+        def queued(employee_id: int, day: date) -> None:
+            queue.execute(lambda session: add_salary(session, employee_id, day))
+
+        print(f"writers: {args.writers}, writes each: {args.writes}")
+        print(f"{'path':<8} {'writes':>7} {'errors':>7} {'writes/s':>9} "
+              f"{'p50 ms':>8} {'p99 ms':>8} {'commits':>8}")
+        run("direct", direct, args.writers, args.writes, args.employees, commits)
+        run("queued", queued, args.writers, args.writes, args.employees, commits)
+        queue.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throw-away SQLite database filled with synthetic
+rows, so they never touch ``hr_database.db``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.pwcexercise.config.db import use_explicit_transactions
+from src.pwcexercise.models.base import Base
+from src.pwcexercise.models.department import Department
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.job_title import JobTitle
+from src.pwcexercise.models.performance_review import PerformanceReview
+from src.pwcexercise.models.salary import Salary
+from src.pwcexercise.services.salary_service import refresh_validity_intervals
+
+DEPARTMENTS = ["Research & Development", "Sales", "Human Resources"]
+JOB_TITLES = [
+    "Sales Executive", "Research Scientist", "Laboratory Technician",
+    "Manufacturing Director", "Healthcare Representative", "Manager",
+    "Sales Representative", "Research Director", "Human Resources",
+]
+
+
+def build_engine(
+        employees: int = 2000,
+        salaries_per_employee: int = 12,
+        reviews_per_employee: int = 4,
+        url: str = "sqlite://",
+        seed: int = 42,
+    ) -> Engine:
+    """Create a database populated with synthetic HR data.
+
+    :param employees: Number of employees to create
+    :param salaries_per_employee: Monthly salary rows per employee
+    :param reviews_per_employee: Performance reviews per employee
+    :param url: Database URL, an in-memory SQLite database by default
+    :param seed: Seed for the random generator so runs are comparable
+    :return: Engine bound to the populated database
+    """
+    rng = random.Random(seed)
+    options = {"poolclass": StaticPool} if url == "sqlite://" else {}
+    engine = create_engine(
+        url, connect_args={"check_same_thread": False}, **options,
+    )
+    use_explicit_transactions(engine)
+    Base.metadata.create_all(engine)
+    today = date.today()
+
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Department), [{"name": name} for name in DEPARTMENTS],
+        )
+        conn.execute(insert(JobTitle), [{"name": name} for name in JOB_TITLES])
+        conn.execute(insert(Employee), [
+            {
+                "emp_id": f"RM{i:06d}",
+                "age": rng.randint(18, 65),
+                "department_id": rng.randint(1, len(DEPARTMENTS)),
+                "hire_date": today - timedelta(days=rng.randint(30, 365 * 20)),
+                "job_title_id": rng.randint(1, len(JOB_TITLES)),
+            }
+            for i in range(1, employees + 1)
+        ])
+        conn.execute(insert(Salary), [
+            {
+                "employee_id": employee_id,
+                "monthly_income": round(rng.uniform(1000, 20000), 2),
+                "hourly_rate": rng.randint(30, 100),
+                "effective_date": today - timedelta(days=30 * month),
+            }
+            for employee_id in range(1, employees + 1)
+            for month in range(salaries_per_employee)
+        ])
+        conn.execute(insert(PerformanceReview), [
+            {
+                "employee_id": employee_id,
+                "review_date": today - timedelta(days=rng.randint(1, 365 * 5)),
+                "score": rng.randint(1, 5),
+                "comments": "Auto-generated review",
+            }
+            for employee_id in range(1, employees + 1)
+            for _ in range(reviews_per_employee)
+        ])
+    with Session(engine) as db:
+        refresh_validity_intervals(db)
+        db.commit()
+    return engine
+
+
+def session_factory(engine: Engine) -> sessionmaker:
+    """Return a session factory configured like the application's one."""
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def timed(func: Callable[[], object], repeat: int = 5) -> tuple[float, object]:
+    """Run ``func`` ``repeat`` times and return the best wall time and last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def new_session(engine: Engine) -> Session:
+    """Open a fresh session on ``engine``."""
+    return session_factory(engine)()
@@ -0,0 +1,445 @@
+"""Load-test the API with named, mixed workload profiles.
+
+Run from the repository root::
+
+    python -m benchmarks.loadtest --profile hr_clerk --rate 40 --duration 30
+
+By default a database is seeded in a temporary directory with the seed-db
+entry point and the production launcher is started on it with
+``--workers``; pass ``--url`` to load a server that is already running
+instead (it is used as it is, nothing is seeded).
+
+Profiles:
+
+- ``dashboard``: the analytics and aggregate endpoints behind a dashboard.
+- ``hr_clerk``: employee summaries, details and lookups plus salary and
+  review writes.
+- ``sync``: paginated listings, as-of salary lists, review search and
+  columnar exports, like a client mirroring the data.
+- ``mixed``: all of the above.
+
+With ``--rate`` requests are started on a fixed schedule, ``--rate`` per
+second, whether or not earlier ones have finished (open loop), and latency
+is measured from the scheduled start, so time spent waiting for one of the
+``--concurrency`` connections counts. With ``--rate 0`` each of the
+``--concurrency`` clients sends its next request as soon as the previous
+one is answered (closed loop). Latency percentiles, error rates and
+throughput per endpoint are printed and written to ``--report`` as JSON.
+
+Requires ``httpx``, which is installed with FastAPI's test client.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_workers import ROOT, wait_until_ready
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - depends on the environment
+    httpx = None
+
+SEARCH_TERMS = ("review", "generated", "auto*", "team", "leadership")
+
+
+@dataclass
+class Dataset:
+    """Keys of the rows on the server that requests can refer to."""
+
+    employee_ids: list[int]
+    emp_ids: list[str]
+    department_ids: list[int]
+    job_title_ids: list[int]
+    reviews: list[tuple[int, int]]
+
+
+Call = tuple[str, str, dict | None]
+
+
+@dataclass(frozen=True)
+class Operation:
+    """One endpoint of a profile and how often it is called."""
+
+    endpoint: str
+    weight: int
+    build: Callable[[random.Random, Dataset], Call]
+
+
+def _today() -> str:
+    return date.today().isoformat()
+
+
+def _past_day(rng: random.Random) -> str:
+    return (date.today() - timedelta(days=rng.randint(0, 365 * 3))).isoformat()
+
+
+PROFILES: dict[str, list[Operation]] = {
+    "dashboard": [
+        Operation("GET /analytics/aggregate", 4, lambda rng, data: (
+            "GET",
+            "/analytics/aggregate?metric="
+            f"{rng.choice(['monthly_income', 'age', 'review_score'])}"
+            f"&agg={rng.choice(['mean', 'median', 'max'])}"
+            f"&group_by={rng.choice(['department_id', 'job_title_id'])}",
+            None,
+        )),
+        Operation("GET /analytics/histogram", 2, lambda rng, data: (
+            "GET", f"/analytics/histogram?bins={rng.choice([10, 20])}"
+                   "&group_by=department_id", None,
+        )),
+        Operation("GET /salaries/percentiles", 2, lambda rng, data: (
+            "GET", "/salaries/percentiles", None,
+        )),
+        Operation("GET /salaries/current_average", 1, lambda rng, data: (
+            "GET", "/salaries/current_average", None,
+        )),
+        Operation("GET /departments/{id}/medium_salary", 2, lambda rng, data: (
+            "GET", f"/departments/{rng.choice(data.department_ids)}/medium_salary",
+            None,
+        )),
+        Operation("GET /job_titles/{id}/average_performance_score", 1,
+                  lambda rng, data: (
+            "GET",
+            f"/job_titles/{rng.choice(data.job_title_ids)}/average_performance_score",
+            None,
+        )),
+        Operation("GET /salaries/payroll_timeseries", 1, lambda rng, data: (
+            "GET", "/salaries/payroll_timeseries?years=2", None,
+        )),
+    ],
+    "hr_clerk": [
+        Operation("GET /employees/{id}/summary", 6, lambda rng, data: (
+            "GET", f"/employees/{rng.choice(data.employee_ids)}/summary", None,
+        )),
+        Operation("GET /employees/{id}", 3, lambda rng, data: (
+            "GET",
+            f"/employees/{rng.choice(data.employee_ids)}?history_limit=12", None,
+        )),
+        Operation("GET /employees/lookup", 2, lambda rng, data: (
+            "GET",
+            "/employees/lookup?"
+            + "&".join(f"emp_ids={key}" for key in rng.sample(data.emp_ids, 5)),
+            None,
+        )),
+        Operation("POST /salaries/", 2, lambda rng, data: (
+            "POST", "/salaries/", {
+                "employee_id": rng.choice(data.employee_ids),
+                "monthly_income": round(rng.uniform(1000, 20000), 2),
+                "hourly_rate": rng.randint(30, 100),
+                "effective_date": _today(),
+            },
+        )),
+        Operation("POST /performance_reviews/", 1, lambda rng, data: (
+            "POST", "/performance_reviews/", {
+                "employee_id": rng.choice(data.employee_ids),
+                "review_date": _today(),
+                "score": rng.randint(1, 5),
+                "comments": "Load test review",
+            },
+        )),
+        Operation("PUT /performance_reviews/{id}", 1, lambda rng, data: (
+            lambda review: (
+                "PUT", f"/performance_reviews/{review[0]}", {
+                    "employee_id": review[1],
+                    "review_date": _past_day(rng),
+                    "score": rng.randint(1, 5),
+                    "comments": "Updated by the load test",
+                },
+            )
+        )(rng.choice(data.reviews))),
+    ],
+    "sync": [
+        Operation("GET /employees/?view=compact", 4, lambda rng, data: (
+            "GET",
+            "/employees/?view=compact&limit=100"
+            f"&offset={100 * rng.randrange(len(data.employee_ids) // 100 + 1)}",
+            None,
+        )),
+        Operation("GET /employees/", 2, lambda rng, data: (
+            "GET",
+            "/employees/?limit=50&history_limit=3"
+            f"&offset={50 * rng.randrange(len(data.employee_ids) // 50 + 1)}",
+            None,
+        )),
+        Operation("GET /salaries/?as_of", 2, lambda rng, data: (
+            "GET", f"/salaries/?as_of={_past_day(rng)}", None,
+        )),
+        Operation("GET /performance_reviews/search", 2, lambda rng, data: (
+            "GET",
+            f"/performance_reviews/search?q={rng.choice(SEARCH_TERMS)}&limit=50",
+            None,
+        )),
+        Operation("POST /exports/", 1, lambda rng, data: (
+            "POST", f"/exports/?since={_past_day(rng)}", None,
+        )),
+    ],
+}
+PROFILES["mixed"] = [
+    operation for operations in PROFILES.values() for operation in operations
+]
+
+
+@dataclass
+class EndpointStats:
+    """Outcome of the requests sent to one endpoint."""
+
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+    def record(self, latency: float, status: int | str) -> None:
+        self.latencies.append(latency)
+        self.statuses[str(status)] += 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict:
+        """Return counts, error rate, throughput and latency percentiles."""
+        requests = len(self.latencies)
+        latencies = np.array(self.latencies) * 1000
+        percentiles = (
+            np.percentile(latencies, [50, 90, 99]) if requests else [0, 0, 0]
+        )
+        return {
+            "requests": requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / requests, 4) if requests else 0.0,
+            "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": {
+                "p50": round(float(percentiles[0]), 2),
+                "p90": round(float(percentiles[1]), 2),
+                "p99": round(float(percentiles[2]), 2),
+                "max": round(float(latencies.max()), 2) if requests else 0.0,
+                "mean": round(float(latencies.mean()), 2) if requests else 0.0,
+            },
+            "status_codes": dict(sorted(self.statuses.items())),
+        }
+
+
+async def discover(client: httpx.AsyncClient) -> Dataset:
+    """Read the keys of the employees, departments, job titles and reviews."""
+    employees = (await client.get("/employees/?view=compact")).json()
+    departments = (await client.get("/departments/")).json()
+    job_titles = (await client.get("/job_titles/")).json()
+    reviews = (await client.get("/performance_reviews/")).json()
+    if not employees or not reviews:
+        msg = "the server has no employees or reviews to load-test with"
+        raise RuntimeError(msg)
+    return Dataset(
+        employee_ids=[row["id"] for row in employees],
+        emp_ids=[row["emp_id"] for row in employees],
+        department_ids=[row["id"] for row in departments],
+        job_title_ids=[row["id"] for row in job_titles],
+        reviews=[(row["id"], row["employee_id"]) for row in reviews],
+    )
+
+
+class LoadRun:
+    """Send the requests of one profile and collect their outcome."""
+
+    def __init__(
+            self,
+            client: httpx.AsyncClient,
+            operations: list[Operation],
+            dataset: Dataset,
+            seed: int,
+        ) -> None:
+        self.client = client
+        self.operations = operations
+        self.weights = [operation.weight for operation in operations]
+        self.dataset = dataset
+        self.rng = random.Random(seed)
+        self.stats: dict[str, EndpointStats] = defaultdict(EndpointStats)
+
+    async def send(self, started: float) -> None:
+        """Send one request of the profile; latency counts from ``started``."""
+        operation = self.rng.choices(self.operations, self.weights)[0]
+        method, url, body = operation.build(self.rng, self.dataset)
+        try:
+            response = await self.client.request(method, url, json=body)
+            await response.aread()
+            status: int | str = response.status_code
+        except httpx.HTTPError as error:
+            status = type(error).__name__
+        loop = asyncio.get_running_loop()
+        self.stats[operation.endpoint].record(loop.time() - started, status)
+
+    async def open_loop(self, rate: float, duration: float, concurrency: int) -> None:
+        """Start ``rate`` requests per second, at most ``concurrency`` at a time."""
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(concurrency)
+        pending: set[asyncio.Task] = set()
+
+        async def scheduled(started: float) -> None:
+            async with slots:
+                await self.send(started)
+
+        start = loop.time()
+        for n in range(int(rate * duration)):
+            started = start + n / rate
+            delay = started - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(scheduled(started))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        await asyncio.gather(*pending)
+
+    async def closed_loop(self, duration: float, concurrency: int) -> None:
+        """Keep ``concurrency`` clients sending back to back for ``duration``."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration
+
+        async def client() -> None:
+            while loop.time() < deadline:
+                await self.send(loop.time())
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+
+
+async def load(url: str, args: argparse.Namespace) -> dict:
+    """Run the selected profile against ``url`` and return the report."""
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency,
+    )
+    async with httpx.AsyncClient(
+            base_url=url, limits=limits, timeout=args.timeout,
+        ) as client:
+        dataset = await discover(client)
+        run = LoadRun(client, PROFILES[args.profile], dataset, args.seed)
+        started_at = datetime.now(tz=timezone.utc)
+        start = time.perf_counter()
+        if args.rate:
+            await run.open_loop(args.rate, args.duration, args.concurrency)
+        else:
+            await run.closed_loop(args.duration, args.concurrency)
+        elapsed = time.perf_counter() - start
+
+    total = EndpointStats()
+    for stats in run.stats.values():
+        total.latencies.extend(stats.latencies)
+        total.statuses.update(stats.statuses)
+        total.errors += stats.errors
+    return {
+        "profile": args.profile,
+        "mode": "open" if args.rate else "closed",
+        "rate": args.rate,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "elapsed_s": round(elapsed, 3),
+        "url": url,
+        "workers": None if args.url else args.workers,
+        "started_at": started_at.isoformat(),
+        "total": total.summary(elapsed),
+        "endpoints": {
+            endpoint: stats.summary(elapsed)
+            for endpoint, stats in sorted(run.stats.items())
+        },
+    }
+
+
+def seed(workdir: Path) -> None:
+    """Create and seed ``hr_database.db`` in ``workdir`` with the seed-db entry point."""
+    subprocess.run(
+        [sys.executable, "-m", "src.pwcexercise.seeds.seeder"],
+        cwd=workdir, env={**os.environ, "PYTHONPATH": str(ROOT)}, check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def start_server(workdir: Path, args: argparse.Namespace) -> subprocess.Popen:
+    """Start the launcher in ``workdir`` and wait until it answers."""
+    command = [
+        sys.executable, "-m", "src.pwcexercise.server.launcher",
+        "--port", str(args.port), "--workers", str(args.workers),
+        "--no-access-log", "--max-requests", "0",
+    ]
+    server = subprocess.Popen(
+        command, cwd=workdir, env={**os.environ, "PYTHONPATH": str(ROOT)},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(args.port)
+    except RuntimeError:
+        server.kill()
+        raise
+    return server
+
+
+def print_report(report: dict) -> None:
+    """Print one line per endpoint and the total."""
+    print(f"profile: {report['profile']}, mode: {report['mode']}, "
+          f"rate: {report['rate']:g}/s, concurrency: {report['concurrency']}, "
+          f"elapsed: {report['elapsed_s']:g}s")
+    print(f"{'endpoint':<48} {'reqs':>6} {'err %':>6} {'rps':>7} "
+          f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}")
+    rows = [*report["endpoints"].items(), ("total", report["total"])]
+    for endpoint, stats in rows:
+        latency = stats["latency_ms"]
+        print(f"{endpoint:<48} {stats['requests']:>6} "
+              f"{stats['error_rate'] * 100:>6.1f} {stats['throughput_rps']:>7.1f} "
+              f"{latency['p50']:>8.1f} {latency['p90']:>8.1f} {latency['p99']:>8.1f}")
+
+
+def main() -> None:
+    """Run the load test."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mixed")
+    parser.add_argument(
+        "--rate", type=float, default=20,
+        help="Requests started per second (open loop); 0 for a closed loop",
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--report", type=Path, help="JSON report path")
+    parser.add_argument("--url", help="Load this running server instead")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    if httpx is None:
+        parser.error("the load test needs httpx, install it with `pip install httpx`")
+    if args.rate < 0 or args.concurrency < 1 or args.duration <= 0:
+        parser.error("--rate must be >= 0, --concurrency >= 1 and --duration > 0")
+    report_path = args.report or Path(f"loadtest-{args.profile}.json")
+
+    if args.url:
+        report = asyncio.run(load(args.url, args))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            seed(workdir)
+            server = start_server(workdir, args)
+            try:
+                report = asyncio.run(load(f"http://127.0.0.1:{args.port}", args))
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=60)
+
+    print_report(report)
+    report_path.write_text(json.dumps(report, indent=2))
+    print(f"report written to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
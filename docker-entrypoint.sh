@@ -1,6 +1,19 @@
 #!/bin/bash
-poetry run alembic upgrade head
+set -e
 
-poetry run seed-db
+# Migrations and seeding are opt-in, so restarting a container neither
+# changes the schema nor wipes the data.
+if [ "${RUN_MIGRATIONS:-0}" = "1" ]; then
+    poetry run alembic upgrade head
+fi
 
-poetry run uvicorn app:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
+# Restores the seeded snapshot of the current schema, seeding it only once.
+if [ "${SEED_DB:-0}" = "1" ]; then
+    poetry run db-snapshot restore
+fi
+
+if [ "${RELOAD:-0}" = "1" ]; then
+    exec poetry run uvicorn app:app --host 0.0.0.0 --port 8000 --reload
+fi
+
+exec poetry run serve --host 0.0.0.0 --port 8000 "$@"
@@ -1,22 +1,61 @@
 """Database configuration module."""
 
 from collections.abc import Generator
+from sqlite3 import Connection as SQLiteConnection
 
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import sessionmaker
 
 from src.pwcexercise.models.base import Base
 
 DATABASE_URL = "sqlite:///hr_database.db"
 
+# Execution option of the connections that take the write lock when their
+# transaction begins, as the write queue's do, instead of at their first write.
+BEGIN_IMMEDIATE = "pwcexercise.begin_immediate"
+
+
+def use_explicit_transactions(engine: Engine) -> None:
+    """Let SQLAlchemy, not pysqlite, begin the transactions of a SQLite engine.
+
+    pysqlite only sends ``BEGIN`` before an ``INSERT``, ``UPDATE`` or
+    ``DELETE``: reads run outside any transaction, and a ``SAVEPOINT`` sent
+    first starts a transaction of its own that its ``RELEASE`` commits. With
+    these hooks every transaction SQLAlchemy begins is a real one, as its
+    documentation recommends. The database is switched to WAL so that a
+    request reading in its transaction never keeps a writer from committing.
+
+    :param engine: Engine of a SQLite database
+    """
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection: SQLiteConnection, _record: object) -> None:
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection: Connection) -> None:
+        immediate = connection.get_execution_options().get(BEGIN_IMMEDIATE, False)
+        connection.exec_driver_sql("BEGIN IMMEDIATE" if immediate else "BEGIN")
+
+
 engine = create_engine(DATABASE_URL)
+use_explicit_transactions(engine)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 Base.metadata.create_all(engine)
 
-def get_db() -> Generator[SessionLocal, None, None]:
-    """Get a database session."""
+# Scope key under which ``POST /batch`` lends its session to sub-requests.
+BATCH_SESSION_KEY = "pwcexercise.batch_session"
+
+def get_db(request: Request) -> Generator[SessionLocal, None, None]:
+    """Get a database session, the one of the batch for a batched read."""
+    shared = request.scope.get(BATCH_SESSION_KEY)
+    if shared is not None:
+        yield shared
+        return
     db = SessionLocal()
     try:
         yield db
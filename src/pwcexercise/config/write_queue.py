@@ -0,0 +1,211 @@
+"""Single-writer queue that group-commits database writes.
+
+SQLite allows one writer at a time and every commit pays an fsync. Instead
+of committing from every request, the service write functions hand a
+mutation, a function that receives a session and returns a plain result, to
+the queue and wait for it. One writer thread takes everything queued (up to
+``MAX_BATCH`` mutations, waiting at most ``MAX_DELAY`` seconds for more),
+runs each mutation in its own savepoint and commits the batch once. The
+batch is one ``BEGIN IMMEDIATE`` transaction, so the engine must let
+SQLAlchemy begin its transactions (``use_explicit_transactions``): with
+pysqlite's own handling every savepoint would commit on its own.
+
+A mutation that raises only rolls back its own savepoint and its caller
+gets the exception; the others in the batch still commit. If the commit
+itself fails every caller in the batch gets that error.
+
+Mutations run on the writer's session, so they must return plain values
+such as IDs, never ORM instances, and callers reload what they need with
+their own session once the write is committed. The services queue their
+writes with ``execute_write``, which first ends the read transaction of the
+caller's session: otherwise its next read would still see the database as
+it was before the write. Each process has its own writer; the writers of
+different worker processes still take turns on the SQLite lock.
+
+Every session is served by the queue of its database: ``write_queue`` for
+the application's, or the queue a session factory names in its ``info``
+under ``WRITE_QUEUE_KEY``, as the test sessions of ``isolated_session`` do.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TypeVar
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.pwcexercise.config.db import BEGIN_IMMEDIATE, SessionLocal
+from src.pwcexercise.utils.logger import logger
+
+MAX_BATCH = 128
+MAX_DELAY = 0.002
+WRITE_TIMEOUT = 30
+
+# Key of ``Session.info`` naming the queue of the session's database.
+WRITE_QUEUE_KEY = "pwcexercise.write_queue"
+
+T = TypeVar("T")
+Mutation = Callable[[Session], T]
+
+
+class WriteQueue:
+    """Funnel mutations through one writer thread and commit them in batches."""
+
+    def __init__(
+            self,
+            session_factory: sessionmaker,
+            max_batch: int = MAX_BATCH,
+            max_delay: float = MAX_DELAY,
+        ) -> None:
+        """Create a queue; the writer thread starts with the first mutation.
+
+        :param session_factory: Factory of the writer's sessions
+        :param max_batch: Most mutations committed in one transaction
+        :param max_delay: Longest wait for more mutations once one is queued
+        """
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: queue.SimpleQueue | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> queue.SimpleQueue:
+        # Threads do not survive fork: a forked worker starts its own writer.
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._queue = queue.SimpleQueue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._queue,),
+                    name="db-writer", daemon=True,
+                )
+                self._thread.start()
+            return self._queue
+
+    def submit(self, mutation: Mutation[T]) -> Future[T]:
+        """Queue ``mutation`` and return a future of its result."""
+        future: Future[T] = Future()
+        self._ensure_started().put((mutation, future))
+        return future
+
+    def execute(self, mutation: Mutation[T], timeout: float = WRITE_TIMEOUT) -> T:
+        """Queue ``mutation``, wait until its batch is committed and return its result.
+
+        A mutation still queued when ``timeout`` ends is cancelled, so a
+        caller that gets ``TimeoutError`` knows it was not applied. One the
+        writer has already started is waited for, since its batch commits or
+        fails shortly.
+
+        :param mutation: Function applying the write to the given session
+        :param timeout: Seconds to wait before giving up
+        :return: The value returned by ``mutation``
+        :raises TimeoutError: If the mutation was cancelled before it ran
+        """
+        future = self.submit(mutation)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            if not future.cancel():
+                return future.result()
+            msg = f"The write was not applied: still queued after {timeout}s"
+            raise TimeoutError(msg) from None
+
+    def close(self) -> None:
+        """Commit what is queued and stop the writer thread."""
+        with self._lock:
+            thread, pending = self._thread, self._queue
+            self._thread = None
+        if thread is not None and self._pid == os.getpid():
+            pending.put(None)
+            thread.join()
+
+    def _take_batch(self, pending: queue.SimpleQueue, first: tuple) -> tuple[list, bool]:
+        """Collect up to ``max_batch`` mutations, waiting at most ``max_delay``."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = pending.get(timeout=remaining) if remaining > 0 else (
+                    pending.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self, pending: queue.SimpleQueue) -> None:
+        stopping = False
+        while not stopping:
+            first = pending.get()
+            if first is None:
+                break
+            batch, stopping = self._take_batch(pending, first)
+            try:
+                self._commit(batch)
+            except Exception as error:
+                logger.exception("Write batch failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+
+    def _commit(self, batch: list[tuple[Mutation, Future]]) -> None:
+        """Apply every mutation of ``batch`` in one transaction."""
+        outcomes = []
+        with self.session_factory() as session:
+            session.connection(execution_options={BEGIN_IMMEDIATE: True})
+            for mutation, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                savepoint = session.begin_nested()
+                try:
+                    result = mutation(session)
+                    savepoint.commit()
+                except Exception as error:
+                    savepoint.rollback()
+                    outcomes.append((future, None, error))
+                else:
+                    outcomes.append((future, result, None))
+            session.commit()
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+write_queue = WriteQueue(SessionLocal)
+atexit.register(write_queue.close)
+
+
+def queue_of(db: Session) -> WriteQueue:
+    """Return the queue writing to the database of ``db``."""
+    return db.info.get(WRITE_QUEUE_KEY, write_queue)
+
+
+def execute_write(
+        db: Session, mutation: Mutation[T], timeout: float = WRITE_TIMEOUT,
+    ) -> T:
+    """Run ``mutation`` through the queue of ``db``'s database and return its result.
+
+    The read transaction of ``db`` is ended first, so its next read sees the
+    committed write. ``db`` must not hold writes of its own.
+
+    :param db: Session of the caller
+    :param mutation: Function applying the write to the given session
+    :param timeout: Seconds to wait before giving up, as for ``WriteQueue.execute``
+    :return: The value returned by ``mutation``
+    """
+    db.rollback()
+    return queue_of(db).execute(mutation, timeout)
@@ -0,0 +1,338 @@
+"""Columnar snapshots of the database tables in Parquet or Arrow format.
+
+Every table is read inside one read transaction so all files describe the
+same point in time. Rows are streamed from the database in record batches
+and written as they arrive, so memory stays bounded by the batch size and
+not by the table size.
+
+``salaries`` and ``performance_reviews``, archived rows included, are
+partitioned by the month of ``effective_date`` / ``review_date``
+(``<table>/<column>_month=YYYY-MM/``).
+Passing ``since`` writes an incremental snapshot with only the partitions
+from that date onwards.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import Select, select
+from sqlalchemy.engine import Connection, Engine
+
+from src.pwcexercise.models.department import Department
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.job_title import JobTitle
+from src.pwcexercise.services.archive_service import review_history, salary_history
+from src.pwcexercise.utils.logger import logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+EXPORT_DIR = Path("exports")
+BATCH_SIZE = 10_000
+FORMATS = ("parquet", "arrow")
+TABLES = ("departments", "job_titles", "employees", "salaries", "performance_reviews")
+
+
+class SnapshotUnavailableError(RuntimeError):
+    """Raised when the columnar export dependencies are not installed."""
+
+
+@dataclass
+class TableExport:
+    """Files and row count written for one table."""
+
+    rows: int = 0
+    files: list[str] = field(default_factory=list)
+
+
+@dataclass
+class SnapshotManifest:
+    """Description of a written snapshot, stored next to it as ``manifest.json``."""
+
+    snapshot_id: str
+    format: str
+    created_at: str
+    since: str | None
+    tables: dict[str, TableExport]
+
+    def to_dict(self) -> dict:
+        """Return the manifest as a JSON serializable dict."""
+        return asdict(self)
+
+
+def _name_type() -> pa.DataType:
+    """Arrow type for department and job-title names, dictionary encoded."""
+    return pa.dictionary(pa.int32(), pa.string())
+
+
+def _table_specs(since: date | None) -> dict[str, tuple[Select, pa.Schema, str | None]]:
+    """Return the statement, Arrow schema and partition column of each table."""
+    departments = Department.__table__
+    job_titles = JobTitle.__table__
+    employees = Employee.__table__
+    salaries = salary_history()
+    reviews = review_history()
+
+    salary_query = select(salaries).order_by(salaries.c.effective_date, salaries.c.id)
+    review_query = select(reviews).order_by(reviews.c.review_date, reviews.c.id)
+    if since is not None:
+        salary_query = salary_query.where(salaries.c.effective_date >= since)
+        review_query = review_query.where(reviews.c.review_date >= since)
+
+    return {
+        "departments": (
+            select(departments).order_by(departments.c.id),
+            pa.schema([("id", pa.int64()), ("name", _name_type())]),
+            None,
+        ),
+        "job_titles": (
+            select(job_titles).order_by(job_titles.c.id),
+            pa.schema([("id", pa.int64()), ("name", _name_type())]),
+            None,
+        ),
+        "employees": (
+            select(
+                employees,
+                departments.c.name.label("department"),
+                job_titles.c.name.label("job_title"),
+            )
+            .outerjoin(departments, employees.c.department_id == departments.c.id)
+            .outerjoin(job_titles, employees.c.job_title_id == job_titles.c.id)
+            .order_by(employees.c.id),
+            pa.schema([
+                ("id", pa.int64()),
+                ("emp_id", pa.string()),
+                ("age", pa.int32()),
+                ("department_id", pa.int64()),
+                ("hire_date", pa.date32()),
+                ("job_title_id", pa.int64()),
+                ("department", _name_type()),
+                ("job_title", _name_type()),
+            ]),
+            None,
+        ),
+        "salaries": (
+            salary_query,
+            pa.schema([
+                ("id", pa.int64()),
+                ("employee_id", pa.int64()),
+                ("monthly_income", pa.float64()),
+                ("hourly_rate", pa.float64()),
+                ("effective_date", pa.date32()),
+                ("effective_to", pa.date32()),
+            ]),
+            "effective_date",
+        ),
+        "performance_reviews": (
+            review_query,
+            pa.schema([
+                ("id", pa.int64()),
+                ("employee_id", pa.int64()),
+                ("review_date", pa.date32()),
+                ("score", pa.int32()),
+                ("comments", pa.string()),
+            ]),
+            "review_date",
+        ),
+    }
+
+
+class _BatchWriter:
+    """Write record batches of one schema to a Parquet or Arrow IPC file.
+
+    Every batch comes with its own dictionaries, but an Arrow IPC file holds
+    one dictionary per column that later batches may only extend. For that
+    format the writer re-encodes the dictionary columns against a dictionary
+    that only grows and writes the new values as deltas.
+    """
+
+    def __init__(self, path: Path, schema: pa.Schema, file_format: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._dictionaries: dict[str, dict[str, int]] | None = None
+        if file_format == "parquet":
+            dictionary_columns = [
+                f.name for f in schema if pa.types.is_dictionary(f.type)
+            ]
+            self._writer = pq.ParquetWriter(
+                path, schema, use_dictionary=dictionary_columns or False,
+                compression="zstd",
+            )
+        else:
+            self._dictionaries = {
+                f.name: {} for f in schema if pa.types.is_dictionary(f.type)
+            }
+            self._writer = pa.ipc.new_file(
+                str(path), schema,
+                options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True),
+            )
+
+    def _extend_dictionaries(self, batch: pa.RecordBatch) -> pa.RecordBatch:
+        columns = []
+        for f, column in zip(batch.schema, batch.columns):
+            codes = self._dictionaries.get(f.name)
+            if codes is None:
+                columns.append(column)
+                continue
+            values = column.to_pylist()
+            for value in values:
+                if value is not None and value not in codes:
+                    codes[value] = len(codes)
+            columns.append(pa.DictionaryArray.from_arrays(
+                pa.array([None if v is None else codes[v] for v in values],
+                         f.type.index_type),
+                pa.array(list(codes), f.type.value_type),
+            ))
+        return pa.RecordBatch.from_arrays(columns, schema=batch.schema)
+
+    def write(self, batch: pa.RecordBatch) -> None:
+        """Append ``batch`` to the file."""
+        if self._dictionaries:
+            batch = self._extend_dictionaries(batch)
+        self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        self._writer.close()
+
+
+def _export_table(
+        conn: Connection,
+        name: str,
+        statement: Select,
+        schema: pa.Schema,
+        partition_column: str | None,
+        target: Path,
+        file_format: str,
+        batch_size: int,
+    ) -> TableExport:
+    """Stream ``statement`` into columnar files under ``target``."""
+    export = TableExport()
+    extension = "parquet" if file_format == "parquet" else "arrow"
+    writer = None
+    current_partition = None
+    result = conn.execution_options(stream_results=True).execute(statement)
+    try:
+        for rows in result.mappings().partitions(batch_size):
+            batch = pa.RecordBatch.from_pylist([dict(row) for row in rows], schema)
+            if partition_column is None:
+                if writer is None:
+                    writer = _BatchWriter(
+                        target / f"{name}.{extension}", schema, file_format,
+                    )
+                    export.files.append(writer.path.relative_to(target).as_posix())
+                writer.write(batch)
+                export.rows += batch.num_rows
+                continue
+
+            # Rows are ordered by the partition column, so every month is one
+            # contiguous run and only one partition file is open at a time.
+            months = [value.strftime("%Y-%m") for value in batch.column(
+                partition_column).to_pylist()]
+            start = 0
+            while start < len(months):
+                month = months[start]
+                end = start
+                while end < len(months) and months[end] == month:
+                    end += 1
+                if month != current_partition:
+                    if writer is not None:
+                        writer.close()
+                    current_partition = month
+                    writer = _BatchWriter(
+                        target / name / f"{partition_column}_month={month}"
+                        / f"part-0.{extension}",
+                        schema,
+                        file_format,
+                    )
+                    export.files.append(writer.path.relative_to(target).as_posix())
+                writer.write(batch.slice(start, end - start))
+                export.rows += end - start
+                start = end
+    finally:
+        result.close()
+        if writer is not None:
+            writer.close()
+    return export
+
+
+def export_snapshot(
+        engine: Engine,
+        output_dir: Path = EXPORT_DIR,
+        file_format: str = "parquet",
+        since: date | None = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> SnapshotManifest:
+    """Write a consistent columnar snapshot of every table.
+
+    :param engine: Engine of the database to export
+    :param output_dir: Directory where the snapshot directory is created
+    :param file_format: ``"parquet"`` or ``"arrow"`` (Arrow IPC file)
+    :param since: Only export salaries and reviews dated on or after this day
+    :param batch_size: Rows fetched and written per record batch
+    :return: Manifest of the written snapshot
+    """
+    if pa is None:
+        msg = "Columnar exports need the 'pyarrow' package to be installed"
+        raise SnapshotUnavailableError(msg)
+    if file_format not in FORMATS:
+        msg = f"Unknown export format '{file_format}', expected one of {FORMATS}"
+        raise ValueError(msg)
+
+    created_at = datetime.now(tz=timezone.utc)
+    snapshot_id = created_at.strftime("snapshot-%Y%m%dT%H%M%S%fZ")
+    target = Path(output_dir) / snapshot_id
+    target.mkdir(parents=True, exist_ok=False)
+
+    tables = {}
+    with engine.connect() as conn:
+        # One transaction keeps every table read on the same snapshot; the
+        # engine sends its BEGIN (see ``use_explicit_transactions``).
+        conn.begin()
+        for name, (statement, schema, partition) in _table_specs(since).items():
+            logger.info("Exporting %s", name)
+            tables[name] = _export_table(
+                conn, name, statement, schema, partition, target,
+                file_format, batch_size,
+            )
+        conn.rollback()
+
+    manifest = SnapshotManifest(
+        snapshot_id=snapshot_id,
+        format=file_format,
+        created_at=created_at.isoformat(),
+        since=since.isoformat() if since else None,
+        tables=tables,
+    )
+    (target / "manifest.json").write_text(json.dumps(manifest.to_dict(), indent=2))
+    logger.info("Snapshot %s written to %s", snapshot_id, target)
+    return manifest
+
+
+def read_manifest(snapshot_id: str, output_dir: Path = EXPORT_DIR) -> dict | None:
+    """Return the manifest of a written snapshot, or None if it does not exist."""
+    path = Path(output_dir) / snapshot_id / "manifest.json"
+    if not snapshot_id.startswith("snapshot-") or not path.is_file():
+        return None
+    return json.loads(path.read_text())
+
+
+def snapshot_file(
+        snapshot_id: str, relative_path: str, output_dir: Path = EXPORT_DIR,
+    ) -> Path | None:
+    """Resolve a file listed in a snapshot manifest, or None if it is not listed."""
+    manifest = read_manifest(snapshot_id, output_dir)
+    if manifest is None:
+        return None
+    for table in manifest["tables"].values():
+        if relative_path in table["files"]:
+            return Path(output_dir) / snapshot_id / relative_path
+    return None
@@ -0,0 +1,38 @@
+"""Defines the models of the change log read by downstream systems to sync."""
+
+from sqlalchemy import Column, DateTime, Index, Integer, String
+
+from .base import Base
+
+CHANGE_INSERT = "insert"
+CHANGE_UPDATE = "update"
+CHANGE_DELETE = "delete"
+
+
+class Change(Base):
+    """One row created, updated or deleted through the services.
+
+    ``seq`` grows with every change and is never reused (``AUTOINCREMENT``),
+    so it orders changes across tables and is the cursor of the feed.
+    """
+
+    __tablename__ = "changes"
+    __table_args__ = (
+        Index("ix_changes_table_row", "table_name", "row_id", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    table_name = Column(String(64), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)
+    changed_at = Column(DateTime, nullable=False)
+
+
+class ChangeLogState(Base):
+    """Single row holding the highest ``seq`` expired from the change log."""
+
+    __tablename__ = "change_log_state"
+
+    id = Column(Integer, primary_key=True)
+    purged_through = Column(Integer, nullable=False, default=0)
@@ -1,6 +1,6 @@
 """Defines the Employee model for the database."""
 
-from sqlalchemy import Column, Date, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, Date, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -11,11 +11,11 @@ class Employee(Base):
 
     __tablename__ = "employees"
     id = Column(Integer, primary_key=True, autoincrement=True)
-    emp_id = Column(String, nullable=False)
-    age = Column(Integer)
-    department_id = Column(Integer, ForeignKey("departments.id"))
-    hire_date = Column(Date)
-    job_title_id = Column(Integer, ForeignKey("job_titles.id"))
+    emp_id = Column(String, nullable=False, unique=True, index=True)
+    age = Column(Integer, index=True)
+    department_id = Column(Integer, ForeignKey("departments.id"), index=True)
+    hire_date = Column(Date, index=True)
+    job_title_id = Column(Integer, ForeignKey("job_titles.id"), index=True)
 
     department = relationship("Department", backref="employees")
     job_title = relationship("JobTitle", backref="employees")
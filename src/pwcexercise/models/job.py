@@ -0,0 +1,36 @@
+"""Defines the Job model for reports computed in the background."""
+
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, Text
+
+from .base import Base
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+PENDING_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+
+class Job(Base):
+    """Job model recording the status and result of a background report.
+
+    ``fingerprint`` identifies the kind and normalized parameters of a job,
+    so a submission identical to a pending job is answered with that job.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_fingerprint_status", "fingerprint", "status"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(50), nullable=False)
+    params = Column(Text, nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default=JOB_QUEUED)
+    progress = Column(Float, nullable=False, default=0.0)
+    error = Column(Text, nullable=True)
+    result_path = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -1,18 +1,108 @@
 """Defines the PerformanceReview model for an employee's performance evaluation."""
 
-from sqlalchemy import Column, Date, ForeignKey, Integer, String
+from sqlalchemy import (
+    DDL,
+    Column,
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    event,
+)
 
 from .base import Base
 
 
 class PerformanceReview(Base):
-    """Performance Review model representing an employee's performance evaluation."""
+    """Performance Review model representing an employee's performance evaluation.
+
+    IDs are ``AUTOINCREMENT`` so the IDs of archived reviews are never reused.
+    """
 
     __tablename__ = "performance_reviews"
+    __table_args__ = (
+        Index(
+            "ix_performance_reviews_employee_review_date", "employee_id", "review_date",
+        ),
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
+    employee_id = Column(
+        Integer, ForeignKey("employees.id"), nullable=False, index=True,
+    )
+    review_date = Column(Date, nullable=False)
+    score = Column(Integer, nullable=False)
+    comments = Column(String, nullable=True)
+
+
+class PerformanceReviewArchive(Base):
+    """Reviews older than the archive horizon, moved out of ``performance_reviews``.
+
+    Same columns and IDs as ``performance_reviews``; an employee's latest
+    review is never archived. See ``services.archive_service``.
+    """
+
+    __tablename__ = "performance_reviews_archive"
+    __table_args__ = (
+        Index(
+            "ix_performance_reviews_archive_employee_review_date",
+            "employee_id", "review_date",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
     review_date = Column(Date, nullable=False)
     score = Column(Integer, nullable=False)
     comments = Column(String, nullable=True)
 
+
+def fts_ddl(content_table: str, fts_table: str) -> tuple[str, ...]:
+    """Statements creating the full-text index of a reviews table.
+
+    It is an external content FTS5 table, so it stores only the index and
+    reads the text from ``content_table``; the triggers keep it in sync with
+    every write.
+    """
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"comments, content='{content_table}', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {content_table} "
+        f"BEGIN INSERT INTO {fts_table}(rowid, comments) "
+        "VALUES (new.id, new.comments); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {content_table} "
+        f"BEGIN INSERT INTO {fts_table}({fts_table}, rowid, comments) "
+        "VALUES ('delete', old.id, old.comments); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON {content_table} "
+        f"BEGIN INSERT INTO {fts_table}({fts_table}, rowid, comments) "
+        "VALUES ('delete', old.id, old.comments); "
+        f"INSERT INTO {fts_table}(rowid, comments) VALUES (new.id, new.comments); END",
+    )
+
+
+# Full-text indexes over the review comments, one per reviews table.
+FTS_TABLE = "performance_reviews_fts"
+ARCHIVE_FTS_TABLE = "performance_reviews_archive_fts"
+
+FTS_DDL = fts_ddl("performance_reviews", FTS_TABLE)
+ARCHIVE_FTS_DDL = fts_ddl("performance_reviews_archive", ARCHIVE_FTS_TABLE)
+
+
+def _attach_fts(table: Table, fts_table: str, statements: tuple[str, ...]) -> None:
+    for statement in statements:
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="sqlite"),
+        )
+    event.listen(
+        table,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {fts_table}").execute_if(dialect="sqlite"),
+    )
+
+
+_attach_fts(PerformanceReview.__table__, FTS_TABLE, FTS_DDL)
+_attach_fts(PerformanceReviewArchive.__table__, ARCHIVE_FTS_TABLE, ARCHIVE_FTS_DDL)
@@ -0,0 +1,18 @@
+"""Module containing the ReferenceVersion model.
+
+The ReferenceVersion model counts the writes to each reference table, so
+the processes caching those tables can tell when their copy is stale.
+"""
+
+from sqlalchemy import Column, Integer, String
+
+from .base import Base
+
+
+class ReferenceVersion(Base):
+    """Version of a reference table, bumped in the transaction of every write to it."""
+
+    __tablename__ = "reference_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
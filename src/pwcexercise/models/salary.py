@@ -1,16 +1,62 @@
 """Defines the Salary model representing the salary details of an employee."""
 
-from sqlalchemy import Column, Date, Float, ForeignKey, Integer
+from datetime import date
+
+from sqlalchemy import Column, Date, Float, ForeignKey, Index, Integer
 
 from .base import Base
 
+OPEN_END = date(9999, 12, 31)
+
 
 class Salary(Base):
-    """Salary model representing the salary details of an employee."""
+    """Salary model representing the salary details of an employee.
+
+    A salary is valid from ``effective_date`` (inclusive) until
+    ``effective_to`` (exclusive), the effective date of the employee's next
+    salary. The current salary is open-ended and has ``OPEN_END`` instead of
+    NULL, so "valid on a day" is a plain range condition on the index.
+
+    IDs are ``AUTOINCREMENT`` so the IDs of archived salaries are never reused.
+    """
 
     __tablename__ = "salaries"
+    __table_args__ = (
+        Index("ix_salaries_validity", "effective_to", "effective_date", "employee_id"),
+        Index("ix_salaries_employee_effective_date", "employee_id", "effective_date"),
+        Index("ix_salaries_current_income", "effective_to", "monthly_income"),
+        Index("ix_salaries_employee_validity", "employee_id", "effective_to"),
+        {"sqlite_autoincrement": True},
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
     employee_id = Column(Integer, ForeignKey("employees.id"))
     monthly_income = Column(Float, nullable=False)
     hourly_rate = Column(Float)
     effective_date = Column(Date, nullable=False)
+    effective_to = Column(
+        Date, nullable=False, default=OPEN_END, server_default=OPEN_END.isoformat(),
+    )
+
+
+class SalaryArchive(Base):
+    """Salaries that ended before the archive horizon, moved out of ``salaries``.
+
+    Same columns and IDs as ``salaries``; see ``services.archive_service``.
+    """
+
+    __tablename__ = "salaries_archive"
+    __table_args__ = (
+        Index(
+            "ix_salaries_archive_validity",
+            "effective_to", "effective_date", "employee_id",
+        ),
+        Index("ix_salaries_archive_employee_validity", "employee_id", "effective_to"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    employee_id = Column(Integer, ForeignKey("employees.id"))
+    monthly_income = Column(Float, nullable=False)
+    hourly_rate = Column(Float)
+    effective_date = Column(Date, nullable=False)
+    effective_to = Column(Date, nullable=False)
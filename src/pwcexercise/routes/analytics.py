@@ -0,0 +1,111 @@
+"""Module containing routes for ad-hoc workforce analytics."""
+
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.config.db import get_db
+from src.pwcexercise.services import analytics_service, metrics_stream_service
+
+analytics_router = APIRouter()
+
+Metric = Literal["monthly_income", "hourly_rate", "age", "review_score"]
+GroupKey = Literal["department_id", "job_title_id"]
+
+
+@analytics_router.get("/aggregate", tags=["analytics"])
+def get_aggregate(
+            db: Annotated[Session, Depends(get_db)],
+            metric: Metric = "monthly_income",
+            agg: Literal[
+                "mean", "sum", "count", "min", "max", "median", "percentile",
+            ] = "mean",
+            group_by: GroupKey | None = None,
+            percentile: Annotated[float, Query(ge=0, le=100)] = 50.0,
+            department_id: int | None = None,
+            job_title_id: int | None = None,
+        ) -> dict:
+    """Aggregate a metric over the current workforce.
+
+    Salaries are the current salary of each employee and scores their latest
+    performance review.
+
+    Args:
+        metric (str): The column to aggregate.
+        agg (str): The aggregate function.
+        group_by (str): Optional column to group by.
+        percentile (float): Percentile to compute when ``agg`` is ``percentile``.
+        department_id (int): Only consider employees in this department.
+        job_title_id (int): Only consider employees with this job title.
+        db (Session): The database session.
+
+    Returns:
+        dict: The aggregate value and count for each group.
+
+    """
+    try:
+        results = analytics_service.aggregate(
+            db, metric, agg, group_by, percentile, department_id, job_title_id,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    return {"metric": metric, "agg": agg, "group_by": group_by, "results": results}
+
+
+@analytics_router.get("/histogram", tags=["analytics"])
+def get_histogram(
+            db: Annotated[Session, Depends(get_db)],
+            metric: Metric = "monthly_income",
+            bins: Annotated[int, Query(ge=1, le=1000)] = 10,
+            group_by: GroupKey | None = None,
+        ) -> dict:
+    """Return a histogram of a metric over the current workforce.
+
+    Args:
+        metric (str): The column to bin.
+        bins (int): Number of equal-width bins, shared by every group.
+        group_by (str): Optional column to group by.
+        db (Session): The database session.
+
+    Returns:
+        dict: The bin edges and counts for each group.
+
+    """
+    try:
+        results = analytics_service.histogram(db, metric, bins, group_by)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    return {"metric": metric, "group_by": group_by, "results": results}
+
+
+@analytics_router.get("/stream", tags=["analytics"])
+async def stream_metrics(
+            last_event_id: Annotated[str | None, Header()] = None,
+        ) -> StreamingResponse:
+    """Stream the live workforce metrics as Server-Sent Events.
+
+    A ``metrics`` event with the current and historic average salary and the
+    per-department headcount, average salary and average performance score
+    is sent on connect and whenever a write changes them. Slow clients only
+    receive the latest event.
+
+    Args:
+        last_event_id (str): ID of the last event received, sent by browsers
+            when they reconnect.
+
+    Returns:
+        StreamingResponse: The ``text/event-stream`` of metric events.
+
+    """
+    broadcaster = metrics_stream_service.broadcaster
+    try:
+        subscriber = broadcaster.subscribe()
+    except metrics_stream_service.TooManySubscribersError as error:
+        raise HTTPException(status_code=503, detail=str(error)) from error
+    return StreamingResponse(
+        broadcaster.stream(subscriber, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,80 @@
+"""Module containing the route running many requests in one round trip."""
+
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+from src.pwcexercise.schemas.batch import BatchRequestSchema, BatchResponseSchema
+from src.pwcexercise.services import batch_service
+from src.pwcexercise.services.batch_service import MAX_BATCH_BYTES
+
+
+def _too_large() -> HTTPException:
+    detail = f"Batch payload is larger than {MAX_BATCH_BYTES} bytes"
+    return HTTPException(status_code=413, detail=detail)
+
+
+async def _read_limited_body(request: Request) -> None:
+    """Read the body, refusing it as soon as it exceeds ``MAX_BATCH_BYTES``.
+
+    The declared ``Content-Length`` is checked before reading anything, and
+    a body sent without one is counted while it arrives. The body is kept on
+    the request, where FastAPI then parses it.
+    """
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > MAX_BATCH_BYTES:
+        raise _too_large()
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_BATCH_BYTES:
+            raise _too_large()
+    request._body = bytes(body)  # noqa: SLF001 - the cache Request.body() reads
+
+
+class SizeLimitedRoute(APIRoute):
+    """Route refusing oversized bodies before they are parsed and validated."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        """Wrap FastAPI's handler so the body is read with a size limit first."""
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request) -> Response:
+            await _read_limited_body(request)
+            return await handler(request)
+
+        return limited_handler
+
+
+batch_router = APIRouter(route_class=SizeLimitedRoute)
+
+
+@batch_router.post(
+    "/batch",
+    response_model=BatchResponseSchema,
+    tags=["batch"],
+)
+async def run_batch(batch: BatchRequestSchema, request: Request) -> dict:
+    """Run several API requests in one round trip.
+
+    Each sub-request names a method, a path with its query string and an
+    optional JSON body, and is answered exactly as the same request sent on
+    its own. Sub-requests run in order; with ``concurrency`` above 1,
+    consecutive ``GET`` requests run at the same time. A failing sub-request
+    does not stop the others.
+
+    Args:
+        batch (BatchRequestSchema): The sub-requests, up to 50, and the
+            concurrency of the reads.
+        request (Request): The batch request.
+
+    Returns:
+        dict: The status, headers and body of every sub-request, in order.
+
+    """
+    responses = await batch_service.run_batch(
+        request.app, request.scope, batch.requests, batch.concurrency,
+    )
+    return {"responses": responses}
@@ -0,0 +1,45 @@
+"""Module containing the route of the change data feed."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.config.db import get_db
+from src.pwcexercise.schemas.change import ChangeFeedSchema
+from src.pwcexercise.services import change_log_service
+from src.pwcexercise.services.change_log_service import (
+    CHANGES_PAGE_SIZE,
+    MAX_CHANGES_PAGE,
+)
+
+change_router = APIRouter()
+
+
+@change_router.get("/", response_model=ChangeFeedSchema, tags=["changes"])
+def get_changes(
+            db: Annotated[Session, Depends(get_db)],
+            since: Annotated[int, Query(ge=0)] = 0,
+            limit: Annotated[int, Query(ge=1, le=MAX_CHANGES_PAGE)] = CHANGES_PAGE_SIZE,
+        ) -> dict:
+    """Retrieve the rows created, updated or deleted after a sequence number.
+
+    Consumers keep the ``next_since`` of each page and ask again from it;
+    ``has_more`` tells whether another page is already waiting. Each change
+    names the table, the row ID and the operation; fetch the current row for
+    inserts and updates.
+
+    Args:
+        db (Session): The database session.
+        since (int): The last sequence number already processed, 0 to start.
+        limit (int): The most changes to return.
+
+    Returns:
+        dict: A page of changes in sequence order, or a 410 response if
+        changes after ``since`` have expired and the consumer must resync.
+
+    """
+    try:
+        return change_log_service.get_changes(db, since, limit)
+    except ValueError as error:
+        raise HTTPException(status_code=410, detail=str(error)) from error
@@ -2,13 +2,13 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from src.pwcexercise.config.db import get_db
 from src.pwcexercise.schemas.department import DepartmentCreateSchema, DepartmentSchema
 from src.pwcexercise.schemas.employee import EmployeeSchema
-from src.pwcexercise.services import department_service
+from src.pwcexercise.services import department_service, salary_statistics_service
 
 department_router = APIRouter()
 
@@ -167,3 +167,31 @@ def get_average_performance_score_by_id(
             status_code=404, detail="No performance reviews found in this department")
 
     return {"department_id": department_id, "average_performance_score": average_score}
+
+@department_router.get("/{department_id}/salary_percentiles", tags=["departments"])
+def get_salary_percentiles_by_id(
+    department_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    q: Annotated[list[float] | None, Query()] = None,
+) -> dict:
+    """Retrieve percentiles of the current salaries of the department.
+
+    By default p50 (the median), p90 and p99, computed exactly from every
+    current salary of the department.
+    """
+    department = department_service.get_department_by_id(department_id, db)
+    if department is None:
+        raise HTTPException(status_code=404, detail="Department not found")
+
+    try:
+        statistics = salary_statistics_service.get_salary_percentiles(
+            db, q, department_id=department_id)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+
+    if statistics is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No employees found in this department")
+
+    return {"department_id": department_id, **statistics}
@@ -1,28 +1,74 @@
 """Module containing routes for employee-related operations."""
 
+from datetime import date
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from src.pwcexercise.config.db import get_db
-from src.pwcexercise.schemas.employee import EmployeeCreateSchema, EmployeeSchema
+from src.pwcexercise.schemas.employee import (
+    EmployeeCreateSchema,
+    EmployeeListingSchema,
+    EmployeeListItemSchema,
+    EmployeeLookupResultSchema,
+    EmployeeLookupSchema,
+    EmployeeSchema,
+    EmployeeSummarySchema,
+)
 from src.pwcexercise.schemas.performance_review import PerformanceReviewSchema
 from src.pwcexercise.schemas.salary import SalarySchema
-from src.pwcexercise.services import employee_service, salary_service
+from src.pwcexercise.services import (
+    department_service,
+    employee_service,
+    job_title_service,
+    salary_service,
+)
+from src.pwcexercise.utils.encoding import negotiated_response
 
 employee = APIRouter()
 
 
-@employee.get("/", response_model=list[EmployeeSchema], tags=["employees"])
-def get_employees(db: Annotated[Session, Depends(get_db)]) -> list:
-    """Retrieve all employees from the database.
+def _check_references(employee: EmployeeCreateSchema, db: Session) -> None:
+    """Answer 404 if the department or job title of ``employee`` does not exist.
+
+    Both are checked against the reference data cache, without a query.
+    """
+    if department_service.get_department_by_id(employee.department_id, db) is None:
+        raise HTTPException(status_code=404, detail="Department not found")
+    if job_title_service.get_job_title_by_id(employee.job_title_id, db) is None:
+        raise HTTPException(status_code=404, detail="Job title not found")
+
+
+@employee.get("/",
+                response_model=list[EmployeeSchema] | list[EmployeeListItemSchema],
+                tags=["employees"])
+def get_employees(
+                request: Request,
+                db: Annotated[Session, Depends(get_db)],
+                listing: Annotated[EmployeeListingSchema, Query()],
+            ) -> Response:
+    """Retrieve the employees from the database.
+
+    The listing can be filtered by age, department, job title, hire date,
+    emp_id prefix and current salary, sorted by a whitelisted key and
+    paginated with ``limit``/``offset``. The body is encoded as JSON or
+    MessagePack depending on the ``Accept`` header and compressed when the
+    client accepts it.
+
+    ``view=compact`` returns only the employee columns, the current salary
+    and the latest review; with the full view ``history_limit`` keeps only
+    the newest N salaries and reviews of each employee.
 
     Returns:
-        list: A list of all employees.
+        Response: A list of the matching employees.
 
     """
-    return employee_service.get_all_employees(db)
+    if listing.view == "compact":
+        items = employee_service.get_employee_list_items(db, listing)
+        return negotiated_response(request, items, list[EmployeeListItemSchema])
+    employees = employee_service.get_all_employees(db, listing, listing.history_limit)
+    return negotiated_response(request, employees, list[EmployeeSchema])
 
 
 @employee.post("/", response_model=EmployeeSchema, tags=["employees"])
@@ -37,27 +83,90 @@ def create_employee(
         db (Session): The database session.
 
     Returns:
-        dict: The created employee data.
+        dict: The created employee data, a 404 response if the department or
+        job title does not exist, or a 409 response if the emp_id is taken.
 
     """
-    return employee_service.create_employee(employee, db)
+    _check_references(employee, db)
+    try:
+        return employee_service.create_employee(employee, db)
+    except ValueError as error:
+        raise HTTPException(status_code=409, detail=str(error)) from error
+
+
+@employee.get("/lookup",
+                response_model=EmployeeLookupResultSchema,
+                tags=["employees"])
+def lookup_employees(
+                request: Request,
+                db: Annotated[Session, Depends(get_db)],
+                lookup: Annotated[EmployeeLookupSchema, Query()],
+            ) -> Response:
+    """Retrieve several employees by ID or emp_id with one query.
+
+    Pass ``ids`` or ``emp_ids`` as repeated query parameters, e.g.
+    ``?emp_ids=RM001&emp_ids=RM002``. ``history_limit`` keeps only the
+    newest N salaries and reviews of each employee.
+
+    Returns:
+        Response: The employees found, in the order requested, and the keys
+        that matched no employee.
+
+    """
+    return _lookup_response(request, db, lookup)
+
+
+@employee.post("/lookup",
+                response_model=EmployeeLookupResultSchema,
+                tags=["employees"])
+def lookup_employees_by_body(
+                request: Request,
+                db: Annotated[Session, Depends(get_db)],
+                lookup: EmployeeLookupSchema,
+            ) -> Response:
+    """Retrieve several employees by ID or emp_id, with the keys in the body.
+
+    Same as ``GET /employees/lookup`` for key lists too long for a URL.
+
+    Returns:
+        Response: The employees found, in the order requested, and the keys
+        that matched no employee.
+
+    """
+    return _lookup_response(request, db, lookup)
+
+
+def _lookup_response(
+        request: Request, db: Session, lookup: EmployeeLookupSchema,
+    ) -> Response:
+    items, missing = employee_service.lookup_employees(
+        db, lookup.ids, lookup.emp_ids, lookup.history_limit,
+    )
+    return negotiated_response(
+        request, {"items": items, "missing": missing}, EmployeeLookupResultSchema,
+    )
 
 
 @employee.get("/{employee_id}",
                 response_model=EmployeeSchema,
                 tags=["employees"])
-def get_employee(employee_id: int, db: Annotated[Session, Depends(get_db)]) -> dict:
+def get_employee(
+                employee_id: int,
+                db: Annotated[Session, Depends(get_db)],
+                history_limit: Annotated[int | None, Query(ge=1)] = None,
+            ) -> dict:
     """Retrieve an employee from the database by ID.
 
     Args:
         employee_id (int): The ID of the employee to retrieve.
         db (Session): The database session.
+        history_limit (int): Only the newest N salaries and reviews.
 
     Returns:
         dict: The employee data or a 404 response if not found.
 
     """
-    employee = employee_service.get_employee_by_id(employee_id, db)
+    employee = employee_service.get_employee_detail(employee_id, db, history_limit)
     if employee is None:
         raise HTTPException(status_code=404, detail="Employee not found")
     return employee
@@ -99,10 +208,16 @@ def update_employee(
         db (Session): The database session.
 
     Returns:
-        dict: The updated employee data.
+        dict: The updated employee data, a 404 response if the employee,
+        department or job title does not exist, or a 409 response if the
+        emp_id is taken.
 
     """
-    updated_employee = employee_service.update_employee(employee_id, employee, db)
+    _check_references(employee, db)
+    try:
+        updated_employee = employee_service.update_employee(employee_id, employee, db)
+    except ValueError as error:
+        raise HTTPException(status_code=409, detail=str(error)) from error
     if updated_employee is None:
         return Response(status_code=status.HTTP_404_NOT_FOUND)
     return updated_employee
@@ -111,12 +226,16 @@ def update_employee(
                 tags=["employees"])
 def get_active_salary_of_employee(
                     employee_id: int,
-                    db: Annotated[Session, Depends(get_db)]) -> dict:
-    """Retrieve the active salary of the employee with the given ID."""
+                    db: Annotated[Session, Depends(get_db)],
+                    as_of: date | None = None) -> dict:
+    """Retrieve the active salary of the employee with the given ID.
+
+    With ``as_of`` the salary that was active on that day is returned.
+    """
     employee = employee_service.get_employee_by_id(employee_id, db)
     if employee is None:
         raise HTTPException(status_code=404, detail="Employee not found")
-    salary = employee_service.get_active_salary(employee_id, db)
+    salary = employee_service.get_active_salary(employee_id, db, as_of)
     if salary is None:
         raise HTTPException(
             status_code=404,
@@ -191,3 +310,29 @@ def get_employee_hours_worked(
             raise HTTPException(status_code=400, detail="Invalid data")
 
     return {"employee_id": employee_id, "hours_worked": hours_worked}
+
+
+@employee.get("/{employee_id}/summary",
+                response_model=EmployeeSummarySchema,
+                tags=["employees"])
+def get_employee_summary(
+                    employee_id: int,
+                    db: Annotated[Session, Depends(get_db)]) -> dict:
+    """Retrieve an employee with their salary, review, aguinaldo and hours worked.
+
+    One request and at most two SQL statements, besides the reference data
+    cache's own version check, instead of one route per figure. A figure whose own route would fail is null and its status code
+    and detail are listed in ``errors``.
+
+    Args:
+        employee_id (int): The ID of the employee.
+        db (Session): The database session.
+
+    Returns:
+        dict: The employee summary.
+
+    """
+    summary = employee_service.get_employee_summary(employee_id, db)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return summary
@@ -0,0 +1,53 @@
+"""Module containing routes for columnar snapshot exports."""
+
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from src.pwcexercise.config.db import engine
+from src.pwcexercise.exports import snapshot
+
+export_router = APIRouter()
+
+
+@export_router.post("/", tags=["exports"])
+def create_export(
+            file_format: Literal["parquet", "arrow"] = "parquet",
+            since: date | None = None,
+        ) -> dict:
+    """Write a consistent snapshot of every table as columnar files.
+
+    Args:
+        file_format (str): ``parquet`` or ``arrow``.
+        since (date): Only export salaries and reviews dated on or after this day.
+
+    Returns:
+        dict: The manifest of the written snapshot.
+
+    """
+    try:
+        manifest = snapshot.export_snapshot(engine, file_format=file_format, since=since)
+    except snapshot.SnapshotUnavailableError as error:
+        raise HTTPException(status_code=501, detail=str(error)) from error
+    return manifest.to_dict()
+
+
+@export_router.get("/{snapshot_id}", tags=["exports"])
+def get_export(snapshot_id: str) -> dict:
+    """Retrieve the manifest of a written snapshot."""
+    manifest = snapshot.read_manifest(snapshot_id)
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return manifest
+
+
+@export_router.get("/{snapshot_id}/files/{file_path:path}", tags=["exports"])
+def download_export_file(snapshot_id: str, file_path: str) -> FileResponse:
+    """Download one of the files listed in a snapshot manifest."""
+    path = snapshot.snapshot_file(snapshot_id, file_path)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Snapshot file not found")
+    return FileResponse(path, media_type="application/octet-stream",
+                        filename=path.name)
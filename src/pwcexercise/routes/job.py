@@ -0,0 +1,87 @@
+"""Module containing routes for background jobs."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.config.db import get_db
+from src.pwcexercise.schemas.job import JobCreateSchema, JobSchema
+from src.pwcexercise.services import job_service
+
+job_router = APIRouter()
+
+
+@job_router.post("/", response_model=JobSchema,
+                 status_code=status.HTTP_202_ACCEPTED, tags=["jobs"])
+def create_job(
+            job: JobCreateSchema,
+            response: Response,
+            db: Annotated[Session, Depends(get_db)],
+        ) -> dict:
+    """Queue a report to be computed in the background.
+
+    A submission identical to a job that is still queued or running returns
+    that job with status code 200 instead of starting a new one.
+
+    Args:
+        job (JobCreateSchema): The kind of report and its parameters.
+        response (Response): The response, to set the status code.
+        db (Session): The database session.
+
+    Returns:
+        dict: The status of the job; poll ``GET /jobs/{job_id}`` until it ends.
+
+    """
+    try:
+        db_job, created = job_service.submit_job(job, db)
+    except job_service.JobQueueFullError as error:
+        raise HTTPException(status_code=503, detail=str(error)) from error
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    response.headers["Location"] = f"/jobs/{db_job.id}"
+    return job_service.describe_job(db_job)
+
+
+@job_router.get("/{job_id}", response_model=JobSchema, tags=["jobs"])
+def get_job(job_id: int, db: Annotated[Session, Depends(get_db)]) -> dict:
+    """Retrieve the status, progress and timing of a job.
+
+    Args:
+        job_id (int): The ID of the job.
+        db (Session): The database session.
+
+    Returns:
+        dict: The status of the job.
+
+    """
+    db_job = job_service.get_job(job_id, db)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_service.describe_job(db_job)
+
+
+@job_router.get("/{job_id}/result", tags=["jobs"])
+def get_job_result(
+            job_id: int, db: Annotated[Session, Depends(get_db)],
+        ) -> FileResponse:
+    """Download the JSON result of a finished job.
+
+    Args:
+        job_id (int): The ID of the job.
+        db (Session): The database session.
+
+    Returns:
+        FileResponse: The result file.
+
+    """
+    db_job = job_service.get_job(job_id, db)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    path = job_service.job_result_file(db_job)
+    if path is None:
+        raise HTTPException(status_code=409, detail=f"Job is {db_job.status}")
+    return FileResponse(path, media_type="application/json")
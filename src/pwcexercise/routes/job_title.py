@@ -2,14 +2,14 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from starlette.status import HTTP_204_NO_CONTENT, HTTP_404_NOT_FOUND
 
 from src.pwcexercise.config.db import get_db
 from src.pwcexercise.schemas.employee import EmployeeSchema
 from src.pwcexercise.schemas.job_title import JobTitleCreateSchema, JobTitleSchema
-from src.pwcexercise.services import job_title_service
+from src.pwcexercise.services import job_title_service, salary_statistics_service
 
 job_title_router = APIRouter()
 
@@ -167,3 +167,29 @@ def get_average_performance_score_by_job_title(
 
     return {"job_title_id": job_title_id, "average_performance_score": average_score}
 
+@job_title_router.get("/{job_title_id}/salary_percentiles", tags=["job_titles"])
+def get_salary_percentiles_by_job_title(
+                    job_title_id: int,
+                    db: Annotated[Session, Depends(get_db)],
+                    q: Annotated[list[float] | None, Query()] = None) -> dict:
+    """Retrieve percentiles of the current salaries of the job title.
+
+    By default p50 (the median), p90 and p99, computed exactly from every
+    current salary of the job title.
+    """
+    job_title = job_title_service.get_job_title_by_id(job_title_id, db)
+    if job_title is None:
+        raise HTTPException(status_code=404, detail="Job title not found")
+
+    try:
+        statistics = salary_statistics_service.get_salary_percentiles(
+            db, q, job_title_id=job_title_id)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+
+    if statistics is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No employees found with this job title")
+
+    return {"job_title_id": job_title_id, **statistics}
@@ -1,18 +1,23 @@
 """Module for managing performance review routes."""
 
+from datetime import date
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from starlette.status import HTTP_204_NO_CONTENT, HTTP_404_NOT_FOUND
 
 from src.pwcexercise.config.db import get_db
+from src.pwcexercise.schemas.lookup import IdLookupSchema
 from src.pwcexercise.schemas.performance_review import (
     PerformanceReviewCreateSchema,
+    PerformanceReviewLookupResultSchema,
     PerformanceReviewSchema,
+    PerformanceReviewSearchPageSchema,
 )
 from src.pwcexercise.services import performance_review_service
 from src.pwcexercise.services.employee_service import get_employee_by_id
+from src.pwcexercise.utils.encoding import negotiated_response
 
 performance_review_router = APIRouter()
 
@@ -21,14 +26,115 @@ performance_review_router = APIRouter()
                             response_model=list[PerformanceReviewSchema],
                             tags=["performance_reviews"],
                         )
-def get_performance_reviews(db: Annotated[Session, Depends(get_db)]) -> list:
+def get_performance_reviews(
+                request: Request,
+                db: Annotated[Session, Depends(get_db)],
+            ) -> Response:
     """Retrieve all performance reviews from the database.
 
+    The body is encoded as JSON or MessagePack depending on the ``Accept``
+    header and compressed when the client accepts it.
+
     Returns:
-        list: A list of all performance reviews.
+        Response: A list of all performance reviews.
 
     """
-    return performance_review_service.get_all_performance_reviews(db)
+    performance_reviews = performance_review_service.get_all_performance_reviews(db)
+    return negotiated_response(
+        request, performance_reviews, list[PerformanceReviewSchema],
+    )
+
+@performance_review_router.get(
+                            "/search",
+                            response_model=PerformanceReviewSearchPageSchema,
+                            tags=["performance_reviews"],
+                        )
+def search_performance_reviews(
+            q: Annotated[str, Query(min_length=1)],
+            db: Annotated[Session, Depends(get_db)],
+            employee_id: int | None = None,
+            department_id: int | None = None,
+            date_from: date | None = None,
+            date_to: date | None = None,
+            limit: Annotated[int, Query(ge=1, le=200)] = 20,
+            offset: Annotated[int, Query(ge=0)] = 0,
+        ) -> dict:
+    """Search the comments of the performance reviews, best matches first.
+
+    Args:
+        q (str): Full-text query, e.g. ``leadership``, ``"team player"`` or ``commun*``.
+        employee_id (int): Only reviews of this employee.
+        department_id (int): Only reviews of employees in this department.
+        date_from (date): Only reviews on or after this day.
+        date_to (date): Only reviews on or before this day.
+        limit (int): Page size.
+        offset (int): Number of results to skip.
+        db (Session): The database session.
+
+    Returns:
+        dict: A page of matching reviews with highlighted snippets.
+
+    """
+    try:
+        items = performance_review_service.search_performance_reviews(
+            q, db, employee_id, department_id, date_from, date_to, limit, offset,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    return {
+        "items": items,
+        "limit": limit,
+        "offset": offset,
+        "next_offset": offset + limit if len(items) == limit else None,
+    }
+
+@performance_review_router.get(
+                            "/lookup",
+                            response_model=PerformanceReviewLookupResultSchema,
+                            tags=["performance_reviews"],
+                        )
+def lookup_performance_reviews(
+                request: Request,
+                db: Annotated[Session, Depends(get_db)],
+                lookup: Annotated[IdLookupSchema, Query()],
+            ) -> Response:
+    """Retrieve several performance reviews by ID with one query, e.g. ``?ids=3&ids=7``.
+
+    Returns:
+        Response: The reviews found, in the order requested, and the IDs
+        that matched no review.
+
+    """
+    return _lookup_response(request, db, lookup)
+
+@performance_review_router.post(
+                            "/lookup",
+                            response_model=PerformanceReviewLookupResultSchema,
+                            tags=["performance_reviews"],
+                        )
+def lookup_performance_reviews_by_body(
+                request: Request,
+                db: Annotated[Session, Depends(get_db)],
+                lookup: IdLookupSchema,
+            ) -> Response:
+    """Retrieve several performance reviews by ID, with the IDs in the body.
+
+    Returns:
+        Response: The reviews found, in the order requested, and the IDs
+        that matched no review.
+
+    """
+    return _lookup_response(request, db, lookup)
+
+def _lookup_response(request: Request, db: Session, lookup: IdLookupSchema) -> Response:
+    items, missing = performance_review_service.lookup_performance_reviews(
+        db, lookup.ids,
+    )
+    return negotiated_response(
+        request,
+        {"items": items, "missing": missing},
+        PerformanceReviewLookupResultSchema,
+    )
 
 @performance_review_router.post(
                             "/",
@@ -100,9 +206,12 @@ def update_performance_review(
     employee = get_employee_by_id(performance_review.employee_id, db)
     if employee is None:
         raise HTTPException(status_code=404, detail="Employee not found")
-    return performance_review_service.update_performance_review(
+    updated_performance_review = performance_review_service.update_performance_review(
                 performance_review_id, performance_review, db,
             )
+    if updated_performance_review is None:
+        return Response(status_code=HTTP_404_NOT_FOUND)
+    return updated_performance_review
 
 @performance_review_router.delete("/{performance_review_id}",
                 status_code=status.HTTP_204_NO_CONTENT,
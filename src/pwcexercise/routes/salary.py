@@ -1,29 +1,52 @@
 """Module providing API routes for managing salaries."""
 
+from datetime import date
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from starlette.status import HTTP_204_NO_CONTENT, HTTP_404_NOT_FOUND
 
 from src.pwcexercise.config.db import get_db
-from src.pwcexercise.schemas.salary import SalaryCreateSchema, SalarySchema
-from src.pwcexercise.services import salary_service
+from src.pwcexercise.schemas.lookup import IdLookupSchema
+from src.pwcexercise.schemas.salary import (
+    SalaryAsOfQuerySchema,
+    SalaryCreateSchema,
+    SalaryLookupResultSchema,
+    SalarySchema,
+)
+from src.pwcexercise.services import (
+    payroll_service,
+    salary_service,
+    salary_statistics_service,
+)
 from src.pwcexercise.services.employee_service import get_employee_by_id
+from src.pwcexercise.utils.encoding import negotiated_response
 from src.pwcexercise.utils.logger import logger
 
 salary_router = APIRouter()
 
 
 @salary_router.get("/", response_model=list[SalarySchema], tags=["salaries"])
-def get_salaries(db: Annotated[Session, Depends(get_db)]) -> list:
+def get_salaries(
+                request: Request,
+                db: Annotated[Session, Depends(get_db)],
+                as_of: date | None = None,
+            ) -> Response:
     """Retrieve all salaries from the database.
 
+    The body is encoded as JSON or MessagePack depending on the ``Accept``
+    header and compressed when the client accepts it.
+
+    Args:
+        as_of (date): Only return the salaries in effect on this day.
+
     Returns:
-        list: A list of all salaries.
+        Response: A list of all salaries.
 
     """
-    return salary_service.get_all_salaries(db)
+    salaries = salary_service.get_all_salaries(db, as_of)
+    return negotiated_response(request, salaries, list[SalarySchema])
 
 @salary_router.get("/historic_average", tags=["salaries"])
 def get_historic_average_salary(db: Annotated[Session, Depends(get_db)]) -> dict:
@@ -32,11 +55,109 @@ def get_historic_average_salary(db: Annotated[Session, Depends(get_db)]) -> dict
     return {"historic_average": historic_average}
 
 @salary_router.get("/current_average", tags=["salaries"])
-def get_current_average_salary(db: Annotated[Session, Depends(get_db)]) -> dict:
-    """Calculate and return the current average salary from the database."""
-    current_average = salary_service.get_current_average_salary(db)
+def get_current_average_salary(
+                db: Annotated[Session, Depends(get_db)],
+                as_of: date | None = None,
+            ) -> dict:
+    """Calculate and return the current average salary from the database.
+
+    With ``as_of`` the average of the salaries in effect on that day is returned.
+    """
+    current_average = salary_service.get_current_average_salary(db, as_of)
     return {"current_average": current_average}
 
+@salary_router.get("/payroll_timeseries", tags=["salaries"])
+def get_payroll_timeseries(
+                db: Annotated[Session, Depends(get_db)],
+                years: Annotated[int, Query(ge=1, le=payroll_service.MAX_YEARS)] = 5,
+                department_id: int | None = None,
+            ) -> dict:
+    """Return the monthly payroll total and headcount of each department.
+
+    Each point is measured on the last day of the month (today for the
+    current month), using the salaries in effect on that day and the
+    employees hired by then.
+    """
+    series = payroll_service.get_payroll_timeseries(db, years, department_id)
+    return {"years": years, "series": series}
+
+@salary_router.post("/as_of", response_model=list[SalarySchema], tags=["salaries"])
+def get_salaries_as_of(
+                query: SalaryAsOfQuerySchema,
+                db: Annotated[Session, Depends(get_db)],
+            ) -> list:
+    """Retrieve the salary each employee had on a given day.
+
+    Args:
+        query (SalaryAsOfQuerySchema): The day and the employees or department.
+        db (Session): The database session.
+
+    Returns:
+        list: One salary per employee that had a salary on that day.
+
+    """
+    return salary_service.get_salaries_as_of(
+        query.as_of, db, query.employee_ids, query.department_id,
+    )
+
+@salary_router.get(
+                "/lookup", response_model=SalaryLookupResultSchema, tags=["salaries"],
+            )
+def lookup_salaries(
+                request: Request,
+                db: Annotated[Session, Depends(get_db)],
+                lookup: Annotated[IdLookupSchema, Query()],
+            ) -> Response:
+    """Retrieve several salaries by ID with one query, e.g. ``?ids=3&ids=7``.
+
+    Returns:
+        Response: The salaries found, in the order requested, and the IDs
+        that matched no salary.
+
+    """
+    return _lookup_response(request, db, lookup)
+
+@salary_router.post(
+                "/lookup", response_model=SalaryLookupResultSchema, tags=["salaries"],
+            )
+def lookup_salaries_by_body(
+                request: Request,
+                db: Annotated[Session, Depends(get_db)],
+                lookup: IdLookupSchema,
+            ) -> Response:
+    """Retrieve several salaries by ID, with the IDs in the body.
+
+    Returns:
+        Response: The salaries found, in the order requested, and the IDs
+        that matched no salary.
+
+    """
+    return _lookup_response(request, db, lookup)
+
+def _lookup_response(request: Request, db: Session, lookup: IdLookupSchema) -> Response:
+    items, missing = salary_service.lookup_salaries(db, lookup.ids)
+    return negotiated_response(
+        request, {"items": items, "missing": missing}, SalaryLookupResultSchema,
+    )
+
+@salary_router.get("/percentiles", tags=["salaries"])
+def get_salary_percentiles(
+                db: Annotated[Session, Depends(get_db)],
+                q: Annotated[list[float] | None, Query()] = None,
+            ) -> dict:
+    """Return percentiles of the current salaries of the whole company.
+
+    By default p50 (the median), p90 and p99, computed exactly from every
+    current salary.
+    """
+    try:
+        statistics = salary_statistics_service.get_salary_percentiles(db, q)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    if statistics is None:
+        raise HTTPException(status_code=404, detail="No salaries found")
+    return statistics
+
 
 @salary_router.post("/", response_model=SalarySchema, tags=["salaries"])
 def create_salary(
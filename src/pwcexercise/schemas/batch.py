@@ -0,0 +1,35 @@
+"""Module for batch request schemas."""
+
+from __future__ import annotations
+
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+from src.pwcexercise.services.batch_service import MAX_CONCURRENCY, MAX_SUB_REQUESTS
+
+
+class SubRequestSchema(BaseModel):
+    """Schema for one request of a batch."""
+
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+    path: str = Field(pattern=r"^/", max_length=2048)
+    body: Any = None
+
+class BatchRequestSchema(BaseModel):
+    """Schema for a batch of requests, run in order."""
+
+    requests: list[SubRequestSchema] = Field(min_length=1, max_length=MAX_SUB_REQUESTS)
+    concurrency: int = Field(1, ge=1, le=MAX_CONCURRENCY)
+
+class SubResponseSchema(BaseModel):
+    """Schema for the response to one request of a batch."""
+
+    status: int
+    headers: dict[str, str]
+    body: Any = None
+
+class BatchResponseSchema(BaseModel):
+    """Schema for the responses of a batch, in the order of its requests."""
+
+    responses: list[SubResponseSchema]
@@ -0,0 +1,36 @@
+"""Module containing the schemas of the change data feed."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class ChangeSchema(BaseModel):
+    """Schema for one logged change of a row."""
+
+    seq: int
+    table_name: str
+    row_id: int
+    operation: Literal["insert", "update", "delete"]
+    changed_at: datetime
+
+    class Config:
+        """Configuration for the ChangeSchema."""
+
+        from_attributes = True
+
+class ChangeFeedSchema(BaseModel):
+    """Schema for a page of the change feed.
+
+    ``next_since`` is the ``since`` of the next page; ``latest_seq`` is the
+    newest change logged, where a consumer that just copied the tables
+    starts following the feed.
+    """
+
+    changes: list[ChangeSchema]
+    next_since: int
+    has_more: bool
+    latest_seq: int
@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 from .department import DepartmentSchema
 from .job_title import JobTitleSchema
+from .lookup import MAX_LOOKUP_KEYS
 from .performance_review import PerformanceReviewSchema
 from .salary import SalarySchema
 
@@ -25,6 +27,45 @@ class EmployeeCreateSchema(BaseModel):
 
         from_attributes = True
 
+EMPLOYEE_SORT_KEYS = ("id", "emp_id", "age", "hire_date", "salary")
+
+EmployeeSortKey = Literal[
+    "id", "-id", "emp_id", "-emp_id", "age", "-age",
+    "hire_date", "-hire_date", "salary", "-salary",
+]
+
+class EmployeeFilterSchema(BaseModel):
+    """Schema for the filters, sorting and pagination of employee listings.
+
+    Ranges are inclusive. ``salary_min``/``salary_max`` apply to the current
+    monthly income. A ``-`` before the sort key sorts descending.
+    """
+
+    age_min: int | None = Field(None, ge=0)
+    age_max: int | None = Field(None, ge=0)
+    department_id: int | None = None
+    job_title_id: int | None = None
+    hired_from: date | None = None
+    hired_to: date | None = None
+    emp_id_prefix: str | None = Field(None, min_length=1)
+    salary_min: float | None = None
+    salary_max: float | None = None
+    sort: EmployeeSortKey = "id"
+    limit: int | None = Field(None, ge=1, le=10000)
+    offset: int = Field(0, ge=0)
+
+EmployeeView = Literal["full", "compact"]
+
+class EmployeeListingSchema(EmployeeFilterSchema):
+    """Schema for the query of the employee listing: filters plus the shape.
+
+    The ``full`` view nests every salary and review, or only the newest
+    ``history_limit`` of each; ``compact`` returns ``EmployeeListItemSchema``.
+    """
+
+    view: EmployeeView = "full"
+    history_limit: int | None = Field(None, ge=1)
+
 class EmployeeSchema(BaseModel):
     """Schema for employee data."""
 
@@ -45,3 +86,67 @@ class EmployeeSchema(BaseModel):
 
         from_attributes = True
 
+class EmployeeListItemSchema(BaseModel):
+    """Schema for an employee in compact listings.
+
+    Only the employee's own columns, their current salary and their latest
+    performance review, so its size does not grow with their history.
+    """
+
+    id: int
+    emp_id: str
+    age: int
+    department_id: int
+    hire_date: date
+    job_title_id: int | None = None
+    current_salary: SalarySchema | None = None
+    latest_performance_review: PerformanceReviewSchema | None = None
+
+
+class SummaryErrorSchema(BaseModel):
+    """Error of one part of an employee summary, as its own route reports it."""
+
+    status_code: int
+    detail: str
+
+class EmployeeSummarySchema(BaseModel):
+    """Schema for an employee with the figures of their detail page.
+
+    A part that its own route would answer with an error is null here and
+    the error is listed in ``errors`` under the name of the part.
+    """
+
+    id: int
+    emp_id: str
+    age: int
+    department_id: int
+    hire_date: date
+    job_title_id: int | None = None
+    department: DepartmentSchema | None = None
+    job_title: JobTitleSchema | None = None
+    active_salary: SalarySchema | None = None
+    latest_performance_review: PerformanceReviewSchema | None = None
+    aguinaldo: float | None = None
+    hours_worked: float | None = None
+    errors: dict[str, SummaryErrorSchema] = {}
+
+class EmployeeLookupSchema(BaseModel):
+    """Schema for a lookup of employees by internal IDs or by ``emp_id``."""
+
+    ids: list[int] | None = Field(None, min_length=1, max_length=MAX_LOOKUP_KEYS)
+    emp_ids: list[str] | None = Field(None, min_length=1, max_length=MAX_LOOKUP_KEYS)
+    history_limit: int | None = Field(None, ge=1)
+
+    @model_validator(mode="after")
+    def check_one_key_list(self) -> EmployeeLookupSchema:
+        """Require exactly one of ``ids`` and ``emp_ids``."""
+        if (self.ids is None) == (self.emp_ids is None):
+            msg = "Provide either ids or emp_ids"
+            raise ValueError(msg)
+        return self
+
+class EmployeeLookupResultSchema(BaseModel):
+    """Schema for the employees found by a lookup, in the order requested."""
+
+    items: list[EmployeeSchema]
+    missing: list[int | str] = []
@@ -0,0 +1,96 @@
+"""Module for background job schemas."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+from src.pwcexercise.services.archive_service import (
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_HORIZON_DAYS,
+    MIN_HORIZON_DAYS,
+)
+from src.pwcexercise.services.change_log_service import (
+    CHANGE_RETENTION_DAYS,
+    COMPACTION_BATCH_SIZE,
+)
+
+Metric = Literal["monthly_income", "hourly_rate", "age", "review_score"]
+GroupKey = Literal["department_id", "job_title_id"]
+JobKind = Literal[
+    "aggregate", "histogram", "payroll_timeseries", "export", "archive",
+    "compact_changes",
+]
+
+
+class AggregateJobParams(BaseModel):
+    """Parameters of an ``aggregate`` job, as in ``GET /analytics/aggregate``."""
+
+    metric: Metric = "monthly_income"
+    agg: Literal["mean", "sum", "count", "min", "max", "median", "percentile"] = "mean"
+    group_by: GroupKey | None = None
+    percentile: float = Field(50.0, ge=0, le=100)
+    department_id: int | None = None
+    job_title_id: int | None = None
+
+class HistogramJobParams(BaseModel):
+    """Parameters of a ``histogram`` job, as in ``GET /analytics/histogram``."""
+
+    metric: Metric = "monthly_income"
+    bins: int = Field(10, ge=1, le=1000)
+    group_by: GroupKey | None = None
+
+class PayrollJobParams(BaseModel):
+    """Parameters of a ``payroll_timeseries`` job."""
+
+    years: int = Field(5, ge=1, le=50)
+    department_id: int | None = None
+
+class ExportJobParams(BaseModel):
+    """Parameters of an ``export`` job, as in ``POST /exports/``."""
+
+    file_format: Literal["parquet", "arrow"] = "parquet"
+    since: date | None = None
+
+class ArchiveJobParams(BaseModel):
+    """Parameters of an ``archive`` job, moving old history to the archive tables."""
+
+    horizon_days: int = Field(ARCHIVE_HORIZON_DAYS, ge=MIN_HORIZON_DAYS)
+    batch_size: int = Field(ARCHIVE_BATCH_SIZE, ge=1, le=50_000)
+
+class CompactChangesJobParams(BaseModel):
+    """Parameters of a ``compact_changes`` job, applying the change log retention.
+
+    Changes older than ``retention_days``, 30 by default, expire. The job the
+    application schedules itself uses the defaults.
+    """
+
+    retention_days: int = Field(CHANGE_RETENTION_DAYS, ge=1)
+    batch_size: int = Field(COMPACTION_BATCH_SIZE, ge=1, le=50_000)
+
+class JobCreateSchema(BaseModel):
+    """Schema for a job submission."""
+
+    kind: JobKind
+    params: dict[str, Any] = Field(default_factory=dict)
+
+class JobSchema(BaseModel):
+    """Schema for the status of a job."""
+
+    id: int
+    kind: str
+    params: dict[str, Any]
+    status: str
+    progress: float
+    error: str | None = None
+    result_url: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    class Config:
+        """Configuration for the JobSchema."""
+
+        from_attributes = True
@@ -0,0 +1,13 @@
+"""Module for multi-get lookup schemas."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+MAX_LOOKUP_KEYS = 500
+
+
+class IdLookupSchema(BaseModel):
+    """Schema for a lookup of rows by a list of IDs."""
+
+    ids: list[int] = Field(min_length=1, max_length=MAX_LOOKUP_KEYS)
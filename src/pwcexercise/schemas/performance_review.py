@@ -20,6 +20,25 @@ class PerformanceReviewCreateSchema(BaseModel):
 
         from_attributes = True
 
+class PerformanceReviewSearchResultSchema(BaseModel):
+    """Schema for a performance review matched by a full-text search."""
+
+    id: int
+    employee_id: int
+    review_date: date
+    score: int
+    comments: str | None = None
+    snippet: str | None = None
+    rank: float
+
+class PerformanceReviewSearchPageSchema(BaseModel):
+    """Schema for a page of full-text search results."""
+
+    items: list[PerformanceReviewSearchResultSchema]
+    limit: int
+    offset: int
+    next_offset: int | None = None
+
 class PerformanceReviewSchema(BaseModel):
     """Schema for performance review data."""
 
@@ -33,3 +52,9 @@ class PerformanceReviewSchema(BaseModel):
         """Configuration for the PerformanceReviewSchema."""
 
         from_attributes = True
+
+class PerformanceReviewLookupResultSchema(BaseModel):
+    """Schema for the performance reviews found by a lookup, in the order requested."""
+
+    items: list[PerformanceReviewSchema]
+    missing: list[int] = []
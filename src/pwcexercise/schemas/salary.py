@@ -1,5 +1,7 @@
 """Defines the SalarySchema for salary data."""
 
+from __future__ import annotations
+
 from datetime import date
 
 from pydantic import BaseModel
@@ -18,6 +20,16 @@ class SalaryCreateSchema(BaseModel):
 
         from_attributes = True
 
+class SalaryAsOfQuerySchema(BaseModel):
+    """Schema for a bulk as-of salary query.
+
+    Without ``employee_ids`` nor ``department_id`` every employee is returned.
+    """
+
+    as_of: date
+    employee_ids: list[int] | None = None
+    department_id: int | None = None
+
 class SalarySchema(BaseModel):
     """Schema for salary data."""
 
@@ -31,3 +43,9 @@ class SalarySchema(BaseModel):
         """Configuration for SalarySchema."""
 
         from_attributes = True
+
+class SalaryLookupResultSchema(BaseModel):
+    """Schema for the salaries found by a lookup, in the order requested."""
+
+    items: list[SalarySchema]
+    missing: list[int] = []
@@ -11,6 +11,8 @@ from sqlalchemy.orm import Session
 
 from src.pwcexercise.config.db import SessionLocal, engine
 from src.pwcexercise.models.base import Base
+# create_all only creates the tables of imported models; the seeds do not use jobs.
+from src.pwcexercise.models.job import Job  # noqa: F401
 from src.pwcexercise.seeds.seeds import seed_database
 from src.pwcexercise.utils.logger import logger
 
@@ -11,6 +11,8 @@ from src.pwcexercise.models.employee import Employee
 from src.pwcexercise.models.job_title import JobTitle
 from src.pwcexercise.models.performance_review import PerformanceReview
 from src.pwcexercise.models.salary import Salary
+from src.pwcexercise.services.reference_data_service import bump_version
+from src.pwcexercise.services.salary_service import refresh_validity_intervals
 from src.pwcexercise.utils.logger import logger
 
 
@@ -19,6 +21,7 @@ def seed_departments(session: Session, df: pd.DataFrame) -> None:
     departments = set(df["Department"].dropna().unique())
     for name in departments:
         session.add(Department(name=name))
+    bump_version(session, Department.__table__)
     session.commit()
 
 def seed_job_titles(session: Session, df: pd.DataFrame) -> None:
@@ -26,6 +29,7 @@ def seed_job_titles(session: Session, df: pd.DataFrame) -> None:
     job_titles = set(df["JobRole"].dropna().unique())
     for name in job_titles:
         session.add(JobTitle(name=name))
+    bump_version(session, JobTitle.__table__)
     session.commit()
 
 def seed_employees(session: Session, df: pd.DataFrame) -> None:
@@ -59,6 +63,8 @@ def seed_salaries(session: Session, df: pd.DataFrame) -> None:
                 hourly_rate=row["HourlyRate"],
             )
             session.add(salary)
+    session.flush()
+    refresh_validity_intervals(session)
     session.commit()
 
 def seed_performance_reviews(session: Session, df: pd.DataFrame) -> None:
@@ -78,6 +84,8 @@ def seed_performance_reviews(session: Session, df: pd.DataFrame) -> None:
 
 def seed_database(session: Session, df: pd.DataFrame) -> None:
     """Seed the entire database with initial data."""
+    # emp_id is unique; the dataset repeats a few rows.
+    df = df.drop_duplicates(subset="EmpID")
     seed_departments(session, df)
     logger.info("Departments seeded successfully")
     seed_job_titles(session, df)
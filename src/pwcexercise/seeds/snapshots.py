@@ -0,0 +1,255 @@
+"""Snapshots of the seeded database, restored in milliseconds.
+
+Seeding inserts the dataset row by row, a cost every container start, test
+run and benchmark used to pay. ``build_snapshot`` creates and seeds a
+database once and keeps a copy under ``SNAPSHOT_DIR``, named after the
+Alembic revision of its schema and a digest of the seed inputs (the dataset
+and the seeding code), so a new migration or a new dataset never restores a
+stale snapshot.
+
+Copies are made with the SQLite online backup API, which copies the pages
+of a database consistently while other connections keep using it.
+``restore_snapshot`` copies a snapshot over the application database and
+``clone_to_memory`` loads it into a private in-memory database for a test or
+a benchmark. ``isolated_session`` runs a test inside a transaction that is
+rolled back when it ends.
+
+Seeded dates are relative to the day of seeding and a snapshot keeps them;
+build a new one when that matters.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+import pandas as pd
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.pwcexercise.config.db import DATABASE_URL, use_explicit_transactions
+from src.pwcexercise.config.write_queue import WRITE_QUEUE_KEY, WriteQueue
+from src.pwcexercise.models.base import Base
+from src.pwcexercise.seeds import seeds
+from src.pwcexercise.seeds.seeder import BASE_DIR, csv_path
+from src.pwcexercise.services import (
+    analytics_service,
+    payroll_service,
+    reference_data_service,
+)
+from src.pwcexercise.utils.logger import logger
+
+SNAPSHOT_DIR = Path(os.environ.get("DB_SNAPSHOT_DIR", ".db_snapshots"))
+
+
+def _alembic_config(url: str | None = None) -> Config:
+    # Without the ini file: its logging setup would silence the app's logger.
+    config = Config()
+    config.set_main_option("script_location", str(BASE_DIR / "alembic"))
+    if url is not None:
+        config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def head_revision() -> str:
+    """Return the Alembic revision of the current schema."""
+    return ScriptDirectory.from_config(_alembic_config()).get_current_head()
+
+
+def _read_only(path: Path) -> sqlite3.Connection:
+    if not path.exists():
+        msg = f"{path} does not exist"
+        raise ValueError(msg)
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def database_revision(path: Path) -> str | None:
+    """Return the Alembic revision a database is stamped with, or None."""
+    with closing(_read_only(path)) as connection:
+        try:
+            row = connection.execute(
+                "SELECT version_num FROM alembic_version",
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+    return None if row is None else row[0]
+
+
+def seed_key(revision: str) -> str:
+    """Return the snapshot name of ``revision`` seeded with the current inputs."""
+    digest = hashlib.sha256()
+    for path in (csv_path, Path(seeds.__file__)):
+        digest.update(path.read_bytes())
+    return f"{revision}-{digest.hexdigest()[:12]}"
+
+
+def snapshot_path(key: str, directory: Path = SNAPSHOT_DIR) -> Path:
+    """Return the file of the snapshot named ``key``."""
+    return directory / f"{key}.db"
+
+
+def _database_path(database: Path | None) -> Path:
+    return Path(make_url(DATABASE_URL).database) if database is None else database
+
+
+def reset_caches() -> None:
+    """Drop the in-process caches of the data after the database was replaced."""
+    reference_data_service.departments.reset()
+    reference_data_service.job_titles.reset()
+    analytics_service.workforce.reset()
+    payroll_service.closed_months.invalidate_from(None)
+
+
+def save_snapshot(database: Path | None = None, directory: Path = SNAPSHOT_DIR) -> Path:
+    """Copy a migrated and seeded database into the snapshot directory.
+
+    :param database: Database to copy, the application's by default
+    :param directory: Directory of the snapshots
+    :return: The snapshot file, replaced if it existed
+    :raises ValueError: If the database is not stamped with an Alembic revision
+    """
+    database = _database_path(database)
+    revision = database_revision(database)
+    if revision is None:
+        msg = f"{database} has no Alembic revision; run alembic stamp head first"
+        raise ValueError(msg)
+    path = snapshot_path(seed_key(revision), directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".partial")
+    with closing(_read_only(database)) as source, \
+            closing(sqlite3.connect(partial)) as target:
+        source.backup(target)
+    # Renaming is atomic: a concurrent restore never reads half a snapshot.
+    partial.replace(path)
+    logger.info("Saved snapshot %s", path)
+    return path
+
+
+def build_snapshot(directory: Path = SNAPSHOT_DIR) -> Path:
+    """Create and seed a database at the head revision and save its snapshot.
+
+    :param directory: Directory of the snapshots
+    :return: The snapshot file
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=directory) as scratch:
+        database = Path(scratch) / "seed.db"
+        engine = create_engine(f"sqlite:///{database}")
+        try:
+            # The migrations start from the schema created by the models.
+            Base.metadata.create_all(engine)
+            command.stamp(_alembic_config(f"sqlite:///{database}"), "head")
+            with sessionmaker(bind=engine, autoflush=False)() as session:
+                seeds.seed_database(session, pd.read_csv(csv_path))
+        finally:
+            engine.dispose()
+        return save_snapshot(database, directory)
+
+
+def restore_snapshot(path: Path, database: Path | None = None) -> None:
+    """Replace the content of a database with a snapshot.
+
+    Connections already open on the database see the restored data; the
+    caches of this process are reset. Other processes serving the database
+    should be restarted.
+
+    :param path: Snapshot file
+    :param database: Database to overwrite, the application's by default
+    """
+    database = _database_path(database)
+    with closing(_read_only(path)) as source, \
+            closing(sqlite3.connect(database)) as target:
+        source.backup(target)
+    reset_caches()
+    logger.info("Restored snapshot %s into %s", path.name, database)
+
+
+def current_snapshot(directory: Path = SNAPSHOT_DIR) -> Path:
+    """Return the snapshot of the head revision, building it first if missing.
+
+    :param directory: Directory of the snapshots
+    :return: The snapshot file
+    """
+    path = snapshot_path(seed_key(head_revision()), directory)
+    if not path.exists():
+        logger.info("No snapshot %s yet, seeding a new database", path.name)
+        path = build_snapshot(directory)
+    return path
+
+
+def prepare_database(
+        database: Path | None = None, directory: Path = SNAPSHOT_DIR,
+    ) -> Path:
+    """Restore the snapshot of the head revision, building it first if missing.
+
+    :param database: Database to overwrite, the application's by default
+    :param directory: Directory of the snapshots
+    :return: The snapshot restored
+    """
+    path = current_snapshot(directory)
+    restore_snapshot(path, database)
+    return path
+
+
+def clone_to_memory(path: Path) -> Engine:
+    """Load a snapshot into a private in-memory database.
+
+    The engine begins its transactions like the application's, so savepoints
+    behave as in production.
+
+    :param path: Snapshot file, for example ``current_snapshot()``
+    :return: Engine on the copy, with one connection shared by every thread
+    """
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    use_explicit_transactions(engine)
+    with engine.connect() as connection, closing(_read_only(path)) as source:
+        source.backup(connection.connection.driver_connection)
+    return engine
+
+
+@contextmanager
+def isolated_session(engine: Engine) -> Iterator[Session]:
+    """Run a test in a transaction that is rolled back when it ends.
+
+    The session and a write queue of its own share one connection and one
+    outer transaction: their commits only release savepoints, and everything
+    is rolled back at the end. The queue is named in the sessions' ``info``,
+    so the services write through it instead of the application's
+    ``write_queue``. Use an engine from ``clone_to_memory``, and lend the
+    session to the routes by overriding ``get_db``, as the ``db`` fixture of
+    ``tests/conftest.py`` does.
+
+    :param engine: Engine of the test database
+    :return: The session of the test
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    factory = sessionmaker(
+        bind=connection, autoflush=False, join_transaction_mode="create_savepoint",
+    )
+    writes = WriteQueue(factory)
+    factory.configure(info={WRITE_QUEUE_KEY: writes})
+    reset_caches()
+    session = factory()
+    try:
+        yield session
+    finally:
+        writes.close()
+        session.close()
+        transaction.rollback()
+        connection.close()
+        reset_caches()
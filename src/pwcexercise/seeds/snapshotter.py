@@ -0,0 +1,38 @@
+"""Command line entry point to restore, save and build database snapshots."""
+
+import argparse
+import time
+from pathlib import Path
+
+from src.pwcexercise.seeds.snapshots import (
+    SNAPSHOT_DIR,
+    build_snapshot,
+    prepare_database,
+    save_snapshot,
+)
+from src.pwcexercise.utils.logger import logger
+
+
+def main() -> None:
+    """Restore the seeded database from its snapshot, or save or build one."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "action", choices=("restore", "save", "build"), nargs="?", default="restore",
+        help="restore (building the snapshot if missing), save the database "
+             "as a snapshot, or build a new snapshot",
+    )
+    parser.add_argument("--database", type=Path, default=None)
+    parser.add_argument("--directory", type=Path, default=SNAPSHOT_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.action == "restore":
+        path = prepare_database(args.database, args.directory)
+    elif args.action == "save":
+        path = save_snapshot(args.database, args.directory)
+    else:
+        path = build_snapshot(args.directory)
+    logger.info("%s %s in %.3f s", args.action, path, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Production launcher that serves the API from a pool of worker processes.
+
+The application is imported once in the master process and the listening
+socket is bound there; workers are forked from the master, so they start
+with the application already loaded and share the socket. Each worker is a
+plain uvicorn server that exits after handling ``--max-requests`` requests
+(plus a random jitter, so workers do not all recycle at once) and the master
+forks a replacement, which bounds the memory a long lived worker can grow.
+
+Signals sent to the master:
+
+- ``SIGTERM``/``SIGINT``: stop accepting connections, let in-flight requests
+  finish for up to ``--graceful-timeout`` seconds and exit.
+- ``SIGHUP``: graceful rolling restart, every worker is replaced one by one.
+  The replacements are forked from the master, so code changes need a full
+  restart of the launcher.
+- ``SIGTTIN``/``SIGTTOU``: add or remove one worker.
+
+Migrations and seeding are not part of serving; run ``alembic upgrade head``
+and ``seed-db`` separately when needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import signal
+import socket
+import time
+
+import uvicorn
+from uvicorn.importer import import_from_string
+
+from src.pwcexercise.utils.logger import logger
+
+DEFAULT_APP = "app:app"
+MAX_REQUESTS = 10_000
+MAX_REQUESTS_JITTER = 1_000
+GRACEFUL_TIMEOUT = 30
+POLL_INTERVAL = 0.5
+
+
+def default_workers() -> int:
+    """Return the worker count from ``WEB_CONCURRENCY`` or the CPU count."""
+    configured = os.environ.get("WEB_CONCURRENCY")
+    if configured:
+        return max(1, int(configured))
+    return os.cpu_count() or 1
+
+
+class WorkerPool:
+    """Fork, supervise and recycle the worker processes of one socket."""
+
+    def __init__(
+            self,
+            config: uvicorn.Config,
+            sock: socket.socket,
+            workers: int,
+            max_requests: int | None,
+            max_requests_jitter: int,
+            graceful_timeout: int,
+        ) -> None:
+        """Create a pool; no worker is started until :meth:`run` is called.
+
+        :param config: Uvicorn configuration shared by every worker
+        :param sock: Bound listening socket inherited by the workers
+        :param workers: Number of worker processes to keep running
+        :param max_requests: Requests served before a worker is recycled
+        :param max_requests_jitter: Upper bound of the random extra requests
+        :param graceful_timeout: Seconds given to workers to finish on stop
+        """
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self._pids: set[int] = set()
+        self._retiring: set[int] = set()
+        self._stopping = False
+        self._restart_requested = False
+
+    def _spawn(self) -> int:
+        """Fork one worker and return its pid."""
+        pid = os.fork()
+        if pid:
+            self._pids.add(pid)
+            return pid
+        # Worker process: never return into the master loop.
+        status = 0
+        try:
+            self._serve()
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            status = 1
+        finally:
+            os._exit(status)
+
+    def _serve(self) -> None:
+        """Run a uvicorn server on the shared socket until it is told to stop."""
+        for signum in (
+                signal.SIGINT, signal.SIGTERM, signal.SIGHUP,
+                signal.SIGTTIN, signal.SIGTTOU,
+            ):
+            signal.signal(signum, signal.SIG_DFL)
+
+        # Connections opened by the master while importing the application
+        # must not be shared with the forked workers.
+        from src.pwcexercise.config.db import engine
+        engine.dispose(close=False)
+
+        if self.max_requests:
+            self.config.limit_max_requests = self.max_requests + random.randint(
+                0, self.max_requests_jitter,
+            )
+        logger.info(
+            "Worker %d started (recycled after %s requests)",
+            os.getpid(), self.config.limit_max_requests,
+        )
+        uvicorn.Server(self.config).run(sockets=[self.sock])
+
+    def _signal_workers(self, signum: int, pids: set[int] | None = None) -> None:
+        for pid in pids if pids is not None else set(self._pids):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                self._pids.discard(pid)
+
+    def _reap(self) -> list[int]:
+        """Collect exited workers without blocking and return their pids."""
+        exited = []
+        while self._pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                exited.extend(self._pids)
+                self._pids.clear()
+                break
+            if pid == 0:
+                break
+            if pid in self._pids:
+                self._pids.discard(pid)
+                exited.append(pid)
+                if pid in self._retiring:
+                    self._retiring.discard(pid)
+                elif not self._stopping:
+                    logger.info(
+                        "Worker %d exited with code %d",
+                        pid, os.waitstatus_to_exitcode(status),
+                    )
+        return exited
+
+    def _wait_for(self, pids: set[int], timeout: float) -> set[int]:
+        """Wait until ``pids`` exited or ``timeout`` passed; return the survivors."""
+        deadline = time.monotonic() + timeout
+        remaining = set(pids)
+        while remaining and time.monotonic() < deadline:
+            remaining -= set(self._reap())
+            if remaining:
+                time.sleep(0.1)
+        return remaining
+
+    def _rolling_restart(self) -> None:
+        """Replace every worker, starting each replacement before stopping the old one."""
+        logger.info("Restarting %d workers", len(self._pids))
+        for pid in list(self._pids):
+            if self._stopping:
+                return
+            self._spawn()
+            self._retire(pid)
+            survivors = self._wait_for({pid}, self.graceful_timeout)
+            self._signal_workers(signal.SIGKILL, survivors)
+
+    def _retire(self, pid: int) -> None:
+        """Ask a worker to finish its requests and exit without replacing it."""
+        self._retiring.add(pid)
+        self._signal_workers(signal.SIGTERM, {pid})
+
+    def _handle_stop(self, signum: int, _frame: object) -> None:
+        self._stopping = True
+
+    def _handle_restart(self, signum: int, _frame: object) -> None:
+        self._restart_requested = True
+
+    def _handle_resize(self, signum: int, _frame: object) -> None:
+        if signum == signal.SIGTTIN:
+            self.workers += 1
+        elif self.workers > 1:
+            self.workers -= 1
+        logger.info("Worker count set to %d", self.workers)
+
+    def run(self) -> None:
+        """Start the workers and supervise them until the master is stopped."""
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_restart)
+        signal.signal(signal.SIGTTIN, self._handle_resize)
+        signal.signal(signal.SIGTTOU, self._handle_resize)
+
+        logger.info("Master %d starting %d workers", os.getpid(), self.workers)
+        while not self._stopping:
+            self._reap()
+            if self._restart_requested:
+                self._restart_requested = False
+                self._rolling_restart()
+            active = self._pids - self._retiring
+            for _ in range(self.workers - len(active)):
+                self._spawn()
+            surplus = max(0, len(active) - self.workers)
+            for pid in sorted(active, reverse=True)[:surplus]:
+                self._retire(pid)
+            time.sleep(POLL_INTERVAL)
+
+        logger.info("Stopping %d workers", len(self._pids))
+        self._signal_workers(signal.SIGTERM)
+        survivors = self._wait_for(set(self._pids), self.graceful_timeout)
+        if survivors:
+            logger.warning("Killing %d workers that did not stop", len(survivors))
+            self._signal_workers(signal.SIGKILL, survivors)
+            self._wait_for(survivors, POLL_INTERVAL)
+
+
+def main() -> None:
+    """Serve the API with a pool of preloaded worker processes."""
+    parser = argparse.ArgumentParser(description="Serve the API with worker processes.")
+    parser.add_argument("--app", default=DEFAULT_APP, help="ASGI application to serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=default_workers(),
+        help="Worker processes, WEB_CONCURRENCY or the CPU count by default",
+    )
+    parser.add_argument(
+        "--max-requests", type=int, default=MAX_REQUESTS,
+        help="Recycle a worker after this many requests, 0 to disable",
+    )
+    parser.add_argument("--max-requests-jitter", type=int, default=MAX_REQUESTS_JITTER)
+    parser.add_argument("--graceful-timeout", type=int, default=GRACEFUL_TIMEOUT)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--no-access-log", action="store_true")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    # Preload: import the application once, before forking the workers.
+    app = import_from_string(args.app)
+    config = uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        backlog=args.backlog,
+        access_log=not args.no_access_log,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+    sock = config.bind_socket()
+    pool = WorkerPool(
+        config,
+        sock,
+        args.workers,
+        args.max_requests or None,
+        args.max_requests_jitter,
+        args.graceful_timeout,
+    )
+    try:
+        pool.run()
+    finally:
+        sock.close()
+    logger.info("Launcher stopped")
+
+if __name__ == "__main__":
+    main()
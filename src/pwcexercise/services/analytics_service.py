@@ -0,0 +1,334 @@
+"""In-memory columnar snapshot of the workforce for vectorized analytics.
+
+The snapshot is a pandas DataFrame with one row per employee holding their
+department, job title, current salary and latest performance review. It is
+built with a single SQL statement on first use and then kept up to date
+incrementally: the service write functions mark the employees they touch as
+dirty and only those rows are reloaded before the next query. Before every
+query the snapshot also follows the change feed, so the employees written by
+other worker processes are reloaded too; when too many changed it is rebuilt.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.performance_review import PerformanceReview
+from src.pwcexercise.models.salary import Salary
+from src.pwcexercise.services.change_log_service import ChangeCursor
+
+IN_CHUNK_SIZE = 500
+
+METRICS = ("monthly_income", "hourly_rate", "age", "review_score")
+GROUP_KEYS = ("department_id", "job_title_id")
+AGGREGATES = ("mean", "sum", "count", "min", "max", "median", "percentile")
+
+COLUMNS = [
+    "employee_id", "department_id", "job_title_id", "age", "hire_date",
+    "salary_id", "monthly_income", "hourly_rate", "effective_date",
+    "review_id", "review_score", "review_date",
+]
+
+
+def _snapshot_statement(employee_ids: list[int] | None = None) -> Select:
+    """Build the statement returning one snapshot row per employee."""
+    salaries = (
+        select(
+            Salary.id, Salary.employee_id, Salary.monthly_income,
+            Salary.hourly_rate, Salary.effective_date,
+            func.row_number().over(
+                partition_by=Salary.employee_id,
+                order_by=(Salary.effective_date.desc(), Salary.id.desc()),
+            ).label("position"),
+        )
+    )
+    reviews = (
+        select(
+            PerformanceReview.id, PerformanceReview.employee_id,
+            PerformanceReview.score, PerformanceReview.review_date,
+            func.row_number().over(
+                partition_by=PerformanceReview.employee_id,
+                order_by=(
+                    PerformanceReview.review_date.desc(),
+                    PerformanceReview.id.desc(),
+                ),
+            ).label("position"),
+        )
+    )
+    if employee_ids is not None:
+        salaries = salaries.where(Salary.employee_id.in_(employee_ids))
+        reviews = reviews.where(PerformanceReview.employee_id.in_(employee_ids))
+    salaries = salaries.subquery()
+    reviews = reviews.subquery()
+
+    statement = (
+        select(
+            Employee.id, Employee.department_id, Employee.job_title_id,
+            Employee.age, Employee.hire_date,
+            salaries.c.id, salaries.c.monthly_income, salaries.c.hourly_rate,
+            salaries.c.effective_date,
+            reviews.c.id, reviews.c.score, reviews.c.review_date,
+        )
+        .outerjoin(salaries, (salaries.c.employee_id == Employee.id)
+                   & (salaries.c.position == 1))
+        .outerjoin(reviews, (reviews.c.employee_id == Employee.id)
+                   & (reviews.c.position == 1))
+    )
+    if employee_ids is not None:
+        statement = statement.where(Employee.id.in_(employee_ids))
+    return statement
+
+
+def _load(db: Session, employee_ids: list[int] | None = None) -> pd.DataFrame:
+    """Load snapshot rows, for every employee or only for ``employee_ids``."""
+    if employee_ids is None:
+        rows = db.execute(_snapshot_statement()).all()
+    else:
+        rows = []
+        for start in range(0, len(employee_ids), IN_CHUNK_SIZE):
+            chunk = employee_ids[start:start + IN_CHUNK_SIZE]
+            rows.extend(db.execute(_snapshot_statement(chunk)).all())
+    frame = pd.DataFrame.from_records(rows, columns=COLUMNS)
+    for column in ("monthly_income", "hourly_rate", "age", "review_score",
+                   "department_id", "job_title_id", "salary_id", "review_id"):
+        frame[column] = pd.to_numeric(frame[column], errors="coerce").astype("float64")
+    return frame.set_index("employee_id")
+
+
+class WorkforceSnapshot:
+    """Columnar snapshot of employees with their current salary and latest review."""
+
+    def __init__(self) -> None:
+        """Create an empty snapshot that is loaded on first use."""
+        self._frame: pd.DataFrame | None = None
+        self._changes = ChangeCursor(
+            (Employee.__tablename__, Salary.__tablename__,
+             PerformanceReview.__tablename__),
+        )
+        self._dirty: set[int] = set()
+        self._lock = threading.Lock()
+
+    def invalidate(
+            self,
+            employee_ids: Iterable[int | None] = (),
+            salary_id: int | None = None,
+            review_id: int | None = None,
+        ) -> None:
+        """Mark rows as stale after a write.
+
+        :param employee_ids: Employees whose row must be reloaded
+        :param salary_id: Salary that changed; its current holder is reloaded too
+        :param review_id: Review that changed; its current holder is reloaded too
+        """
+        with self._lock:
+            self._mark(employee_ids, salary_id, review_id)
+
+    def _mark(
+            self,
+            employee_ids: Iterable[int | None] = (),
+            salary_id: int | None = None,
+            review_id: int | None = None,
+        ) -> None:
+        self._dirty.update(i for i in employee_ids if i is not None)
+        frame = self._frame
+        if frame is None:
+            return
+        if salary_id is not None:
+            self._dirty.update(frame.index[frame["salary_id"] == salary_id])
+        if review_id is not None:
+            self._dirty.update(frame.index[frame["review_id"] == review_id])
+
+    def _follow_changes(self, db: Session) -> None:
+        """Mark the rows written since the last query, by any process, as stale.
+
+        Salaries and reviews are traced to their employee, and deleted ones
+        to the employee whose row still holds them.
+        """
+        changed = self._changes.poll(db)
+        if changed is None:
+            self._frame = None
+            return
+        if not any(changed.values()):
+            return
+        employee_ids = set(changed[Employee.__tablename__])
+        for model in (Salary, PerformanceReview):
+            ids = sorted(changed[model.__tablename__])
+            for start in range(0, len(ids), IN_CHUNK_SIZE):
+                employee_ids |= set(db.execute(
+                    select(model.employee_id)
+                    .where(model.id.in_(ids[start:start + IN_CHUNK_SIZE])),
+                ).scalars())
+        self._mark(employee_ids)
+        for salary_id in changed[Salary.__tablename__]:
+            self._mark(salary_id=salary_id)
+        for review_id in changed[PerformanceReview.__tablename__]:
+            self._mark(review_id=review_id)
+
+    def reset(self) -> None:
+        """Drop the snapshot so the next query rebuilds it from scratch."""
+        with self._lock:
+            self._frame = None
+            self._changes.seq = None
+            self._dirty.clear()
+
+    def frame(self, db: Session) -> pd.DataFrame:
+        """Return an up-to-date snapshot, refreshing stale rows first.
+
+        :param db: Database session used to follow the change feed and to
+            load missing or stale rows
+        :return: DataFrame indexed by employee ID; treat it as read-only
+        """
+        with self._lock:
+            self._follow_changes(db)
+            if self._frame is None:
+                self._frame = _load(db)
+                self._dirty.clear()
+            elif self._dirty:
+                employee_ids = sorted(self._dirty)
+                fresh = _load(db, employee_ids)
+                kept = self._frame.drop(index=employee_ids, errors="ignore")
+                if not fresh.empty:
+                    kept = pd.concat([kept, fresh]).sort_index()
+                self._frame = kept
+                self._dirty.clear()
+            return self._frame
+
+
+workforce = WorkforceSnapshot()
+
+
+def _validate(metric: str, group_by: str | None, agg: str) -> None:
+    """Raise ValueError for metrics, group keys or aggregates not supported."""
+    if metric not in METRICS:
+        msg = f"Unknown metric '{metric}', expected one of {METRICS}"
+        raise ValueError(msg)
+    if group_by is not None and group_by not in GROUP_KEYS:
+        msg = f"Unknown group key '{group_by}', expected one of {GROUP_KEYS}"
+        raise ValueError(msg)
+    if agg not in AGGREGATES:
+        msg = f"Unknown aggregate '{agg}', expected one of {AGGREGATES}"
+        raise ValueError(msg)
+
+
+def _filtered(frame: pd.DataFrame, filters: dict[str, int | None]) -> pd.DataFrame:
+    """Keep the rows whose group keys equal the non-None ``filters``."""
+    mask = np.ones(len(frame), dtype=bool)
+    for column, value in filters.items():
+        if value is not None:
+            mask &= (frame[column] == value).to_numpy()
+    return frame[mask]
+
+
+def aggregate(
+        db: Session,
+        metric: str,
+        agg: str = "mean",
+        group_by: str | None = None,
+        percentile: float = 50.0,
+        department_id: int | None = None,
+        job_title_id: int | None = None,
+    ) -> list[dict]:
+    """Aggregate a metric over the snapshot, optionally grouped.
+
+    Employees without a value for ``metric`` are ignored.
+
+    :param db: Database session
+    :param metric: One of ``METRICS``
+    :param agg: One of ``AGGREGATES``
+    :param group_by: One of ``GROUP_KEYS`` or None for a single company-wide value
+    :param percentile: Percentile in [0, 100] used when ``agg`` is ``percentile``
+    :param department_id: Only consider employees in this department
+    :param job_title_id: Only consider employees with this job title
+    :return: One dict per group with the group key, value and count
+    """
+    _validate(metric, group_by, agg)
+    frame = _filtered(workforce.frame(db), {
+        "department_id": department_id, "job_title_id": job_title_id,
+    })
+    frame = frame[frame[metric].notna()]
+
+    if group_by is None:
+        values = frame[metric]
+        if values.empty:
+            return []
+        if agg == "percentile":
+            value = values.quantile(percentile / 100)
+        else:
+            value = values.agg(agg)
+        return [{"group": None, "value": float(value), "count": int(values.size)}]
+
+    grouped = frame[frame[group_by].notna()].groupby(group_by)[metric]
+    if agg == "percentile":
+        values = grouped.quantile(percentile / 100)
+    else:
+        values = grouped.agg(agg)
+    counts = grouped.size()
+    return [
+        {"group": int(key), "value": float(values[key]), "count": int(counts[key])}
+        for key in values.index
+    ]
+
+
+def histogram(
+        db: Session,
+        metric: str,
+        bins: int = 10,
+        group_by: str | None = None,
+    ) -> list[dict]:
+    """Histogram of a metric over the snapshot, with the same edges for every group.
+
+    :param db: Database session
+    :param metric: One of ``METRICS``
+    :param bins: Number of equal-width bins
+    :param group_by: One of ``GROUP_KEYS`` or None for the whole company
+    :return: One dict per group with the bin edges and counts
+    """
+    _validate(metric, group_by, "count")
+    frame = workforce.frame(db)
+    frame = frame[frame[metric].notna()]
+    if frame.empty:
+        return []
+    edges = np.histogram_bin_edges(frame[metric].to_numpy(), bins=bins)
+
+    if group_by is None:
+        groups = [(None, frame[metric].to_numpy())]
+    else:
+        frame = frame[frame[group_by].notna()]
+        groups = [
+            (int(key), values.to_numpy())
+            for key, values in frame.groupby(group_by)[metric]
+        ]
+    return [
+        {
+            "group": key,
+            "edges": edges.tolist(),
+            "counts": np.histogram(values, bins=edges)[0].tolist(),
+        }
+        for key, values in groups
+    ]
+
+
+def group_mean(
+        db: Session,
+        metric: str,
+        department_id: int | None = None,
+        job_title_id: int | None = None,
+    ) -> float:
+    """Mean of ``metric`` for one department or job title, rounded to cents.
+
+    :return: The mean, or 0 when no employee has a value for ``metric``
+    """
+    result = aggregate(
+        db, metric, "mean",
+        department_id=department_id, job_title_id=job_title_id,
+    )
+    if not result:
+        return 0
+    return round(result[0]["value"], 2)
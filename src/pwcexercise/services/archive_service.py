@@ -0,0 +1,268 @@
+"""Hot/cold partitioning of the salary and performance review history.
+
+``salaries`` and ``performance_reviews`` only grow, while almost every read
+is about the current state. History older than the archive horizon is moved,
+in batches through the write queue, to ``salaries_archive`` and
+``performance_reviews_archive``, which have the same columns and keep the
+IDs:
+
+- a salary is archived once it ended (``effective_to``) on or before the
+  horizon, so current salaries and every salary in effect since the horizon
+  stay hot;
+- a review is archived once it is older than the horizon, unless it is the
+  employee's latest.
+
+Current-state reads (active salary, latest review, the aguinaldo window and
+the workforce aggregates) only read the hot tables. History and as-of reads
+select from ``salary_history()`` and ``review_history()``, the union of both
+tables; SQLite pushes their conditions into each side, so they use the
+indexes of both.
+
+Writes that reach into archived history first move the affected rows back
+(``restore_salaries``, ``restore_reviews`` and ``restore_latest_review``), so
+validity intervals are always recomputed over hot rows and an employee's
+current rows are always hot. The next archive run moves them out again.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import (
+    Subquery,
+    Table,
+    and_,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.config.write_queue import execute_write
+from src.pwcexercise.models.performance_review import (
+    PerformanceReview,
+    PerformanceReviewArchive,
+)
+from src.pwcexercise.models.salary import Salary, SalaryArchive
+from src.pwcexercise.utils.logger import logger
+
+ARCHIVE_HORIZON_DAYS = 730
+# The aguinaldo reads the salaries of the last 180 days from the hot table
+# only, so the horizon must be older than that.
+MIN_HORIZON_DAYS = 181
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def archive_horizon(horizon_days: int = ARCHIVE_HORIZON_DAYS) -> date:
+    """Return the day before which history is archived.
+
+    :param horizon_days: Age in days of the oldest history kept hot
+    :raises ValueError: If the horizon is closer than ``MIN_HORIZON_DAYS``
+    """
+    if horizon_days < MIN_HORIZON_DAYS:
+        msg = f"The archive horizon must be at least {MIN_HORIZON_DAYS} days"
+        raise ValueError(msg)
+    return datetime.now(tz=timezone.utc).date() - timedelta(days=horizon_days)
+
+
+def _history(hot: Table, archive: Table, name: str) -> Subquery:
+    return union_all(select(hot), select(archive)).subquery(name)
+
+
+def salary_history() -> Subquery:
+    """Hot and archived salaries as one table with the columns of ``salaries``."""
+    return _history(Salary.__table__, SalaryArchive.__table__, "salary_history")
+
+
+def review_history() -> Subquery:
+    """Hot and archived reviews as one table with the reviews' columns."""
+    return _history(
+        PerformanceReview.__table__, PerformanceReviewArchive.__table__,
+        "review_history",
+    )
+
+
+def _move(session: Session, source: Table, target: Table, *conditions) -> list[dict]:
+    """Move the rows of ``source`` matching ``conditions`` to ``target``."""
+    rows = [
+        dict(row)
+        for row in session.execute(
+            delete(source).where(*conditions).returning(*source.c),
+        ).mappings()
+    ]
+    if rows:
+        session.execute(insert(target), rows)
+    return rows
+
+
+def restore_salaries(
+        session: Session, employee_ids: Iterable[int | None], since: date,
+    ) -> int:
+    """Move archived salaries in effect on or after ``since`` back to ``salaries``.
+
+    A salary written, moved or deleted on ``since`` can only change the
+    validity intervals of salaries ending on or after it; they are restored
+    before the intervals are recomputed. Nothing is read from the hot table.
+
+    :param session: Session of the write
+    :param employee_ids: Employees whose salaries change
+    :param since: Earliest effective date touched by the write
+    :return: Number of salaries restored
+    """
+    employee_ids = {i for i in employee_ids if i is not None}
+    if not employee_ids:
+        return 0
+    archive = SalaryArchive.__table__
+    return len(_move(
+        session, archive, Salary.__table__,
+        archive.c.employee_id.in_(employee_ids), archive.c.effective_to >= since,
+    ))
+
+
+def restore_reviews(session: Session, review_ids: Iterable[int]) -> list[dict]:
+    """Move archived reviews back to ``performance_reviews`` before updating them.
+
+    :return: The reviews restored
+    """
+    archive = PerformanceReviewArchive.__table__
+    return _move(
+        session, archive, PerformanceReview.__table__, archive.c.id.in_(review_ids),
+    )
+
+
+def _newer(table: Table, than: Table) -> object:
+    """Condition: a row of ``table`` of the same employee is newer than ``than``."""
+    return exists().where(
+        table.c.employee_id == than.c.employee_id,
+        or_(
+            table.c.review_date > than.c.review_date,
+            and_(table.c.review_date == than.c.review_date, table.c.id > than.c.id),
+        ),
+    )
+
+
+def restore_latest_review(session: Session, employee_ids: Iterable[int | None]) -> int:
+    """Move each employee's latest review back to the hot table if it is archived.
+
+    Needed after a hot review is deleted or moved to another employee or an
+    earlier day, one statement when there is nothing to restore.
+
+    :return: Number of reviews restored
+    """
+    employee_ids = {i for i in employee_ids if i is not None}
+    if not employee_ids:
+        return 0
+    archive = PerformanceReviewArchive.__table__
+    reviews = PerformanceReview.__table__
+    newer_archived = archive.alias("newer_archived")
+    return len(_move(
+        session, archive, reviews,
+        archive.c.employee_id.in_(employee_ids),
+        ~_newer(reviews, archive),
+        ~_newer(newer_archived, archive),
+    ))
+
+
+def _archive_salaries(session: Session, horizon: date, limit: int) -> int:
+    """Move up to ``limit`` salaries that ended on or before ``horizon``."""
+    salaries = Salary.__table__
+    batch = (
+        select(salaries.c.id)
+        .where(salaries.c.effective_to <= horizon)
+        .limit(limit)
+        .correlate(None)
+    )
+    return len(_move(
+        session, salaries, SalaryArchive.__table__, salaries.c.id.in_(batch),
+    ))
+
+
+def _archive_reviews(
+        session: Session, horizon: date, limit: int, after_id: int,
+    ) -> tuple[int, int | None]:
+    """Move up to ``limit`` reviews older than ``horizon`` that are not the latest.
+
+    Reviews are visited in ID order from ``after_id``, so each run reads
+    every review once.
+
+    :return: Reviews moved and the last ID visited, None when done
+    """
+    reviews = PerformanceReview.__table__
+    newer = reviews.alias("newer")
+    batch = (
+        select(reviews.c.id)
+        .where(
+            reviews.c.id > after_id,
+            reviews.c.review_date < horizon,
+            _newer(newer, reviews),
+        )
+        .order_by(reviews.c.id)
+        .limit(limit)
+        .correlate(None)
+    )
+    moved = _move(
+        session, reviews, PerformanceReviewArchive.__table__, reviews.c.id.in_(batch),
+    )
+    return len(moved), max((row["id"] for row in moved), default=None)
+
+
+def archive_history(
+        db: Session,
+        horizon: date,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        report: Callable[[float], None] | None = None,
+    ) -> dict:
+    """Move the salary and review history older than ``horizon`` to the archive.
+
+    Every batch is its own write-queue mutation, so requests keep writing
+    between batches. Current state does not change, so no cache is dropped.
+
+    :param db: Session used to estimate the amount of work
+    :param horizon: Day before which history is archived
+    :param batch_size: Rows moved per batch
+    :param report: Called with the fraction of the work done
+    :return: The horizon and the number of salaries and reviews archived
+    """
+    salaries = Salary.__table__
+    reviews = PerformanceReview.__table__
+    expected = db.execute(
+        select(func.count()).where(salaries.c.effective_to <= horizon),
+    ).scalar() + db.execute(
+        select(func.count()).where(reviews.c.review_date < horizon),
+    ).scalar()
+
+    def progress(done: int) -> None:
+        if report is not None and expected:
+            report(done / expected)
+
+    archived_salaries = 0
+    while moved := execute_write(
+            db, lambda session: _archive_salaries(session, horizon, batch_size),
+        ):
+        archived_salaries += moved
+        progress(archived_salaries)
+
+    archived_reviews, after_id = 0, 0
+    while after_id is not None:
+        moved, after_id = execute_write(
+            db, lambda session, after_id=after_id: _archive_reviews(
+                session, horizon, batch_size, after_id,
+            ),
+        )
+        archived_reviews += moved
+        progress(archived_salaries + archived_reviews)
+
+    logger.info(
+        "Archived %d salaries and %d performance reviews older than %s",
+        archived_salaries, archived_reviews, horizon,
+    )
+    return {
+        "horizon": horizon,
+        "salaries": archived_salaries,
+        "performance_reviews": archived_reviews,
+    }
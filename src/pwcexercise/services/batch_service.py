@@ -0,0 +1,182 @@
+"""Run many API requests in one HTTP round trip.
+
+``POST /batch`` takes a list of sub-requests and runs each one through the
+application in process, as an ASGI call with a scope derived from the
+batch's, so it goes through the same routing, validation, dependencies and
+error handling as a real request, minus the network round trip.
+
+Sub-requests run in order, so a read sees the writes listed before it.
+Reads share the session of the batch, which is rolled back after each of
+them to see the latest commits and hold no lock in between. Writes get a
+session of their own, as they would outside a batch. With ``concurrency``
+above 1, consecutive reads run together, up to that many at a time, each on
+a session of its own since sessions are not thread-safe; a write still waits
+for the reads before it, and the reads after it wait for the write.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+from urllib.parse import unquote, urlsplit
+
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Message, Scope
+
+from src.pwcexercise.config.db import BATCH_SESSION_KEY, SessionLocal
+from src.pwcexercise.utils.logger import logger
+
+if TYPE_CHECKING:
+    from src.pwcexercise.schemas.batch import SubRequestSchema
+
+MAX_SUB_REQUESTS = 50
+MAX_BATCH_BYTES = 1024 * 1024
+MAX_CONCURRENCY = 8
+READ_METHODS = frozenset({"GET"})
+# Batches do not nest, and streams never end.
+UNBATCHABLE_PATHS = ("/batch", "/analytics/stream")
+
+
+def _error(status: int, detail: str) -> dict:
+    return {
+        "status": status,
+        "headers": {"content-type": "application/json"},
+        "body": {"detail": detail},
+    }
+
+
+def _scope(parent: Scope, method: str, path: str, body: bytes) -> Scope:
+    """Build the scope of a sub-request from the scope of its batch."""
+    url = urlsplit(path)
+    headers = [(b"accept", b"application/json")]
+    headers += [(name, value) for name, value in parent["headers"] if name == b"host"]
+    if body:
+        headers += [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+    return {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": method,
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": parent.get("root_path", ""),
+        "path": unquote(url.path),
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+    }
+
+
+def _response(status: int, raw_headers: list, body: bytes) -> dict:
+    headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in raw_headers
+        if name.lower() != b"content-length"
+    }
+    content: Any = None
+    if body:
+        if headers.get("content-type", "").startswith("application/json"):
+            content = json.loads(body)
+        else:
+            content = body.decode(errors="replace")
+    return {"status": status, "headers": headers, "body": content}
+
+
+async def run_request(
+        app: ASGIApp,
+        parent: Scope,
+        request: SubRequestSchema,
+        session: Session | None = None,
+    ) -> dict:
+    """Run one sub-request through ``app`` and capture its response.
+
+    :param app: Application serving the batch
+    :param parent: Scope of the batch request
+    :param request: Sub-request to run
+    :param session: Session lent to the route, or None for its own
+    :return: The status, headers and decoded body of the response
+    """
+    path = urlsplit(request.path).path.rstrip("/") or "/"
+    if path.startswith(UNBATCHABLE_PATHS):
+        return _error(400, f"{request.path} cannot be batched")
+    body = b"" if request.body is None else json.dumps(request.body).encode()
+    scope = _scope(parent, request.method, request.path, body)
+    if session is not None:
+        scope[BATCH_SESSION_KEY] = session
+
+    received = False
+
+    async def receive() -> Message:
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status, headers, chunks = 500, [], []
+
+    async def send(message: Message) -> None:
+        nonlocal status, headers
+        if message["type"] == "http.response.start":
+            status, headers = message["status"], message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # The error middleware has already answered 500, as for any request.
+        logger.exception("Batched %s %s failed", request.method, request.path)
+    return _response(status, headers, b"".join(chunks))
+
+
+async def run_batch(
+        app: ASGIApp,
+        parent: Scope,
+        requests: Sequence[SubRequestSchema],
+        concurrency: int = 1,
+    ) -> list[dict]:
+    """Run the sub-requests of a batch and return their responses in order.
+
+    :param app: Application serving the batch
+    :param parent: Scope of the batch request
+    :param requests: Sub-requests, run in order
+    :param concurrency: Most consecutive reads run at the same time
+    :return: One response per sub-request
+    """
+    responses: list[dict] = []
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def limited(request: SubRequestSchema) -> dict:
+        async with limiter:
+            return await run_request(app, parent, request)
+
+    db = SessionLocal()
+    try:
+        index = 0
+        while index < len(requests):
+            end = index
+            while end < len(requests) and requests[end].method in READ_METHODS:
+                end += 1
+            if concurrency > 1 and end - index > 1:
+                responses += await asyncio.gather(
+                    *(limited(request) for request in requests[index:end]),
+                )
+                index = end
+                continue
+            request = requests[index]
+            if request.method in READ_METHODS:
+                responses.append(await run_request(app, parent, request, db))
+                db.rollback()
+            else:
+                responses.append(await run_request(app, parent, request))
+            index += 1
+    finally:
+        db.close()
+    return responses
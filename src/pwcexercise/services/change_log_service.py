@@ -0,0 +1,283 @@
+"""Change data feed for the incremental sync of downstream systems.
+
+Every create, update and delete of the service modules also inserts one
+``changes`` row per row it wrote, in its own transaction (the write-queue
+mutation, or the commit of the reference table writes), so a change is
+logged if and only if it commits. SQLite lets one transaction write at a
+time, so sequence numbers become visible in order: a consumer that read up
+to a ``seq`` never finds a smaller one later.
+
+Consumers page through the log with ``get_changes`` from the last ``seq``
+they saw and sync in O(changes) instead of re-reading every table. The log
+only names the rows: consumers fetch the current state of inserted or
+updated rows and drop deleted ones, so replaying a change is harmless. To
+bootstrap, read ``latest_seq``, copy the tables, then follow the feed from
+that ``seq``.
+
+``compact_changes`` bounds the log. It drops every entry superseded by a
+later entry for the same row, which no consumer needs, and expires entries
+older than the retention period, ``CHANGE_RETENTION_DAYS`` (30 days) by
+default. The highest expired ``seq`` is kept in ``change_log_state``; a
+consumer behind it has to resync. The application runs it as a job at
+startup and every ``COMPACTION_INTERVAL`` (see ``job_service``).
+
+Archiving and restoring history moves rows between tables without changing
+them, so it is not logged; salaries and reviews are logged under the hot
+table name wherever they are stored.
+
+The in-process caches of the data follow the feed with a ``ChangeCursor``:
+before serving they read the latest ``seq``, a lookup of the last primary
+key, and only when it moved the changes since they last looked, so they see
+the writes of the other worker processes as soon as they commit.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Table, and_, bindparam, delete, exists, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.config.write_queue import execute_write
+from src.pwcexercise.models.change import Change, ChangeLogState
+from src.pwcexercise.utils.logger import logger
+
+CHANGE_RETENTION_DAYS = 30
+CHANGES_PAGE_SIZE = 100
+MAX_CHANGES_PAGE = 1000
+# Beyond this many changes since its last look a cache starts over instead.
+MAX_TRACKED_CHANGES = 1000
+COMPACTION_BATCH_SIZE = 5000
+
+_changes = Change.__table__
+_state = ChangeLogState.__table__
+
+_PAGE = (
+    select(_changes)
+    .where(_changes.c.seq > bindparam("since"))
+    .order_by(_changes.c.seq)
+    .limit(bindparam("limit"))
+)
+_LATEST_SEQ = select(func.max(_changes.c.seq))
+_PURGED_THROUGH = select(_state.c.purged_through)
+
+
+def _now() -> datetime:
+    return datetime.now(tz=timezone.utc).replace(tzinfo=None)
+
+
+def record_changes(
+        session: Session, table: Table, operation: str, row_ids: Iterable[int],
+    ) -> list[int]:
+    """Log a write to the rows ``row_ids`` of ``table`` in the caller's transaction.
+
+    :param session: Session of the write, committed by the caller
+    :param table: Table written; salaries and reviews use the hot table
+    :param operation: ``CHANGE_INSERT``, ``CHANGE_UPDATE`` or ``CHANGE_DELETE``
+    :param row_ids: Primary keys of the rows written
+    :return: The ``seq`` of each change logged
+    """
+    changed_at = _now()
+    rows = [
+        {
+            "table_name": table.name, "row_id": row_id,
+            "operation": operation, "changed_at": changed_at,
+        }
+        for row_id in dict.fromkeys(row_ids)
+    ]
+    if not rows:
+        return []
+    return session.execute(
+        insert(_changes).returning(_changes.c.seq), rows,
+    ).scalars().all()
+
+
+def purged_through(db: Session) -> int:
+    """Return the highest ``seq`` expired from the log, 0 if none was."""
+    return db.execute(_PURGED_THROUGH).scalar() or 0
+
+
+def latest_seq(db: Session) -> int:
+    """Return the highest ``seq`` logged, 0 if the log is empty."""
+    return db.execute(_LATEST_SEQ).scalar() or 0
+
+
+def get_changes(db: Session, since: int = 0, limit: int = CHANGES_PAGE_SIZE) -> dict:
+    """Return the changes logged after ``since``, oldest first.
+
+    The page is read before the expiry horizon, so a compaction running in
+    between makes the call fail instead of silently skipping changes.
+
+    :param db: Database session
+    :param since: Last ``seq`` the consumer has seen, 0 to start
+    :param limit: Most changes returned
+    :return: The changes, the ``next_since`` to ask for next, whether
+        ``has_more`` changes follow, and the ``latest_seq`` logged
+    :raises ValueError: If changes after ``since`` have expired
+    """
+    rows = db.execute(_PAGE, {"since": since, "limit": limit + 1}).mappings().all()
+    horizon = purged_through(db)
+    if since < horizon:
+        msg = (
+            f"Changes up to seq {horizon} have expired; "
+            "resync from the listings and follow the feed from latest_seq"
+        )
+        raise ValueError(msg)
+    changes = [dict(row) for row in rows[:limit]]
+    return {
+        "changes": changes,
+        "next_since": changes[-1]["seq"] if changes else since,
+        "has_more": len(rows) > limit,
+        "latest_seq": max(latest_seq(db), horizon),
+    }
+
+
+ChangedRows = dict[str, set[int]]
+
+
+class ChangeCursor:
+    """Position of an in-process cache in the change feed."""
+
+    def __init__(self, tables: Iterable[str], limit: int = MAX_TRACKED_CHANGES) -> None:
+        """Create a cursor that has not looked at the feed yet.
+
+        :param tables: Names of the tables the cache is derived from
+        :param limit: Most changes listed before the cache has to start over
+        """
+        self.tables = frozenset(tables)
+        self.limit = limit
+        self.seq: int | None = None
+        self._skipped: set[int] = set()
+
+    def skip(self, seqs: Iterable[int]) -> None:
+        """Leave the changes ``seqs`` out of the next polls.
+
+        For the writes of this process, which the cache already applied.
+        Changes the cursor is past are ignored.
+        """
+        self._skipped.update(
+            seq for seq in seqs if self.seq is not None and seq > self.seq
+        )
+
+    def poll(self, db: Session) -> ChangedRows | None:
+        """Return the rows of ``tables`` changed since the last poll.
+
+        Call it in the transaction that then reads the data, so the cache and
+        its position describe the same state of the database.
+
+        :param db: Database session
+        :return: The IDs of the changed rows per table, empty when nothing
+            changed, or None when the changes cannot all be listed (on the
+            first poll, beyond ``limit`` changes, or when they have expired):
+            the cache must then start over
+        """
+        latest = latest_seq(db)
+        if latest == self.seq:
+            return {}
+        since, self.seq = self.seq, latest
+        skipped, self._skipped = self._skipped, {
+            seq for seq in self._skipped if seq > latest
+        }
+        if since is None:
+            return None
+        try:
+            page = get_changes(db, since, self.limit)
+        except ValueError:
+            return None
+        if page["has_more"]:
+            return None
+        changed: ChangedRows = {table: set() for table in self.tables}
+        for change in page["changes"]:
+            if change["table_name"] in changed and change["seq"] not in skipped:
+                changed[change["table_name"]].add(change["row_id"])
+        return changed
+
+
+def _expire(session: Session, through: int, limit: int) -> int:
+    """Delete up to ``limit`` changes up to ``through`` and record the horizon."""
+    session.execute(
+        sqlite_insert(_state)
+        .values(id=1, purged_through=through)
+        .on_conflict_do_update(
+            index_elements=[_state.c.id],
+            set_={"purged_through": func.max(_state.c.purged_through, through)},
+        ),
+    )
+    batch = (
+        select(_changes.c.seq)
+        .where(_changes.c.seq <= through)
+        .order_by(_changes.c.seq)
+        .limit(limit)
+    )
+    return session.execute(delete(_changes).where(_changes.c.seq.in_(batch))).rowcount
+
+
+def _drop_superseded(session: Session, after: int, through: int) -> int:
+    """Delete the changes in ``(after, through]`` superseded by a later one."""
+    newer = _changes.alias("newer")
+    superseded = exists().where(
+        newer.c.table_name == _changes.c.table_name,
+        newer.c.row_id == _changes.c.row_id,
+        newer.c.seq > _changes.c.seq,
+    )
+    return session.execute(
+        delete(_changes).where(
+            and_(_changes.c.seq > after, _changes.c.seq <= through), superseded,
+        ),
+    ).rowcount
+
+
+def compact_changes(
+        db: Session,
+        retention_days: int = CHANGE_RETENTION_DAYS,
+        batch_size: int = COMPACTION_BATCH_SIZE,
+        report: Callable[[float], None] | None = None,
+    ) -> dict:
+    """Expire old changes and drop superseded ones, in batches through the write queue.
+
+    :param db: Session used to find the work to do
+    :param retention_days: Age in days after which changes expire, 30 by default
+    :param batch_size: Changes expired, or sequence numbers scanned, per batch
+    :param report: Called with the fraction of the work done
+    :return: The horizon and the number of changes expired and superseded
+    """
+    cutoff = db.execute(
+        select(func.max(_changes.c.seq))
+        .where(_changes.c.changed_at < _now() - timedelta(days=retention_days)),
+    ).scalar() or 0
+    first = db.execute(select(func.min(_changes.c.seq))).scalar() or 0
+    last = latest_seq(db)
+    span = max(last - first + 1, 1)
+
+    def progress(done: int) -> None:
+        if report is not None:
+            report(min(done / span, 1.0))
+
+    expired = 0
+    if cutoff:
+        while moved := execute_write(
+                db, lambda session: _expire(session, cutoff, batch_size),
+            ):
+            expired += moved
+            progress(expired)
+
+    superseded = 0
+    after = max(cutoff, first - 1)
+    while after < last:
+        through = min(after + batch_size, last)
+        superseded += execute_write(
+            db, lambda session, after=after, through=through: _drop_superseded(
+                session, after, through,
+            ),
+        )
+        after = through
+        progress(after - first + 1)
+
+    horizon = purged_through(db)
+    logger.info(
+        "Compacted the change log: %d expired, %d superseded, purged through %d",
+        expired, superseded, horizon,
+    )
+    return {"purged_through": horizon, "expired": expired, "superseded": superseded}
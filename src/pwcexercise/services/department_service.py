@@ -1,84 +1,149 @@
 """Provides services for managing departments in the database."""
 from __future__ import annotations
 
+from sqlalchemy import Row, delete, insert, update
 from sqlalchemy.orm import Session
 
+from src.pwcexercise.config.write_queue import execute_write
+from src.pwcexercise.models.change import CHANGE_DELETE, CHANGE_INSERT, CHANGE_UPDATE
 from src.pwcexercise.models.department import Department
 from src.pwcexercise.models.employee import Employee
 from src.pwcexercise.schemas.department import DepartmentCreateSchema
-from src.pwcexercise.services import employee_service
+from src.pwcexercise.schemas.employee import EmployeeFilterSchema
+from src.pwcexercise.services import (
+    analytics_service,
+    employee_service,
+    reference_data_service,
+)
+from src.pwcexercise.services.change_log_service import record_changes
+from src.pwcexercise.services.reference_data_service import bump_version
 
 
 def get_all_departments(db: Session) -> list:
-    """Retrieve all departments from the database.
+    """Retrieve all departments from the reference data cache.
 
     :param db: Database session
     :return: List of all departments
     """
-    return db.query(Department).all()
+    return list(reference_data_service.departments.all(db))
 
-def create_department(department: DepartmentCreateSchema, db: Session) -> Department:
-    """Create a new department in the database.
+def create_department(department: DepartmentCreateSchema, db: Session) -> dict:
+    """Create a new department with one ``INSERT ... RETURNING``.
 
     :param department: Department data
     :param db: Database session
     :return: The created department
     """
-    new_department = Department(name=department.name)
-    db.add(new_department)
-    db.commit()
-    db.refresh(new_department)
+    departments = Department.__table__
+
+    def write(session: Session) -> dict:
+        new_department = session.execute(
+            insert(departments)
+            .values(**department.model_dump())
+            .returning(*departments.c),
+        ).mappings().one()
+        bump_version(session, departments)
+        record_changes(session, departments, CHANGE_INSERT, [new_department["id"]])
+        return dict(new_department)
+
+    new_department = execute_write(db, write)
+    reference_data_service.departments.refresh(db)
     return new_department
 
-def get_department_by_id(department_id: int, db: Session) -> Department | None:
-    """Retrieve a department by its ID.
+def get_department_by_id(department_id: int, db: Session) -> Row | None:
+    """Retrieve a department by its ID from the reference data cache.
 
     :param department_id: ID of the department
     :param db: Database session
     :return: The department with the given ID or None if not found
     """
-    return db.query(Department).filter(Department.id == department_id).first()
+    return reference_data_service.departments.get(db, department_id)
 
 def update_department(
                 department_id: int, department: DepartmentCreateSchema, db: Session,
-            ) -> Department:
-    """Update an existing department in the database.
+            ) -> dict | None:
+    """Update an existing department with one ``UPDATE ... RETURNING``.
 
     :param department_id: ID of the department to update
     :param department: Updated department data
     :param db: Database session
     :return: The updated department or None if not found
     """
-    db_department = db.query(Department).filter(Department.id == department_id).first()
-    if db_department:
-        db_department.name = department.name
-        db.commit()
-        db.refresh(db_department)
-    return db_department
+    departments = Department.__table__
+
+    def write(session: Session) -> dict | None:
+        updated = session.execute(
+            update(departments)
+            .where(departments.c.id == department_id)
+            .values(**department.model_dump())
+            .returning(*departments.c),
+        ).mappings().first()
+        if updated is None:
+            return None
+        bump_version(session, departments)
+        record_changes(session, departments, CHANGE_UPDATE, [updated["id"]])
+        return dict(updated)
+
+    updated = execute_write(db, write)
+    if updated is None:
+        return None
+    reference_data_service.departments.refresh(db)
+    return updated
 
 def delete_department(department_id: int, db: Session) -> bool:
     """Delete a department from the database.
 
+    Its employees are left without a department, as the ORM cascade did,
+    with one ``UPDATE``; the ``RETURNING`` of the ``DELETE`` tells whether
+    the department existed.
+
     :param department_id: ID of the department to delete
     :param db: Database session
     :return: True if the department was deleted, False otherwise
     """
-    db_department = db.query(Department).filter(Department.id == department_id).first()
-    if db_department:
-        db.delete(db_department)
-        db.commit()
-        return True
-    return False
-
-def get_employees_by_department(department_id: int, db: Session) -> list:
-    """Retrieve all employees that work in that department."""
-    return db.query(Employee).filter(Employee.department_id == department_id).all()
+    employees = Employee.__table__
+    departments = Department.__table__
+
+    def write(session: Session) -> tuple[list[int], bool]:
+        detached = session.execute(
+            update(employees)
+            .where(employees.c.department_id == department_id)
+            .values(department_id=None)
+            .returning(employees.c.id),
+        ).scalars().all()
+        deleted = session.execute(
+            delete(departments)
+            .where(departments.c.id == department_id)
+            .returning(departments.c.id),
+        ).first()
+        record_changes(session, employees, CHANGE_UPDATE, detached)
+        if deleted is not None:
+            bump_version(session, departments)
+            record_changes(session, departments, CHANGE_DELETE, [deleted[0]])
+        return list(detached), deleted is not None
+
+    detached, deleted = execute_write(db, write)
+    analytics_service.workforce.invalidate(detached)
+    if not deleted:
+        return False
+    reference_data_service.departments.refresh(db)
+    return True
+
+def get_employees_by_department(department_id: int, db: Session) -> list[dict]:
+    """Retrieve all employees that work in that department.
+
+    They are read like the filtered employee listing, with their department
+    and job title from the reference data cache.
+    """
+    return employee_service.get_all_employees(
+        db, EmployeeFilterSchema(department_id=department_id),
+    )
 
 def get_medium_salary_by_department(department_id: int, db: Session) -> float:
     """Calculate the average salary for a given department.
 
-    This function retrieves all employees in the specified department and calculates
-    the average of their most recent monthly salaries.
+    The average of the most recent monthly salaries of the employees in the
+    department is computed over the in-memory workforce snapshot.
 
     Args:
         department_id (int): The ID of the department.
@@ -89,30 +154,16 @@ def get_medium_salary_by_department(department_id: int, db: Session) -> float:
         Returns 0 if there are no employees or no salaries found.
 
     """
-    employees = get_employees_by_department(department_id, db)
-
-    if not employees:
-        return 0
-
-    total_salary = 0
-    total_employees = 0
-
-    for employee in employees:
-        last_salary = employee_service.get_active_salary(employee.id, db)
-
-        if last_salary:
-            total_salary += last_salary.monthly_income
-            total_employees += 1
-
-    if total_employees == 0:
-        return 0
-
-    return round(total_salary / total_employees, 2)
+    return analytics_service.group_mean(
+        db, "monthly_income", department_id=department_id)
 
 def get_average_performance_score_by_department(
                                 department_id: int, db: Session) -> float:
     """Calculate the average performance score for a given department.
 
+    The average of the latest review score of each employee in the department
+    is computed over the in-memory workforce snapshot.
+
     Args:
         department_id (int): The ID of the department.
         db (Session): The database session.
@@ -122,24 +173,5 @@ def get_average_performance_score_by_department(
         Returns 0 if there are no employees or no performance reviews.
 
     """
-    employees = get_employees_by_department(department_id, db)
-
-    if not employees:
-        return 0
-
-    total_score = 0
-    total_employees = 0
-
-
-    for employee in employees:
-        last_review = employee_service.get_latest_performance_review(employee.id, db)
-
-        if last_review:
-            total_score += last_review.score
-            total_employees += 1
-
-
-    if total_employees == 0:
-        return 0
-
-    return round(total_score / total_employees, 2)
+    return analytics_service.group_mean(
+        db, "review_score", department_id=department_id)
@@ -1,109 +1,628 @@
 """Provides services for managing employees in the database."""
 from __future__ import annotations
 
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import (
+    Column,
+    FromClause,
+    Row,
+    RowMapping,
+    Select,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from src.pwcexercise.config.write_queue import execute_write
+from src.pwcexercise.models.change import CHANGE_DELETE, CHANGE_INSERT, CHANGE_UPDATE
 from src.pwcexercise.models.employee import Employee
-from src.pwcexercise.models.performance_review import PerformanceReview
-from src.pwcexercise.models.salary import Salary
-from src.pwcexercise.schemas.employee import EmployeeCreateSchema, EmployeeSchema
+from src.pwcexercise.models.performance_review import (
+    PerformanceReview,
+    PerformanceReviewArchive,
+)
+from src.pwcexercise.models.salary import OPEN_END, Salary, SalaryArchive
+from src.pwcexercise.schemas.employee import (
+    EmployeeCreateSchema,
+    EmployeeFilterSchema,
+    EmployeeSchema,
+)
+from src.pwcexercise.services import reference_data_service
+from src.pwcexercise.services.analytics_service import workforce
+from src.pwcexercise.services.archive_service import review_history, salary_history
+from src.pwcexercise.services.change_log_service import record_changes
+from src.pwcexercise.services.payroll_service import closed_months
+from src.pwcexercise.services.salary_service import six_months_ago
+from src.pwcexercise.utils.lookup import lookup_rows
+
+
+IN_CHUNK_SIZE = 500
+
+# The hot per-employee lookups are built once with bound parameters, so a
+# call only binds its values: SQLAlchemy finds the compiled statement in its
+# cache without building or hashing a new one, and sqlite3 reuses the
+# prepared statement for the same SQL.
+_EMPLOYEE_BY_ID = select(Employee.__table__).where(
+    Employee.id == bindparam("employee_id"),
+)
+_ACTIVE_SALARY = (
+    select(Salary.__table__)
+    .where(Salary.employee_id == bindparam("employee_id"))
+    .order_by(Salary.effective_date.desc(), Salary.id.desc())
+    .limit(1)
+)
+_salary_history = salary_history()
+_SALARY_AS_OF = select(_salary_history).where(
+    _salary_history.c.employee_id == bindparam("employee_id"),
+    _salary_history.c.effective_to > bindparam("as_of"),
+    _salary_history.c.effective_date <= bindparam("as_of"),
+)
+_LATEST_PERFORMANCE_REVIEW = (
+    select(PerformanceReview.__table__)
+    .where(PerformanceReview.employee_id == bindparam("employee_id"))
+    .order_by(PerformanceReview.review_date.desc(), PerformanceReview.id.desc())
+    .limit(1)
+)
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def filtered_employees_statement(filters: EmployeeFilterSchema) -> Select:
+    """Compile listing filters, sorting and pagination into one statement.
+
+    Every filter is a range or equality on an indexed column; the emp_id
+    prefix is turned into a range so it can use ``ix_employees_emp_id``, and
+    the current salary is joined through ``ix_salaries_current_income``.
+
+    :param filters: Filters, sort key and page
+    :return: Statement selecting the matching employee rows
+    """
+    employees = Employee.__table__
+    statement = select(employees)
+    conditions = []
+    if filters.age_min is not None:
+        conditions.append(employees.c.age >= filters.age_min)
+    if filters.age_max is not None:
+        conditions.append(employees.c.age <= filters.age_max)
+    if filters.department_id is not None:
+        conditions.append(employees.c.department_id == filters.department_id)
+    if filters.job_title_id is not None:
+        conditions.append(employees.c.job_title_id == filters.job_title_id)
+    if filters.hired_from is not None:
+        conditions.append(employees.c.hire_date >= filters.hired_from)
+    if filters.hired_to is not None:
+        conditions.append(employees.c.hire_date <= filters.hired_to)
+    if filters.emp_id_prefix is not None:
+        conditions.append(employees.c.emp_id >= filters.emp_id_prefix)
+        conditions.append(
+            employees.c.emp_id < _prefix_upper_bound(filters.emp_id_prefix),
+        )
+
+    sort_key = filters.sort.lstrip("-")
+    needs_salary = (
+        filters.salary_min is not None
+        or filters.salary_max is not None
+        or sort_key == "salary"
+    )
+    if needs_salary:
+        current = Salary.__table__.alias("current_salary")
+        salary_range = [current.c.effective_to == OPEN_END]
+        if filters.salary_min is not None:
+            salary_range.append(current.c.monthly_income >= filters.salary_min)
+        if filters.salary_max is not None:
+            salary_range.append(current.c.monthly_income <= filters.salary_max)
+        filtered_by_salary = len(salary_range) > 1
+        statement = statement.join(
+            current,
+            and_(current.c.employee_id == employees.c.id, *salary_range),
+            isouter=not filtered_by_salary,
+        )
+
+    statement = statement.where(*conditions)
+    sort_column = (
+        current.c.monthly_income if sort_key == "salary" else employees.c[sort_key]
+    )
+    order = sort_column.desc() if filters.sort.startswith("-") else sort_column.asc()
+    statement = statement.order_by(order.nulls_last(), employees.c.id)
+    if filters.limit is not None:
+        statement = statement.limit(filters.limit)
+    if filters.offset:
+        statement = statement.offset(filters.offset)
+    return statement
+
+def _newest_rows(
+        statement: Select, table: FromClause, date_column: Column, limit: int,
+    ) -> Select:
+    """Keep only the newest ``limit`` rows of each employee selected by ``statement``.
+
+    The rows are ranked by ``date_column`` (the higher ID first on the same
+    day) with a window function, so it is still a single statement.
+    """
+    position = func.row_number().over(
+        partition_by=table.c.employee_id,
+        order_by=(date_column.desc(), table.c.id.desc()),
+    )
+    ranked = statement.add_columns(position.label("position")).subquery()
+    return (
+        select(*(ranked.c[column.name] for column in table.columns))
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.id)
+    )
+
+def _rows_by_employee(
+        db: Session,
+        table: FromClause,
+        employee_ids: list[int] | None,
+        date_column: Column | None = None,
+        history_limit: int | None = None,
+    ) -> dict[int, list[dict]]:
+    """Group the rows of ``table`` by employee, for some or all employees.
+
+    ``table`` is usually a history, hot and archived rows together. With
+    ``history_limit`` only the newest rows of each employee by
+    ``date_column`` are returned.
+    """
+    rows = defaultdict(list)
+    if employee_ids is None:
+        chunks = [select(table)]
+    else:
+        chunks = [
+            select(table).where(
+                table.c.employee_id.in_(employee_ids[i:i + IN_CHUNK_SIZE]),
+            )
+            for i in range(0, len(employee_ids), IN_CHUNK_SIZE)
+        ]
+    for statement in chunks:
+        if history_limit is None:
+            statement = statement.order_by(table.c.id)
+        else:
+            statement = _newest_rows(statement, table, date_column, history_limit)
+        for row in db.execute(statement).mappings():
+            rows[row["employee_id"]].append(dict(row))
+    return rows
+
+def get_all_employees(
+                db: Session,
+                filters: EmployeeFilterSchema | None = None,
+                history_limit: int | None = None,
+            ) -> list[dict]:
+    """Retrieve the employees from the database, optionally filtered.
+
+    The listing is read-only, so rows are fetched with Core statements and
+    mapped straight to response dicts instead of hydrating ORM instances.
+    When filters or a page are given, the nested salaries and reviews are
+    only loaded for the matching employees.
+
+    :param db: Database session
+    :param filters: Filters, sort key and page; None returns every employee
+    :param history_limit: Only nest the newest N salaries and reviews
+    :return: List of employees with their nested salaries and reviews
+    """
+    filters = filters or EmployeeFilterSchema()
+    rows = [
+        dict(row)
+        for row in db.execute(filtered_employees_statement(filters)).mappings()
+    ]
+    unfiltered = all(
+        getattr(filters, name) == field.default
+        for name, field in EmployeeFilterSchema.model_fields.items()
+        if name != "sort"
+    )
+    _attach_nested(
+        db, rows, None if unfiltered else [row["id"] for row in rows], history_limit,
+    )
+    return rows
+
+def _labelled(table: FromClause, prefix: str) -> list:
+    return [column.label(f"{prefix}_{column.name}") for column in table.columns]
+
+def _unlabelled(row: dict, table: FromClause, prefix: str) -> dict | None:
+    if row[f"{prefix}_id"] is None:
+        return None
+    return {column.name: row[f"{prefix}_{column.name}"] for column in table.columns}
+
+def get_employee_list_items(
+                db: Session, filters: EmployeeFilterSchema | None = None,
+            ) -> list[dict]:
+    """Retrieve the compact employee listing, optionally filtered.
+
+    One statement: the filtered listing joined to each employee's current
+    salary (``ix_salaries_employee_validity``) and latest performance review,
+    so the payload stays proportional to the headcount whatever the history.
+
+    :param db: Database session
+    :param filters: Filters, sort key and page; None returns every employee
+    :return: Dicts matching ``EmployeeListItemSchema``
+    """
+    filters = filters or EmployeeFilterSchema()
+    employees = Employee.__table__
+    reviews = PerformanceReview.__table__
+    current_salary = Salary.__table__.alias("listed_salary")
+    latest_review = reviews.alias("latest_review")
+
+    latest_review_id = (
+        select(reviews.c.id)
+        .where(reviews.c.employee_id == employees.c.id)
+        .order_by(reviews.c.review_date.desc(), reviews.c.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    statement = (
+        filtered_employees_statement(filters)
+        .add_columns(
+            *_labelled(current_salary, "salary"), *_labelled(latest_review, "review"),
+        )
+        .outerjoin(
+            current_salary,
+            and_(
+                current_salary.c.employee_id == employees.c.id,
+                current_salary.c.effective_to == OPEN_END,
+            ),
+        )
+        .outerjoin(latest_review, latest_review.c.id == latest_review_id)
+    )
+    items = []
+    for row in db.execute(statement).mappings():
+        item = {column.name: row[column.name] for column in employees.columns}
+        item["current_salary"] = _unlabelled(row, current_salary, "salary")
+        item["latest_performance_review"] = _unlabelled(row, latest_review, "review")
+        items.append(item)
+    return items
 
+def _attach_nested(
+        db: Session,
+        rows: list[dict],
+        employee_ids: list[int] | None,
+        history_limit: int | None = None,
+    ) -> None:
+    """Add salaries, reviews, department and job title to employee rows."""
+    salary_rows = salary_history()
+    review_rows = review_history()
+    salaries = _rows_by_employee(
+        db, salary_rows, employee_ids, salary_rows.c.effective_date, history_limit,
+    )
+    performance_reviews = _rows_by_employee(
+        db, review_rows, employee_ids, review_rows.c.review_date, history_limit,
+    )
+
+    for employee in rows:
+        employee["salaries"] = salaries.get(employee["id"], [])
+        employee["performance_reviews"] = performance_reviews.get(employee["id"], [])
+    _attach_references(db, rows)
+
+def lookup_employees(
+        db: Session,
+        ids: list[int] | None = None,
+        emp_ids: list[str] | None = None,
+        history_limit: int | None = None,
+    ) -> tuple[list[dict], list]:
+    """Retrieve several employees by internal ID or by ``emp_id``.
+
+    :param db: Database session
+    :param ids: Internal IDs to look up
+    :param emp_ids: Business keys to look up, used when ``ids`` is None
+    :param history_limit: Only nest the newest N salaries and reviews
+    :return: Employees in the order requested, and the keys not found
+    """
+    employees = Employee.__table__
+    if ids is not None:
+        rows, missing = lookup_rows(db, employees, employees.c.id, ids)
+    else:
+        rows, missing = lookup_rows(db, employees, employees.c.emp_id, emp_ids or [])
+    if rows:
+        _attach_nested(db, rows, [row["id"] for row in rows], history_limit)
+    return rows, missing
 
-def get_all_employees(db: Session) -> list:
-    """Retrieve all employees from the database.
+def get_employee_detail(
+        employee_id: int, db: Session, history_limit: int | None = None,
+    ) -> dict | None:
+    """Retrieve an employee with their nested salaries and reviews.
 
+    :param employee_id: ID of the employee
     :param db: Database session
-    :return: List of all employees
+    :param history_limit: Only nest the newest N salaries and reviews
+    :return: Dict matching ``EmployeeSchema``, or None if not found
     """
-    return db.query(Employee).all()
+    rows, _ = lookup_employees(db, ids=[employee_id], history_limit=history_limit)
+    return rows[0] if rows else None
+
+def _attach_references(db: Session, rows: list[dict]) -> None:
+    """Add the department and job title of employee rows from the reference cache."""
+    departments = reference_data_service.departments
+    job_titles = reference_data_service.job_titles
+    for employee in rows:
+        employee["department"] = departments.get(db, employee["department_id"])
+        employee["job_title"] = job_titles.get(db, employee["job_title_id"])
+
+def _employee_with_references(db: Session, row: RowMapping) -> dict:
+    """Build an employee dict with its department and job title from a row."""
+    employee = {column.name: row[column.name] for column in Employee.__table__.columns}
+    _attach_references(db, [employee])
+    return employee
 
-def create_employee(employee: EmployeeCreateSchema, db: Session) -> Employee:
-    """Create a new employee in the database.
+def _duplicate_emp_id(emp_id: str) -> ValueError:
+    return ValueError(f"An employee with emp_id '{emp_id}' already exists")
+
+def create_employee(employee: EmployeeCreateSchema, db: Session) -> dict:
+    """Create a new employee with one ``INSERT ... RETURNING``.
+
+    The department and job title of the response come from the reference
+    data cache, so it needs no other query.
 
     :param employee: Employee data
     :param db: Database session
     :return: The created employee
+    :raises ValueError: If another employee already has the emp_id
     """
-    new_employee = Employee(
-        emp_id=employee.emp_id,
-        age=employee.age,
-        department_id=employee.department_id,
-        hire_date=employee.hire_date,
-        job_title_id=employee.job_title_id,
-    )
-    db.add(new_employee)
-    db.commit()
-    db.refresh(new_employee)
+    employees = Employee.__table__
+
+    def write(session: Session) -> tuple[RowMapping, list[int]]:
+        new_employee = session.execute(
+            insert(employees).values(**employee.model_dump()).returning(*employees.c),
+        ).mappings().one()
+        return new_employee, record_changes(
+            session, employees, CHANGE_INSERT, [new_employee["id"]],
+        )
+
+    try:
+        row, seqs = execute_write(db, write)
+    except IntegrityError as error:
+        raise _duplicate_emp_id(employee.emp_id) from error
+    new_employee = _employee_with_references(db, row)
+    workforce.invalidate([new_employee["id"]])
+    closed_months.invalidate_from(new_employee["hire_date"], seqs)
     return new_employee
 
-def get_employee_by_id(employee_id: int, db: Session) -> Employee | None:
+def get_employee_by_id(employee_id: int, db: Session) -> Row | None:
     """Retrieve an employee by their ID.
 
     :param employee_id: ID of the employee
     :param db: Database session
-    :return: The employee with the given ID or None if not found
+    :return: The employee row with the given ID or None if not found
     """
-    return db.query(Employee).filter(Employee.id == employee_id).first()
+    return db.execute(_EMPLOYEE_BY_ID, {"employee_id": employee_id}).first()
 
 def update_employee(
                 employee_id: int, employee: EmployeeCreateSchema, db: Session,
-            ) -> Employee:
-    """Update an existing employee in the database.
+            ) -> dict | None:
+    """Update an existing employee with one ``UPDATE ... RETURNING``.
+
+    The department and job title of the response come from the reference
+    data cache; its salaries and reviews are read with one indexed query
+    each.
 
     :param employee_id: ID of the employee to update
     :param employee: Updated employee data
     :param db: Database session
     :return: The updated employee or None if not found
+    :raises ValueError: If another employee already has the emp_id
     """
-    db_employee = db.query(Employee).filter(Employee.id == employee_id).first()
-    if db_employee:
-        db_employee.emp_id = employee.emp_id
-        db_employee.age = employee.age
-        db_employee.department_id = employee.department_id
-        db_employee.hire_date = employee.hire_date
-        db_employee.job_title_id = employee.job_title_id
-        db.commit()
-        db.refresh(db_employee)
-    return db_employee
+    employees = Employee.__table__
+
+    def write(session: Session) -> tuple[RowMapping, list[int]] | None:
+        updated = session.execute(
+            update(employees)
+            .where(employees.c.id == employee_id)
+            .values(**employee.model_dump())
+            .returning(*employees.c),
+        ).mappings().first()
+        if updated is None:
+            return None
+        return updated, record_changes(
+            session, employees, CHANGE_UPDATE, [employee_id],
+        )
+
+    try:
+        result = execute_write(db, write)
+    except IntegrityError as error:
+        raise _duplicate_emp_id(employee.emp_id) from error
+    if result is None:
+        return None
+    updated, seqs = result
+    updated_employee = _employee_with_references(db, updated)
+    workforce.invalidate([employee_id])
+    closed_months.invalidate_from(None, seqs)
+    for history, key in (
+            (salary_history(), "salaries"),
+            (review_history(), "performance_reviews"),
+        ):
+        updated_employee[key] = _rows_by_employee(
+            db, history, [employee_id],
+        ).get(employee_id, [])
+    return updated_employee
 
 def delete_employee(employee_id: int, db: Session) -> bool:
-    """Delete an employee from the database.
+    """Delete an employee with their salaries and performance reviews.
+
+    The cascade the ORM used to run row by row is a ``DELETE`` per table,
+    the archives included, whose ``RETURNING`` names the rows logged to the
+    change feed; whether the employee existed comes from the last one.
 
     :param employee_id: ID of the employee to delete
     :param db: Database session
     :return: True if the employee was deleted, False otherwise
     """
-    db_employee = db.query(Employee).filter(Employee.id == employee_id).first()
-    if db_employee:
-        db.delete(db_employee)
-        db.commit()
-        return True
-    return False
-
-def get_active_salary(employee_id: int, db: Session) -> Salary:
+    employees = Employee.__table__
+
+    def write(session: Session) -> list[int] | None:
+        seqs = []
+        for table, logged_as in (
+                (Salary.__table__, Salary.__table__),
+                (SalaryArchive.__table__, Salary.__table__),
+                (PerformanceReview.__table__, PerformanceReview.__table__),
+                (PerformanceReviewArchive.__table__, PerformanceReview.__table__),
+            ):
+            seqs += record_changes(session, logged_as, CHANGE_DELETE, session.execute(
+                delete(table)
+                .where(table.c.employee_id == employee_id)
+                .returning(table.c.id),
+            ).scalars().all())
+        deleted = session.execute(
+            delete(employees)
+            .where(employees.c.id == employee_id)
+            .returning(employees.c.id),
+        ).first()
+        if deleted is None:
+            return None
+        return seqs + record_changes(session, employees, CHANGE_DELETE, [employee_id])
+
+    seqs = execute_write(db, write)
+    if seqs is None:
+        return False
+    workforce.invalidate([employee_id])
+    closed_months.invalidate_from(None, seqs)
+    return True
+
+def get_active_salary(
+                employee_id: int, db: Session, as_of: date | None = None,
+            ) -> Row | None:
     """Retrieve the active salary of an employee.
 
     :param employee_id: ID of the employee
     :param db: Database session
-    :return: The active salary of the employee
+    :param as_of: Return the salary that was active on this day instead,
+        archived or not
+    :return: The salary row, or None if the employee has none
     """
-    return (
-        db.query(Salary)
-        .filter(Salary.employee_id == employee_id)
-        .order_by(Salary.effective_date.desc())
-        .first()
-    )
+    if as_of is not None:
+        return db.execute(
+            _SALARY_AS_OF, {"employee_id": employee_id, "as_of": as_of},
+        ).first()
+    return db.execute(_ACTIVE_SALARY, {"employee_id": employee_id}).first()
 
-def get_latest_performance_review(employee_id: int, db: Session) -> PerformanceReview:
+def get_latest_performance_review(employee_id: int, db: Session) -> Row | None:
     """Retrieve the latest performance review of an employee.
 
     :param employee_id: ID of the employee
     :param db: Database session
-    :return: The latest performance review of the employee
+    :return: The latest performance review row, or None if there is none
     """
-    return (
-        db.query(PerformanceReview)
-        .filter(PerformanceReview.employee_id == employee_id)
-        .order_by(PerformanceReview.review_date.desc())
-        .first()
+    return db.execute(_LATEST_PERFORMANCE_REVIEW, {"employee_id": employee_id}).first()
+
+def get_employee_summary(employee_id: int, db: Session) -> dict | None:
+    """Retrieve an employee with the figures of their detail page.
+
+    Replaces the employee, active salary, latest performance review,
+    aguinaldo and hours worked routes with two statements: one for the
+    employee with their latest review, and one for the salaries the active
+    salary and the aguinaldo are taken from. The department and job title
+    come from the reference data cache, which may add its own version check
+    or reload. Every figure is computed like its own route does, ties on the
+    same date included, and the errors those routes would answer with are
+    returned under ``errors``.
+
+    :param employee_id: ID of the employee
+    :param db: Database session
+    :return: Dict matching ``EmployeeSummarySchema``, or None if not found
+    """
+    employees = Employee.__table__
+    reviews = PerformanceReview.__table__
+    salaries = Salary.__table__
+    latest_review = reviews.alias("latest_review")
+
+    latest_review_id = (
+        select(reviews.c.id)
+        .where(reviews.c.employee_id == employees.c.id)
+        .order_by(reviews.c.review_date.desc(), reviews.c.id.desc())
+        .limit(1)
+        .scalar_subquery()
     )
+    employee_row = db.execute(
+        select(
+            employees,
+            latest_review.c.id.label("review_id"),
+            latest_review.c.review_date,
+            latest_review.c.score,
+            latest_review.c.comments,
+        )
+        .select_from(
+            employees.outerjoin(latest_review, latest_review.c.id == latest_review_id),
+        )
+        .where(employees.c.id == employee_id),
+    ).mappings().first()
+    if employee_row is None:
+        return None
+
+    active_salary_id = (
+        select(salaries.c.id)
+        .where(salaries.c.employee_id == employee_id)
+        .order_by(salaries.c.effective_date.desc(), salaries.c.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    window_start = six_months_ago()
+    salary_rows = db.execute(
+        select(
+            salaries,
+            (salaries.c.id == active_salary_id).label("is_active"),
+            (salaries.c.effective_date >= window_start).label("in_window"),
+        ).where(
+            salaries.c.employee_id == employee_id,
+            or_(
+                salaries.c.id == active_salary_id,
+                salaries.c.effective_date >= window_start,
+            ),
+        ),
+    ).mappings().all()
+
+    summary = _employee_with_references(db, employee_row)
+    errors = {}
+
+    summary["latest_performance_review"] = None
+    if employee_row["review_id"] is None:
+        errors["latest_performance_review"] = {
+            "status_code": 404,
+            "detail": "This employee does not have any performance review",
+        }
+    else:
+        summary["latest_performance_review"] = {
+            "id": employee_row["review_id"],
+            "employee_id": employee_id,
+            "review_date": employee_row["review_date"],
+            "score": employee_row["score"],
+            "comments": employee_row["comments"],
+        }
+
+    salary_columns = [column.name for column in salaries.columns]
+    active = next((row for row in salary_rows if row["is_active"]), None)
+    summary["active_salary"] = None
+    summary["hours_worked"] = None
+    if active is None:
+        no_salary = {
+            "status_code": 404, "detail": "This employee does not have a salary",
+        }
+        errors["active_salary"] = no_salary
+        errors["hours_worked"] = no_salary
+    else:
+        summary["active_salary"] = {column: active[column] for column in salary_columns}
+        if active["hourly_rate"] is None:
+            summary["hours_worked"] = 0
+        elif active["hourly_rate"] > 0:
+            summary["hours_worked"] = round(
+                active["monthly_income"] / active["hourly_rate"], 2,
+            )
+        else:
+            errors["hours_worked"] = {"status_code": 400, "detail": "Invalid data"}
+
+    window = [row for row in salary_rows if row["in_window"]]
+    summary["aguinaldo"] = None
+    if window:
+        highest = max(window, key=lambda row: row["monthly_income"])
+        summary["aguinaldo"] = round(highest["monthly_income"] / 2, 2)
+    else:
+        errors["aguinaldo"] = {
+            "status_code": 404,
+            "detail": "This employee does not have any salary in the last six months",
+        }
+
+    summary["errors"] = errors
+    return summary
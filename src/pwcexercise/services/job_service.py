@@ -0,0 +1,354 @@
+"""Background jobs for reports that are too slow to compute inside a request.
+
+Jobs run on a bounded thread pool of the API process. Their status,
+progress, timing and result location are stored in the ``jobs`` table, so
+any worker process can answer a status poll; they are written through the
+write queue like every other write. Results are written as JSON files
+under ``JOB_DIR``; export jobs point at the manifest of the snapshot they
+wrote.
+
+A submission with the same kind and parameters as a job that is still
+queued or running returns that job instead of starting a new one. Pending
+jobs older than ``STALE_AFTER`` are ignored for deduplication, so a job left
+behind by a process that died does not block new submissions.
+
+``schedule_compaction`` keeps the change log bounded: at startup and then
+every ``COMPACTION_INTERVAL`` it submits a ``compact_changes`` job with the
+default retention, unless one was submitted within the interval, so several
+worker processes still compact about once per interval.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.pwcexercise.config.db import SessionLocal, engine
+from src.pwcexercise.config.write_queue import execute_write, queue_of
+from src.pwcexercise.exports import snapshot
+from src.pwcexercise.models.job import (
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    PENDING_STATUSES,
+    Job,
+)
+from src.pwcexercise.schemas.job import (
+    AggregateJobParams,
+    ArchiveJobParams,
+    CompactChangesJobParams,
+    ExportJobParams,
+    HistogramJobParams,
+    JobCreateSchema,
+    PayrollJobParams,
+)
+from src.pwcexercise.services import (
+    analytics_service,
+    archive_service,
+    change_log_service,
+    payroll_service,
+)
+from src.pwcexercise.utils.logger import logger
+
+JOB_DIR = Path("jobs")
+MAX_WORKERS = 2
+MAX_PENDING = 100
+STALE_AFTER = timedelta(hours=1)
+COMPACTION_INTERVAL = timedelta(hours=6)
+
+Report = Callable[[float], None]
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when too many jobs are already queued or running."""
+
+
+def _now() -> datetime:
+    return datetime.now(tz=timezone.utc).replace(tzinfo=None)
+
+
+def _run_aggregate(db: Session, params: AggregateJobParams, report: Report) -> dict:
+    analytics_service.workforce.frame(db)
+    report(0.5)
+    results = analytics_service.aggregate(
+        db, params.metric, params.agg, params.group_by, params.percentile,
+        params.department_id, params.job_title_id,
+    )
+    return {
+        "metric": params.metric, "agg": params.agg,
+        "group_by": params.group_by, "results": results,
+    }
+
+
+def _run_histogram(db: Session, params: HistogramJobParams, report: Report) -> dict:
+    analytics_service.workforce.frame(db)
+    report(0.5)
+    results = analytics_service.histogram(
+        db, params.metric, params.bins, params.group_by,
+    )
+    return {"metric": params.metric, "group_by": params.group_by, "results": results}
+
+
+def _run_payroll(db: Session, params: PayrollJobParams, report: Report) -> list:
+    return payroll_service.get_payroll_timeseries(
+        db, params.years, params.department_id,
+    )
+
+
+def _run_export(db: Session, params: ExportJobParams, report: Report) -> Path:
+    manifest = snapshot.export_snapshot(
+        engine, file_format=params.file_format, since=params.since,
+    )
+    return snapshot.EXPORT_DIR / manifest.snapshot_id / "manifest.json"
+
+
+def _run_archive(db: Session, params: ArchiveJobParams, report: Report) -> dict:
+    return archive_service.archive_history(
+        db, archive_service.archive_horizon(params.horizon_days),
+        params.batch_size, report,
+    )
+
+
+def _run_compact_changes(
+        db: Session, params: CompactChangesJobParams, report: Report,
+    ) -> dict:
+    return change_log_service.compact_changes(
+        db, params.retention_days, params.batch_size, report,
+    )
+
+
+JOB_KINDS: dict[str, tuple[type[BaseModel], Callable]] = {
+    "aggregate": (AggregateJobParams, _run_aggregate),
+    "histogram": (HistogramJobParams, _run_histogram),
+    "payroll_timeseries": (PayrollJobParams, _run_payroll),
+    "export": (ExportJobParams, _run_export),
+    "archive": (ArchiveJobParams, _run_archive),
+    "compact_changes": (CompactChangesJobParams, _run_compact_changes),
+}
+
+_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the pool of this process, created on first use.
+
+    Threads do not survive ``fork``, so every worker process of the launcher
+    creates its own pool.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_WORKERS, thread_name_prefix="job",
+            )
+        return _executor
+
+
+def _fingerprint(kind: str, params: dict) -> str:
+    encoded = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{kind}:{encoded}".encode()).hexdigest()
+
+
+def submit_job(job: JobCreateSchema, db: Session) -> tuple[Job, bool]:
+    """Queue a job, or return the pending job with the same parameters.
+
+    The lookup of a pending job and the insert of the new one are a single
+    write-queue mutation, so two identical submissions never both create a
+    job, even from different worker processes.
+
+    :param job: Kind and parameters of the job
+    :param db: Database session
+    :return: The job and whether it was created by this submission
+    """
+    model, _ = JOB_KINDS[job.kind]
+    params = model(**job.params).model_dump(mode="json")
+    fingerprint = _fingerprint(job.kind, params)
+
+    def write(session: Session) -> tuple[int, bool]:
+        fresh = _now() - STALE_AFTER
+        existing = (
+            session.query(Job.id)
+            .filter(
+                Job.fingerprint == fingerprint,
+                Job.status.in_(PENDING_STATUSES),
+                Job.created_at >= fresh,
+            )
+            .order_by(Job.id)
+            .first()
+        )
+        if existing is not None:
+            return existing.id, False
+        pending = (
+            session.query(func.count(Job.id))
+            .filter(Job.status.in_(PENDING_STATUSES), Job.created_at >= fresh)
+            .scalar()
+        )
+        if pending >= MAX_PENDING:
+            msg = f"Too many pending jobs ({pending}), try again later"
+            raise JobQueueFullError(msg)
+        new_job = Job(
+            kind=job.kind,
+            params=json.dumps(params, sort_keys=True),
+            fingerprint=fingerprint,
+            status=JOB_QUEUED,
+            progress=0.0,
+            created_at=_now(),
+        )
+        session.add(new_job)
+        session.flush()
+        return new_job.id, True
+
+    job_id, created = execute_write(db, write)
+    if created:
+        _get_executor().submit(_run, job_id, queue_of(db).session_factory)
+    return db.get(Job, job_id), created
+
+
+def _update_job(db: Session, job_id: int, **values: object) -> None:
+    """Write ``values`` to the job through the write queue."""
+    def write(session: Session) -> None:
+        session.execute(update(Job).where(Job.id == job_id).values(**values))
+
+    execute_write(db, write)
+
+
+def _run(job_id: int, session_factory: sessionmaker) -> None:
+    """Execute a queued job and record its outcome.
+
+    :param job_id: ID of the job
+    :param session_factory: Factory of the sessions of the job's database
+    """
+    with session_factory() as db:
+        job = db.get(Job, job_id)
+        model, handler = JOB_KINDS[job.kind]
+        params = model(**json.loads(job.params))
+        _update_job(db, job_id, status=JOB_RUNNING, started_at=_now())
+
+        def report(progress: float) -> None:
+            _update_job(
+                db, job_id, progress=round(min(max(progress, 0.0), 1.0), 3),
+            )
+
+        try:
+            outcome = handler(db, params, report)
+            if isinstance(outcome, Path):
+                result_path = outcome
+            else:
+                JOB_DIR.mkdir(parents=True, exist_ok=True)
+                result_path = JOB_DIR / f"job-{job_id}.json"
+                result_path.write_text(json.dumps(jsonable_encoder(outcome)))
+        except Exception as error:
+            logger.exception("Job %d failed", job_id)
+            _update_job(
+                db, job_id,
+                status=JOB_FAILED,
+                error=str(error) or type(error).__name__,
+                finished_at=_now(),
+            )
+            return
+
+        _update_job(
+            db, job_id,
+            status=JOB_SUCCEEDED,
+            progress=1.0,
+            result_path=result_path.as_posix(),
+            finished_at=_now(),
+        )
+
+
+def compact_changes_if_due(
+        db: Session, interval: timedelta = COMPACTION_INTERVAL,
+    ) -> Job | None:
+    """Submit a ``compact_changes`` job unless one was submitted within ``interval``.
+
+    :param db: Database session
+    :param interval: Shortest time between two compactions
+    :return: The job submitted, or None if a recent one makes it unnecessary
+    """
+    recent = (
+        db.query(Job.id)
+        .filter(Job.kind == "compact_changes", Job.created_at >= _now() - interval)
+        .first()
+    )
+    if recent is not None:
+        return None
+    job, _ = submit_job(JobCreateSchema(kind="compact_changes"), db)
+    return job
+
+
+def schedule_compaction(
+        session_factory: sessionmaker = SessionLocal,
+        interval: timedelta = COMPACTION_INTERVAL,
+    ) -> threading.Event:
+    """Compact the change log now and every ``interval`` from a daemon thread.
+
+    :param session_factory: Factory of the sessions of the database to compact
+    :param interval: Time between two checks
+    :return: Event stopping the schedule when set
+    """
+    stop = threading.Event()
+
+    def loop() -> None:
+        while True:
+            try:
+                with session_factory() as db:
+                    compact_changes_if_due(db, interval)
+            except Exception:
+                logger.exception("Could not schedule the change log compaction")
+            if stop.wait(interval.total_seconds()):
+                return
+
+    threading.Thread(target=loop, name="compaction-schedule", daemon=True).start()
+    return stop
+
+
+def get_job(job_id: int, db: Session) -> Job | None:
+    """Retrieve a job by its ID.
+
+    :param job_id: ID of the job
+    :param db: Database session
+    :return: The job or None if not found
+    """
+    return db.query(Job).filter(Job.id == job_id).first()
+
+
+def describe_job(job: Job) -> dict:
+    """Return the status of a job with its parameters decoded.
+
+    :param job: The job
+    :return: Dict matching ``JobSchema``
+    """
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "params": json.loads(job.params),
+        "status": job.status,
+        "progress": job.progress,
+        "error": job.error,
+        "result_url": (
+            f"/jobs/{job.id}/result" if job.status == JOB_SUCCEEDED else None
+        ),
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def job_result_file(job: Job) -> Path | None:
+    """Return the result file of a finished job, or None if there is none."""
+    if job.status != JOB_SUCCEEDED or job.result_path is None:
+        return None
+    path = Path(job.result_path)
+    return path if path.is_file() else None
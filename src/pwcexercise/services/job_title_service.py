@@ -1,57 +1,117 @@
 """Provides services for managing job titles in the database."""
 
+from sqlalchemy import Row, delete, insert, update
 from sqlalchemy.orm import Session
 
+from src.pwcexercise.config.write_queue import execute_write
+from src.pwcexercise.models.change import CHANGE_DELETE, CHANGE_INSERT, CHANGE_UPDATE
 from src.pwcexercise.models.employee import Employee
 from src.pwcexercise.models.job_title import JobTitle
+from src.pwcexercise.schemas.employee import EmployeeFilterSchema
 from src.pwcexercise.schemas.job_title import JobTitleCreateSchema
-from src.pwcexercise.services import employee_service
+from src.pwcexercise.services import (
+    analytics_service,
+    employee_service,
+    reference_data_service,
+)
+from src.pwcexercise.services.change_log_service import record_changes
+from src.pwcexercise.services.reference_data_service import bump_version
 
 
 def get_all_job_titles(db: Session) -> list:
-    """Retrieve all job titles from the database."""
-    return db.query(JobTitle).all()
-
-def create_job_title(job_title: JobTitleCreateSchema, db: Session) -> JobTitle:
-    """Create a new job title in the database."""
-    new_job_title = JobTitle(name=job_title.name)
-    db.add(new_job_title)
-    db.commit()
-    db.refresh(new_job_title)
+    """Retrieve all job titles from the reference data cache."""
+    return list(reference_data_service.job_titles.all(db))
+
+def create_job_title(job_title: JobTitleCreateSchema, db: Session) -> dict:
+    """Create a new job title with one ``INSERT ... RETURNING``."""
+    job_titles = JobTitle.__table__
+
+    def write(session: Session) -> dict:
+        new_job_title = session.execute(
+            insert(job_titles)
+            .values(**job_title.model_dump())
+            .returning(*job_titles.c),
+        ).mappings().one()
+        bump_version(session, job_titles)
+        record_changes(session, job_titles, CHANGE_INSERT, [new_job_title["id"]])
+        return dict(new_job_title)
+
+    new_job_title = execute_write(db, write)
+    reference_data_service.job_titles.refresh(db)
     return new_job_title
 
-def get_job_title_by_id(job_title_id: int, db: Session) -> JobTitle:
-    """Retrieve a job title by ID."""
-    return db.query(JobTitle).filter(JobTitle.id == job_title_id).first()
+def get_job_title_by_id(job_title_id: int, db: Session) -> Row | None:
+    """Retrieve a job title by ID from the reference data cache."""
+    return reference_data_service.job_titles.get(db, job_title_id)
 
 def update_job_title(
                 job_title_id: int, job_title: JobTitleCreateSchema,
                 db: Session,
-            ) -> JobTitle:
-    """Update an existing job title."""
-    db_job_title = db.query(JobTitle).filter(JobTitle.id == job_title_id).first()
-    if db_job_title:
-        db_job_title.name = job_title.name
-        db.commit()
-        db.refresh(db_job_title)
-    return db_job_title
+            ) -> dict | None:
+    """Update an existing job title with one ``UPDATE ... RETURNING``."""
+    job_titles = JobTitle.__table__
+
+    def write(session: Session) -> dict | None:
+        updated = session.execute(
+            update(job_titles)
+            .where(job_titles.c.id == job_title_id)
+            .values(**job_title.model_dump())
+            .returning(*job_titles.c),
+        ).mappings().first()
+        if updated is None:
+            return None
+        bump_version(session, job_titles)
+        record_changes(session, job_titles, CHANGE_UPDATE, [updated["id"]])
+        return dict(updated)
+
+    updated = execute_write(db, write)
+    if updated is None:
+        return None
+    reference_data_service.job_titles.refresh(db)
+    return updated
 
 def delete_job_title(job_title_id: int, db: Session) -> bool:
-    """Delete a job title from the database."""
-    db_job_title = db.query(JobTitle).filter(JobTitle.id == job_title_id).first()
-    if db_job_title:
-        db.delete(db_job_title)
-        db.commit()
-        return True
-    return False
-
-def get_employees_by_job_title(job_title_id: int, db: Session) -> list:
-    """Retrieve all employees with the specified job title."""
-    return db.query(Employee).filter(Employee.job_title_id == job_title_id).all()
+    """Delete a job title, leaving its employees without one as the ORM cascade did."""
+    employees = Employee.__table__
+    job_titles = JobTitle.__table__
+
+    def write(session: Session) -> tuple[list[int], bool]:
+        detached = session.execute(
+            update(employees)
+            .where(employees.c.job_title_id == job_title_id)
+            .values(job_title_id=None)
+            .returning(employees.c.id),
+        ).scalars().all()
+        deleted = session.execute(
+            delete(job_titles)
+            .where(job_titles.c.id == job_title_id)
+            .returning(job_titles.c.id),
+        ).first()
+        record_changes(session, employees, CHANGE_UPDATE, detached)
+        if deleted is not None:
+            bump_version(session, job_titles)
+            record_changes(session, job_titles, CHANGE_DELETE, [deleted[0]])
+        return list(detached), deleted is not None
+
+    detached, deleted = execute_write(db, write)
+    analytics_service.workforce.invalidate(detached)
+    if not deleted:
+        return False
+    reference_data_service.job_titles.refresh(db)
+    return True
+
+def get_employees_by_job_title(job_title_id: int, db: Session) -> list[dict]:
+    """Retrieve all employees with the specified job title, like the listing does."""
+    return employee_service.get_all_employees(
+        db, EmployeeFilterSchema(job_title_id=job_title_id),
+    )
 
 def get_medium_salary_by_job_title(job_title_id: int, db: Session) -> float:
     """Calculate the average (medium) salary for employees with a specific job title.
 
+    The average of the most recent monthly salaries is computed over the
+    in-memory workforce snapshot.
+
     Args:
         job_title_id (int): The ID of the job title to filter employees by.
         db (Session): The database session used to query the database.
@@ -62,29 +122,15 @@ def get_medium_salary_by_job_title(job_title_id: int, db: Session) -> float:
                if no salary records are found.
 
     """
-    employees = get_employees_by_job_title(job_title_id, db)
-
-    if not employees:
-        return 0
-
-    total_salary = 0
-    total_employees = 0
-    for employee in employees:
-
-        latest_salary = employee_service.get_active_salary(employee.id, db)
-
-        if latest_salary:
-            total_salary += latest_salary.monthly_income
-            total_employees += 1
-
-    if total_employees == 0:
-        return 0
-
-    return round(total_salary / total_employees, 2)
+    return analytics_service.group_mean(
+        db, "monthly_income", job_title_id=job_title_id)
 
 def get_average_performance_score_by_job_title(job_title_id: int, db: Session) -> float:
     """Calculate the average performance score for employees with a specific job title.
 
+    The average of the latest review score of each employee is computed over
+    the in-memory workforce snapshot.
+
     Args:
         job_title_id (int): The ID of the job title to filter employees by.
         db (Session): The database session to use for querying.
@@ -95,20 +141,5 @@ def get_average_performance_score_by_job_title(job_title_id: int, db: Session) -
         are found.
 
     """
-    employees = db.query(Employee).filter(Employee.job_title_id == job_title_id).all()
-
-    if not employees:
-        return 0
-
-    total_score = 0
-    total_reviews = 0
-    for employee in employees:
-        latest_review = employee_service.get_latest_performance_review(employee.id, db)
-        if latest_review:
-            total_score += latest_review.score
-            total_reviews += 1
-
-    if total_reviews == 0:
-        return 0
-
-    return round(total_score / total_reviews, 2)
+    return analytics_service.group_mean(
+        db, "review_score", job_title_id=job_title_id)
@@ -0,0 +1,228 @@
+"""Live workforce metrics pushed to dashboards as Server-Sent Events.
+
+Dashboards used to poll the salary averages and the department aggregates,
+each poll recomputing the same numbers. Instead, one ``MetricsBroadcaster``
+per process watches the change feed: every ``POLL_INTERVAL`` seconds it
+reads the latest sequence number, a primary key lookup, and only when it
+moved it refreshes the workforce snapshot rows those changes touched,
+computes the metrics once and, if they differ from the last event, encodes
+one event that is handed to every subscriber. Writes of other worker
+processes are seen the same way, and a burst of writes costs at most one
+computation per interval. The broadcaster only runs while someone listens.
+
+Every event carries the complete metrics, so a client only needs the
+latest. Each subscriber has a bounded queue: when a slow client has not
+taken the pending event, it is replaced by the newer one instead of piling
+up, and a client that has not taken any event for ``SLOW_CLIENT_TIMEOUT``
+seconds is dropped. At most ``MAX_CONNECTIONS`` clients are served per
+process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from src.pwcexercise.config.db import SessionLocal
+from src.pwcexercise.services import (
+    analytics_service,
+    change_log_service,
+    reference_data_service,
+    salary_service,
+)
+from src.pwcexercise.utils.logger import logger
+
+MAX_CONNECTIONS = 500
+QUEUE_SIZE = 1
+POLL_INTERVAL = 0.5
+HEARTBEAT_INTERVAL = 15.0
+SLOW_CLIENT_TIMEOUT = 30.0
+RETRY_MS = 5000
+
+
+class TooManySubscribersError(RuntimeError):
+    """Raised when the process already serves ``MAX_CONNECTIONS`` streams."""
+
+
+def compute_metrics(db: Session) -> dict:
+    """Compute the metrics of the dashboards, as their polled routes do.
+
+    :return: The current and historic average salary and, per department,
+        its name, headcount, average salary and average review score
+    """
+    departments: dict[int, dict] = {}
+    for metric, key in (
+            ("monthly_income", "medium_salary"),
+            ("review_score", "average_performance_score"),
+        ):
+        for result in analytics_service.aggregate(
+                db, metric, "mean", "department_id",
+            ):
+            department = departments.setdefault(result["group"], {
+                "department_id": result["group"],
+                "medium_salary": 0,
+                "average_performance_score": 0,
+            })
+            department[key] = round(result["value"], 2)
+            if metric == "monthly_income":
+                department["headcount"] = result["count"]
+    for department in departments.values():
+        reference = reference_data_service.departments.get(
+            db, department["department_id"],
+        )
+        department["name"] = None if reference is None else reference.name
+        department.setdefault("headcount", 0)
+    return {
+        "current_average": salary_service.get_current_average_salary(db),
+        "historic_average": salary_service.get_historic_average_salary(db),
+        "departments": [departments[key] for key in sorted(departments)],
+    }
+
+
+def _event(seq: int, metrics: dict) -> bytes:
+    data = json.dumps(jsonable_encoder(metrics), separators=(",", ":"))
+    return f"id: {seq}\nevent: metrics\ndata: {data}\n\n".encode()
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """One connected client and its queue of pending events."""
+
+    queue: asyncio.Queue = field(
+        default_factory=lambda: asyncio.Queue(QUEUE_SIZE),
+    )
+    waiting_since: float | None = None
+    dropped: int = 0
+
+
+class MetricsBroadcaster:
+    """Compute the live metrics once per change and fan them out to subscribers."""
+
+    def __init__(
+            self,
+            session_factory: sessionmaker = SessionLocal,
+            max_connections: int = MAX_CONNECTIONS,
+            poll_interval: float = POLL_INTERVAL,
+        ) -> None:
+        """Create a broadcaster; it starts polling with the first subscriber."""
+        self.session_factory = session_factory
+        self.max_connections = max_connections
+        self.poll_interval = poll_interval
+        self._subscribers: set[Subscriber] = set()
+        self._task: asyncio.Task | None = None
+        self._seq: int | None = None
+        self._metrics: dict | None = None
+        self._event: bytes | None = None
+
+    @property
+    def subscribers(self) -> int:
+        """Number of connected clients."""
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscriber:
+        """Register a client; it first receives the latest event, if any.
+
+        :raises TooManySubscribersError: If ``max_connections`` are connected
+        """
+        if len(self._subscribers) >= self.max_connections:
+            msg = f"Too many metric streams ({self.max_connections}), retry later"
+            raise TooManySubscribersError(msg)
+        subscriber = Subscriber()
+        self._subscribers.add(subscriber)
+        if self._event is not None:
+            self._offer(subscriber, self._event, time.monotonic())
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Forget a client; the polling stops with the last one."""
+        self._subscribers.discard(subscriber)
+
+    def _offer(self, subscriber: Subscriber, event: bytes, now: float) -> None:
+        """Queue ``event`` for ``subscriber``, replacing an event it has not taken."""
+        if subscriber.queue.full():
+            subscriber.queue.get_nowait()
+            subscriber.dropped += 1
+            if now - subscriber.waiting_since > SLOW_CLIENT_TIMEOUT:
+                logger.info("Dropping a metrics stream that stopped reading")
+                self.unsubscribe(subscriber)
+                subscriber.queue.put_nowait(None)
+                return
+        else:
+            subscriber.waiting_since = now
+        subscriber.queue.put_nowait(event)
+
+    def _publish(self, event: bytes) -> None:
+        self._event = event
+        now = time.monotonic()
+        for subscriber in list(self._subscribers):
+            self._offer(subscriber, event, now)
+
+    def _poll(self) -> bytes | None:
+        """Recompute the metrics if anything changed; runs in a worker thread."""
+        with self.session_factory() as db:
+            seq = change_log_service.latest_seq(db)
+            if seq == self._seq and self._metrics is not None:
+                return None
+            metrics = compute_metrics(db)
+            self._seq = seq
+            if metrics == self._metrics:
+                return None
+            self._metrics = metrics
+            return _event(seq, metrics)
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            try:
+                event = await run_in_threadpool(self._poll)
+            except Exception:
+                logger.exception("Could not compute the live workforce metrics")
+                event = None
+            if event is not None:
+                self._publish(event)
+            await asyncio.sleep(self.poll_interval)
+        # Idle: the next subscriber must not be sent metrics gone stale.
+        self._metrics = None
+        self._event = None
+
+    async def stream(
+            self, subscriber: Subscriber, last_event_id: str | None = None,
+        ) -> AsyncIterator[bytes]:
+        """Yield the SSE byte stream of ``subscriber`` until it disconnects.
+
+        :param subscriber: Client registered with ``subscribe``
+        :param last_event_id: ``Last-Event-ID`` of a reconnecting client; the
+            event it already has is not sent again
+        """
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode()
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscriber.queue.get(), HEARTBEAT_INTERVAL,
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if event is None:
+                    return
+                subscriber.waiting_since = None
+                if last_event_id is not None and event.startswith(
+                        f"id: {last_event_id}\n".encode()):
+                    last_event_id = None
+                    continue
+                last_event_id = None
+                yield event
+        finally:
+            self.unsubscribe(subscriber)
+
+
+broadcaster = MetricsBroadcaster()
@@ -0,0 +1,248 @@
+"""Monthly payroll totals and headcount per department over history.
+
+Each month is represented by its last day. The payroll of a month is the
+sum of the monthly incomes in effect on that day, taken from the salary
+validity intervals, and the headcount is the number of employees hired on
+or before it. Employees are attributed to their current department.
+
+Both series are computed with a single sweep over sorted events: every
+salary adds its income at the first month it covers and removes it at the
+first month it no longer covers, and a cumulative sum turns those deltas
+into totals. Two range queries load the data, however many months are asked.
+
+Months that are over cannot change unless history is rewritten, so their
+points are cached. Writes that touch past dates drop the cached months from
+that date on. Before every call the cache also follows the change feed for
+the writes of other processes: it drops the months from the earliest
+effective date of the salaries changed, and from the hire date or first
+salary of the employees changed, since employees count in their current
+department. A change to a row that no longer exists drops every month.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.salary import Salary
+from src.pwcexercise.services.archive_service import salary_history
+from src.pwcexercise.services.change_log_service import ChangeCursor, ChangedRows
+
+MAX_YEARS = 50
+
+Point = tuple[float, int]
+
+
+def _today() -> date:
+    return datetime.now(tz=timezone.utc).date()
+
+
+class ClosedMonthCache:
+    """Payroll points of months that are over, keyed by month end."""
+
+    def __init__(self) -> None:
+        """Create an empty cache."""
+        self._months: dict[date, dict[int | None, Point]] = {}
+        self._changes = ChangeCursor((Employee.__tablename__, Salary.__tablename__))
+        self._lock = threading.Lock()
+
+    def sync(self, db: Session) -> None:
+        """Drop the months affected by other processes' writes since the last call.
+
+        :param db: Database session of the call about to read the cache
+        """
+        with self._lock:
+            changed = self._changes.poll(db)
+            if changed is None:
+                self._months.clear()
+            elif any(changed.values()):
+                self._drop_from(_earliest_change(db, changed))
+
+    def get(self, month_end: date) -> dict[int | None, Point] | None:
+        """Return the cached points of a month, or None."""
+        with self._lock:
+            return self._months.get(month_end)
+
+    def put(self, month_end: date, points: dict[int | None, Point]) -> None:
+        """Cache the points of a closed month."""
+        with self._lock:
+            self._months[month_end] = points
+
+    def invalidate_from(
+            self, day: date | None = None, seqs: Iterable[int] = (),
+        ) -> None:
+        """Drop the months ending on or after ``day`` after a write of this process.
+
+        :param day: Earliest day the write affected; None drops everything
+        :param seqs: Changes logged by the write, left out of the next sync
+        """
+        with self._lock:
+            self._changes.skip(seqs)
+            self._drop_from(day)
+
+    def _drop_from(self, day: date | None) -> None:
+        if day is None:
+            self._months.clear()
+            return
+        for month_end in [m for m in self._months if m >= day]:
+            del self._months[month_end]
+
+
+def _earliest_change(db: Session, changed: ChangedRows) -> date | None:
+    """Return the first day the changed employees and salaries can have affected.
+
+    :return: The day, or None if a changed row no longer exists
+    """
+    history = salary_history()
+    salary_ids = changed[Salary.__tablename__]
+    employee_ids = changed[Employee.__tablename__]
+    days = []
+    if salary_ids:
+        found = db.execute(
+            select(history.c.effective_date).where(history.c.id.in_(salary_ids)),
+        ).scalars().all()
+        if len(found) < len(salary_ids):
+            return None
+        days += found
+    if employee_ids:
+        found = db.execute(
+            select(Employee.hire_date).where(Employee.id.in_(employee_ids)),
+        ).scalars().all()
+        if len(found) < len(employee_ids):
+            return None
+        days += found
+        days.append(db.execute(
+            select(func.min(history.c.effective_date))
+            .where(history.c.employee_id.in_(employee_ids)),
+        ).scalar())
+    return min((day for day in days if day is not None), default=date.max)
+
+
+closed_months = ClosedMonthCache()
+
+
+def _month_ends(years: int, today: date) -> list[date]:
+    """Return the last day of each month of the last ``years`` years."""
+    current = pd.Timestamp(today).to_period("M")
+    periods = pd.period_range(end=current, periods=years * 12, freq="M")
+    return [period.end_time.date() for period in periods]
+
+
+def _sweep(db: Session, points: list[date]) -> dict[date, dict[int | None, Point]]:
+    """Compute payroll and headcount at each of ``points`` in one pass."""
+    first, last = points[0], points[-1]
+    history = salary_history()
+    salaries = (
+        select(
+            Employee.department_id, history.c.effective_date,
+            history.c.effective_to, history.c.monthly_income,
+        )
+        .join(Employee, Employee.id == history.c.employee_id)
+        .where(history.c.effective_to > first, history.c.effective_date <= last)
+    )
+    hires = select(Employee.department_id, Employee.hire_date).where(
+        Employee.hire_date.is_not(None), Employee.hire_date <= last,
+    )
+    salary_rows = db.execute(salaries).all()
+    hire_rows = db.execute(hires).all()
+
+    departments = sorted(
+        {row[0] for row in salary_rows} | {row[0] for row in hire_rows},
+        key=lambda key: (key is None, key),
+    )
+    department_index = {key: i for i, key in enumerate(departments)}
+    axis = np.array(points, dtype="datetime64[D]")
+    payroll = np.zeros((len(departments), len(points) + 1))
+    headcount = np.zeros((len(departments), len(points) + 1), dtype="int64")
+
+    if salary_rows:
+        rows = np.array(salary_rows, dtype=object)
+        index = np.array([department_index[key] for key in rows[:, 0]])
+        starts = np.searchsorted(axis, rows[:, 1].astype("datetime64[D]"))
+        ends = np.searchsorted(axis, rows[:, 2].astype("datetime64[D]"))
+        income = rows[:, 3].astype("float64")
+        np.add.at(payroll, (index, starts), income)
+        np.add.at(payroll, (index, ends), -income)
+
+    if hire_rows:
+        rows = np.array(hire_rows, dtype=object)
+        index = np.array([department_index[key] for key in rows[:, 0]])
+        starts = np.searchsorted(axis, rows[:, 1].astype("datetime64[D]"))
+        np.add.at(headcount, (index, starts), 1)
+
+    payroll = np.cumsum(payroll, axis=1)[:, :-1]
+    headcount = np.cumsum(headcount, axis=1)[:, :-1]
+    return {
+        point: {
+            key: (round(float(payroll[i, p]), 2), int(headcount[i, p]))
+            for key, i in department_index.items()
+        }
+        for p, point in enumerate(points)
+    }
+
+
+def get_payroll_timeseries(
+        db: Session,
+        years: int = 5,
+        department_id: int | None = None,
+    ) -> list[dict]:
+    """Return monthly payroll totals and headcount per department.
+
+    :param db: Database session
+    :param years: How many years of history, ending with the current month
+    :param department_id: Only return this department
+    :return: One dict per department with its monthly points, oldest first
+    """
+    if not 1 <= years <= MAX_YEARS:
+        msg = f"years must be between 1 and {MAX_YEARS}"
+        raise ValueError(msg)
+    today = _today()
+    month_ends = _month_ends(years, today)
+    first_open = today.replace(day=1)
+    closed_months.sync(db)
+
+    results: dict[date, dict[int | None, Point]] = {}
+    missing = []
+    for month_end in month_ends:
+        cached = closed_months.get(month_end) if month_end < first_open else None
+        if cached is None:
+            missing.append(month_end)
+        else:
+            results[month_end] = cached
+
+    if missing:
+        # The open month is measured up to today, not at its future month end.
+        points = [min(month_end, today) for month_end in missing]
+        swept = _sweep(db, points)
+        for month_end, point in zip(missing, points):
+            results[month_end] = swept[point]
+            if month_end < first_open:
+                closed_months.put(month_end, swept[point])
+
+    departments = sorted(
+        {key for points in results.values() for key in points},
+        key=lambda key: (key is None, key),
+    )
+    if department_id is not None:
+        departments = [key for key in departments if key == department_id]
+    return [
+        {
+            "department_id": key,
+            "points": [
+                {
+                    "month": month_end.strftime("%Y-%m"),
+                    "payroll": results[month_end].get(key, (0.0, 0))[0],
+                    "headcount": results[month_end].get(key, (0.0, 0))[1],
+                }
+                for month_end in month_ends
+            ],
+        }
+        for key in departments
+    ]
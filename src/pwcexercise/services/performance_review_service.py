@@ -1,73 +1,263 @@
 """Module providing services for managing performance reviews."""
+from __future__ import annotations
 
+from datetime import date
+
+from sqlalchemy import (
+    Row,
+    Select,
+    Table,
+    bindparam,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    table,
+    union_all,
+    update,
+)
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
-from src.pwcexercise.models.performance_review import PerformanceReview
+from src.pwcexercise.config.write_queue import execute_write
+from src.pwcexercise.models.change import CHANGE_DELETE, CHANGE_INSERT, CHANGE_UPDATE
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.performance_review import (
+    ARCHIVE_FTS_TABLE,
+    FTS_TABLE,
+    PerformanceReview,
+    PerformanceReviewArchive,
+)
 from src.pwcexercise.schemas.performance_review import PerformanceReviewCreateSchema
+from src.pwcexercise.services.analytics_service import workforce
+from src.pwcexercise.services.archive_service import (
+    restore_latest_review,
+    restore_reviews,
+    review_history,
+)
+from src.pwcexercise.services.change_log_service import record_changes
+from src.pwcexercise.utils.lookup import lookup_rows
 
+# Built once like the hot lookups of employee_service.
+_review_history = review_history()
+_PERFORMANCE_REVIEW_BY_ID = select(_review_history).where(
+    _review_history.c.id == bindparam("performance_review_id"),
+)
 
-def get_all_performance_reviews(db: Session) -> list:
-    """Retrieve all performance reviews from the database."""
-    return db.query(PerformanceReview).all()
+def get_all_performance_reviews(db: Session) -> list[dict]:
+    """Retrieve all performance reviews, archived ones included, as row dicts."""
+    history = review_history()
+    return [
+        dict(row)
+        for row in db.execute(select(history).order_by(history.c.id)).mappings()
+    ]
 
 
 def create_performance_review(
                             performance_review: PerformanceReviewCreateSchema,
                             db: Session,
-                        ) -> PerformanceReview:
-    """Create a new performance review in the database."""
-    new_performance_review = PerformanceReview(
-        employee_id=performance_review.employee_id,
-        review_date=performance_review.review_date,
-        score=performance_review.score,
-        comments=performance_review.comments,
-    )
-    db.add(new_performance_review)
-    db.commit()
-    db.refresh(new_performance_review)
+                        ) -> dict:
+    """Create a new performance review with one ``INSERT ... RETURNING``."""
+    reviews = PerformanceReview.__table__
+
+    def write(session: Session) -> dict:
+        new_review = dict(session.execute(
+            insert(reviews)
+            .values(**performance_review.model_dump())
+            .returning(*reviews.c),
+        ).mappings().one())
+        record_changes(session, reviews, CHANGE_INSERT, [new_review["id"]])
+        return new_review
+
+    new_performance_review = execute_write(db, write)
+    workforce.invalidate([new_performance_review["employee_id"]])
     return new_performance_review
 
 
 def get_performance_review_by_id(
                             performance_review_id: int, db: Session,
-                        ) -> PerformanceReview:
-    """Retrieve a performance review by ID."""
-    return (
-        db.query(PerformanceReview)
-        .filter(PerformanceReview.id == performance_review_id)
-        .first()
-    )
+                        ) -> Row | None:
+    """Retrieve a performance review by ID, archived or not."""
+    return db.execute(
+        _PERFORMANCE_REVIEW_BY_ID, {"performance_review_id": performance_review_id},
+    ).first()
+
+
+def lookup_performance_reviews(
+                            db: Session, ids: list[int],
+                        ) -> tuple[list[dict], list[int]]:
+    """Retrieve several performance reviews by ID, in the order requested.
+
+    :return: The reviews found and the IDs not found
+    """
+    history = review_history()
+    return lookup_rows(db, history, history.c.id, ids)
 
 
 def update_performance_review(
                             performance_review_id: int,
                             performance_review: PerformanceReviewCreateSchema,
                             db: Session,
-                        ) -> PerformanceReview:
-    """Update a performance review in the database by ID."""
-    performance_review_data = (
-        db.query(PerformanceReview)
-        .filter(PerformanceReview.id == performance_review_id)
-        .first()
-    )
-    if performance_review_data:
-        for key, value in performance_review.dict(exclude_unset=True).items():
-            setattr(performance_review_data, key, value)
+                        ) -> dict | None:
+    """Update a performance review by ID with one ``UPDATE ... RETURNING``.
+
+    An archived review is restored to the hot table first. When the review
+    moves to another employee or an earlier day, the previous employee's
+    latest review is restored if it was archived.
 
-        db.commit()
-        db.refresh(performance_review_data)
+    :return: The updated review, or None if there is no review with that ID
+    """
+    reviews = PerformanceReview.__table__
+
+    def write(session: Session) -> dict | None:
+        previous = session.execute(
+            select(reviews.c.employee_id, reviews.c.review_date)
+            .where(reviews.c.id == performance_review_id),
+        ).first()
+        if previous is None:
+            restored = restore_reviews(session, [performance_review_id])
+            if not restored:
+                return None
+            previous = (restored[0]["employee_id"], restored[0]["review_date"])
+        updated = dict(session.execute(
+            update(reviews)
+            .where(reviews.c.id == performance_review_id)
+            .values(**performance_review.model_dump(exclude_unset=True))
+            .returning(*reviews.c),
+        ).mappings().one())
+        if (
+            updated["employee_id"] != previous[0]
+            or updated["review_date"] < previous[1]
+        ):
+            restore_latest_review(session, [previous[0]])
+        record_changes(session, reviews, CHANGE_UPDATE, [performance_review_id])
+        return updated
+
+    performance_review_data = execute_write(db, write)
+    if performance_review_data is None:
+        return None
+    workforce.invalidate(
+        [performance_review_data["employee_id"]], review_id=performance_review_id,
+    )
     return performance_review_data
 
 
 def delete_performance_review(performance_review_id: int, db: Session) -> bool:
-    """Delete a performance review from the database by ID."""
-    performance_review = (
-        db.query(PerformanceReview)
-        .filter(PerformanceReview.id == performance_review_id)
-        .first()
+    """Delete a performance review by ID with one ``DELETE ... RETURNING``.
+
+    An archived review is deleted from the archive. Deleting a hot review
+    restores the employee's latest review if it was archived.
+    """
+    reviews = PerformanceReview.__table__
+    archive = PerformanceReviewArchive.__table__
+
+    def write(session: Session) -> int | None:
+        employee_id = session.execute(
+            delete(reviews)
+            .where(reviews.c.id == performance_review_id)
+            .returning(reviews.c.employee_id),
+        ).scalar()
+        if employee_id is not None:
+            restore_latest_review(session, [employee_id])
+        else:
+            employee_id = session.execute(
+                delete(archive)
+                .where(archive.c.id == performance_review_id)
+                .returning(archive.c.employee_id),
+            ).scalar()
+        if employee_id is not None:
+            record_changes(session, reviews, CHANGE_DELETE, [performance_review_id])
+        return employee_id
+
+    employee_id = execute_write(db, write)
+    if employee_id is None:
+        return False
+    workforce.invalidate([employee_id])
+    return True
+
+
+def _search_statement(
+        reviews: Table,
+        fts_table: str,
+        query: str,
+        employee_id: int | None,
+        department_id: int | None,
+        date_from: date | None,
+        date_to: date | None,
+    ) -> Select:
+    """Select the reviews of ``reviews`` matching ``query`` in ``fts_table``."""
+    fts = table(fts_table, column("rowid"), column("rank"))
+    statement = (
+        select(
+            reviews,
+            func.snippet(literal_column(fts_table), 0, "[", "]", "...", 12)
+            .label("snippet"),
+            fts.c.rank,
+        )
+        .join(fts, fts.c.rowid == reviews.c.id)
+        .where(literal_column(fts_table).op("MATCH")(query))
     )
-    if performance_review:
-        db.delete(performance_review)
-        db.commit()
-        return True
-    return False
+    if employee_id is not None:
+        statement = statement.where(reviews.c.employee_id == employee_id)
+    if department_id is not None:
+        employees = Employee.__table__
+        statement = statement.join(
+            employees, employees.c.id == reviews.c.employee_id,
+        ).where(employees.c.department_id == department_id)
+    if date_from is not None:
+        statement = statement.where(reviews.c.review_date >= date_from)
+    if date_to is not None:
+        statement = statement.where(reviews.c.review_date <= date_to)
+    return statement
+
+
+def search_performance_reviews(
+                            query: str,
+                            db: Session,
+                            employee_id: int | None = None,
+                            department_id: int | None = None,
+                            date_from: date | None = None,
+                            date_to: date | None = None,
+                            limit: int = 20,
+                            offset: int = 0,
+                        ) -> list[dict]:
+    """Search the comments of the performance reviews, archived ones included.
+
+    ``query`` uses the FTS5 query syntax: words, "phrases", ``prefix*``,
+    ``AND``/``OR``/``NOT`` and ``NEAR``. Results are ordered by relevance
+    (BM25), best first. The hot and archived reviews have one full-text
+    index each and their matches are merged by rank.
+
+    :param query: Full-text query
+    :param db: Database session
+    :param employee_id: Only reviews of this employee
+    :param department_id: Only reviews of employees in this department
+    :param date_from: Only reviews on or after this day
+    :param date_to: Only reviews on or before this day
+    :param limit: Maximum number of results
+    :param offset: Number of results to skip
+    :return: Matching reviews with a highlighted snippet and their rank
+    :raises ValueError: If the query is not valid FTS5 syntax
+    """
+    filters = (query, employee_id, department_id, date_from, date_to)
+    matches = union_all(
+        _search_statement(PerformanceReview.__table__, FTS_TABLE, *filters),
+        _search_statement(
+            PerformanceReviewArchive.__table__, ARCHIVE_FTS_TABLE, *filters,
+        ),
+    )
+    statement = (
+        matches
+        .order_by(matches.selected_columns.rank, matches.selected_columns.id)
+        .limit(limit)
+        .offset(offset)
+    )
+
+    try:
+        return [dict(row) for row in db.execute(statement).mappings()]
+    except OperationalError as error:
+        db.rollback()
+        msg = f"Invalid search query: {error.orig}"
+        raise ValueError(msg) from error
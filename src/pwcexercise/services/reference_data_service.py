@@ -0,0 +1,138 @@
+"""Process-wide cache of the reference tables, departments and job titles.
+
+Both tables are tiny and almost never change, but used to be read on every
+listing, every 404 check of their sub-routes and for every employee in a
+response. Each is now held as an immutable snapshot: its rows in ID order
+and a read-only mapping by ID, tagged with the version of the table.
+
+The version is a counter in ``reference_versions``, bumped by
+``bump_version`` in the transaction of every write to the table. After
+committing, the writer reloads the snapshot of its own process. Every
+process compares its version with the database's at most every
+``VERSION_CHECK_INTERVAL`` seconds, and at once when a lookup misses, so a
+row created by another worker is found right away and a rename or delete is
+seen within the interval.
+
+Snapshots are replaced, never modified, so readers take no lock.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from sqlalchemy import Row, Table, bindparam, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.department import Department
+from src.pwcexercise.models.job_title import JobTitle
+from src.pwcexercise.models.reference_version import ReferenceVersion
+
+VERSION_CHECK_INTERVAL = 1.0
+
+_versions = ReferenceVersion.__table__
+_VERSION = select(_versions.c.version).where(
+    _versions.c.table_name == bindparam("table_name"),
+)
+
+
+def bump_version(session: Session, table: Table) -> None:
+    """Count a write to ``table`` in the current transaction.
+
+    :param session: Session of the write, committed by the caller
+    :param table: Reference table written
+    """
+    statement = insert(_versions).values(table_name=table.name, version=1)
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[_versions.c.table_name],
+        set_={"version": _versions.c.version + 1},
+    ))
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """Rows of a reference table at a version; treat it as read-only."""
+
+    version: int
+    rows: tuple[Row, ...]
+    by_id: Mapping[int, Row]
+
+    def get(self, row_id: int | None) -> Row | None:
+        """Return the row with ``row_id``, or None."""
+        return None if row_id is None else self.by_id.get(row_id)
+
+
+class ReferenceTable:
+    """Read-through snapshot cache of one reference table."""
+
+    def __init__(
+            self, table: Table, check_interval: float = VERSION_CHECK_INTERVAL,
+        ) -> None:
+        """Create an empty cache of ``table`` that is loaded on first use."""
+        self.table = table
+        self.check_interval = check_interval
+        self._rows = select(table).order_by(table.c.id)
+        self._snapshot: ReferenceSnapshot | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _version(self, db: Session) -> int:
+        return db.execute(_VERSION, {"table_name": self.table.name}).scalar() or 0
+
+    def _load(self, db: Session, version: int) -> ReferenceSnapshot:
+        # The version is read before the rows: a write in between leaves
+        # newer rows under an older version, which only costs one more load.
+        rows = tuple(db.execute(self._rows))
+        self._snapshot = ReferenceSnapshot(
+            version, rows, MappingProxyType({row.id: row for row in rows}),
+        )
+        self._checked_at = time.monotonic()
+        return self._snapshot
+
+    def snapshot(self, db: Session, check: bool = False) -> ReferenceSnapshot:
+        """Return the cached snapshot, reloading it if the table changed.
+
+        :param db: Database session used to check the version and reload
+        :param check: Check the version now instead of when the interval ends
+        :return: The latest snapshot
+        """
+        snapshot = self._snapshot
+        due = time.monotonic() - self._checked_at >= self.check_interval
+        if snapshot is not None and not check and not due:
+            return snapshot
+        with self._lock:
+            version = self._version(db)
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version == version:
+                self._checked_at = time.monotonic()
+                return snapshot
+            return self._load(db, version)
+
+    def refresh(self, db: Session) -> ReferenceSnapshot:
+        """Reload the snapshot after a write of this process has committed."""
+        with self._lock:
+            return self._load(db, self._version(db))
+
+    def all(self, db: Session) -> tuple[Row, ...]:
+        """Return every row in ID order."""
+        return self.snapshot(db).rows
+
+    def get(self, db: Session, row_id: int | None) -> Row | None:
+        """Return the row with ``row_id``; a miss checks the version first."""
+        row = self.snapshot(db).get(row_id)
+        if row is None and row_id is not None:
+            row = self.snapshot(db, check=True).get(row_id)
+        return row
+
+    def reset(self) -> None:
+        """Drop the snapshot so the next read loads the table again."""
+        with self._lock:
+            self._snapshot = None
+
+
+departments = ReferenceTable(Department.__table__)
+job_titles = ReferenceTable(JobTitle.__table__)
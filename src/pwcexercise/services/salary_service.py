@@ -1,73 +1,306 @@
 """Provides services for managing salaries in the database."""
-from datetime import datetime, timedelta, timezone
+from __future__ import annotations
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, timezone
 
-from src.pwcexercise.models.salary import Salary
+from sqlalchemy import (
+    ColumnElement,
+    FromClause,
+    Row,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.orm import Session, aliased
+
+from src.pwcexercise.config.write_queue import execute_write
+from src.pwcexercise.models.change import CHANGE_DELETE, CHANGE_INSERT, CHANGE_UPDATE
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.salary import OPEN_END, Salary, SalaryArchive
 from src.pwcexercise.schemas.salary import SalaryCreateSchema
+from src.pwcexercise.services.analytics_service import workforce
+from src.pwcexercise.services.archive_service import restore_salaries, salary_history
+from src.pwcexercise.services.change_log_service import record_changes
+from src.pwcexercise.services.payroll_service import closed_months
+from src.pwcexercise.utils.lookup import lookup_rows
 from src.pwcexercise.utils.logger import logger
 
 
-def get_all_salaries(db: Session) -> list:
-    """Retrieve all salaries from the database."""
-    return db.query(Salary).all()
+# Built once like the hot lookups of employee_service.
+_salary_history = salary_history()
+_SALARY_BY_ID = select(_salary_history).where(
+    _salary_history.c.id == bindparam("salary_id"),
+)
+_HIGHEST_SALARY_SINCE = (
+    select(Salary.__table__)
+    .where(
+        Salary.employee_id == bindparam("employee_id"),
+        Salary.effective_date >= bindparam("since"),
+    )
+    .order_by(Salary.monthly_income.desc())
+    .limit(1)
+)
+
+def valid_on(as_of: date, salaries: FromClause | None = None) -> ColumnElement[bool]:
+    """Condition selecting the salaries in effect on ``as_of``.
+
+    Uses the ``effective_date``/``effective_to`` validity interval, so it is
+    a range scan on ``ix_salaries_validity`` (and its archive counterpart).
+
+    :param as_of: The day to look at
+    :param salaries: Table or history to select from, ``salaries`` by default
+    """
+    salaries = Salary.__table__ if salaries is None else salaries
+    return and_(salaries.c.effective_to > as_of, salaries.c.effective_date <= as_of)
 
-def create_salary(salary: SalaryCreateSchema, db: Session) -> Salary:
-    """Create a new salary in the database."""
-    new_salary = Salary(
-        employee_id=salary.employee_id,
-        monthly_income=salary.monthly_income,
-        hourly_rate=salary.hourly_rate,
-        effective_date=salary.effective_date,
+def refresh_validity_intervals(
+        db: Session, employee_ids: Iterable[int | None] | None = None,
+    ) -> list[int]:
+    """Recompute ``effective_to`` of the salaries of the given employees.
+
+    Each salary ends where the next salary of the same employee starts; for
+    salaries starting on the same day the one with the highest ID wins. Only
+    the salaries whose interval changes are written. The change is flushed
+    but not committed, so it joins the caller's transaction.
+
+    :param db: Database session
+    :param employee_ids: Employees to recompute, or None for every employee
+    :return: IDs of the salaries whose ``effective_to`` changed
+    """
+    later = aliased(Salary)
+    next_start = (
+        select(func.min(later.effective_date))
+        .where(
+            later.employee_id == Salary.employee_id,
+            or_(
+                later.effective_date > Salary.effective_date,
+                and_(later.effective_date == Salary.effective_date,
+                     later.id > Salary.id),
+            ),
+        )
+        .scalar_subquery()
     )
-    db.add(new_salary)
-    db.commit()
-    db.refresh(new_salary)
+    effective_to = func.coalesce(next_start, OPEN_END)
+    statement = (
+        update(Salary)
+        .where(Salary.effective_to.is_distinct_from(effective_to))
+        .values(effective_to=effective_to)
+        .returning(Salary.id)
+    )
+    if employee_ids is not None:
+        employee_ids = {i for i in employee_ids if i is not None}
+        if not employee_ids:
+            return []
+        statement = statement.where(Salary.employee_id.in_(employee_ids))
+    return db.execute(
+        statement.execution_options(synchronize_session=False),
+    ).scalars().all()
+
+def get_all_salaries(db: Session, as_of: date | None = None) -> list[dict]:
+    """Retrieve all salaries, archived ones included, as plain row dicts.
+
+    :param db: Database session
+    :param as_of: Only return the salaries in effect on this day
+    """
+    history = salary_history()
+    statement = select(history).order_by(history.c.id)
+    if as_of is not None:
+        statement = statement.where(valid_on(as_of, history))
+    return [dict(row) for row in db.execute(statement).mappings()]
+
+def get_salaries_as_of(
+        as_of: date,
+        db: Session,
+        employee_ids: list[int] | None = None,
+        department_id: int | None = None,
+    ) -> list[dict]:
+    """Retrieve the salary each employee had on a given day.
+
+    :param as_of: The day to look at
+    :param db: Database session
+    :param employee_ids: Only these employees
+    :param department_id: Only the employees of this department
+    :return: One row dict per employee that had a salary on ``as_of``
+    """
+    salaries = salary_history()
+    statement = (
+        select(salaries)
+        .where(valid_on(as_of, salaries))
+        .order_by(salaries.c.employee_id)
+    )
+    if employee_ids is not None:
+        statement = statement.where(salaries.c.employee_id.in_(employee_ids))
+    if department_id is not None:
+        statement = statement.join(
+            Employee.__table__, Employee.id == salaries.c.employee_id,
+        ).where(Employee.department_id == department_id)
+    return [dict(row) for row in db.execute(statement).mappings()]
+
+def create_salary(salary: SalaryCreateSchema, db: Session) -> dict:
+    """Create a new salary in the database.
+
+    One ``INSERT ... RETURNING`` plus the validity interval refresh; the
+    returned row is the response, nothing is read back. Archived salaries
+    whose interval the new one may cut are restored first.
+    """
+    salaries = Salary.__table__
+
+    def write(session: Session) -> tuple[dict, list[int]]:
+        new_salary = session.execute(
+            insert(salaries).values(**salary.model_dump()).returning(*salaries.c),
+        ).mappings().one()
+        restore_salaries(
+            session, [new_salary["employee_id"]], new_salary["effective_date"],
+        )
+        changed = refresh_validity_intervals(session, [new_salary["employee_id"]])
+        seqs = record_changes(session, salaries, CHANGE_INSERT, [new_salary["id"]])
+        seqs += record_changes(
+            session, salaries, CHANGE_UPDATE,
+            [i for i in changed if i != new_salary["id"]],
+        )
+        return dict(new_salary), seqs
+
+    new_salary, seqs = execute_write(db, write)
+    workforce.invalidate([new_salary["employee_id"]])
+    closed_months.invalidate_from(new_salary["effective_date"], seqs)
     return new_salary
 
-def get_salary_by_id(salary_id: int, db: Session) -> Salary:
-    """Retrieve a salary by ID."""
-    return db.query(Salary).filter(Salary.id == salary_id).first()
+def get_salary_by_id(salary_id: int, db: Session) -> Row | None:
+    """Retrieve a salary by ID, archived or not."""
+    return db.execute(_SALARY_BY_ID, {"salary_id": salary_id}).first()
 
-def update_salary(salary_id: int, salary: SalaryCreateSchema, db: Session) -> Salary:
-    """Update a salary in the database by ID."""
-    db.query(Salary).filter(Salary.id == salary_id).update(salary.dict())
-    db.commit()
-    return db.query(Salary).filter(Salary.id == salary_id).first()
+def lookup_salaries(db: Session, ids: list[int]) -> tuple[list[dict], list[int]]:
+    """Retrieve several salaries by ID, in the order requested.
 
-def delete_salary(salary_id: int, db: Session) -> bool:
-    """Delete a salary from the database by ID."""
-    salary = db.query(Salary).filter(Salary.id == salary_id).first()
-    if salary:
-        db.delete(salary)
-        db.commit()
-        return True
-    return False
-
-def get_highest_salary_in_last_six_months(employee_id: int, db: Session) -> Salary:
-    """Retrieve the highest salary in the last six months for the given employee."""
-    six_months_ago = datetime.now(tz=timezone.utc) - timedelta(days=180)
-
-    salaries = db.query(Salary).filter(
-        Salary.employee_id == employee_id,
-        Salary.effective_date >= six_months_ago,
-    ).all()
-
-    if not salaries:
+    :return: The salaries found and the IDs not found
+    """
+    history = salary_history()
+    return lookup_rows(db, history, history.c.id, ids)
+
+def update_salary(
+                salary_id: int, salary: SalaryCreateSchema, db: Session,
+            ) -> dict | None:
+    """Update a salary in the database by ID.
+
+    The salary may move to another employee or date, so its previous holder
+    and date are read first: both employees' validity intervals and the
+    payroll months from the earlier date need refreshing, and their archived
+    salaries from that date on, the updated one included, are restored. The
+    update itself is one ``UPDATE ... RETURNING``.
+    """
+    salaries = Salary.__table__
+    history = salary_history()
+
+    def write(session: Session) -> tuple[dict, int, date, list[int]] | None:
+        previous = session.execute(
+            select(history.c.employee_id, history.c.effective_date)
+            .where(history.c.id == salary_id),
+        ).first()
+        if previous is None:
+            return None
+        restore_salaries(
+            session, [previous[0], salary.employee_id],
+            min(previous[1], salary.effective_date),
+        )
+        updated = session.execute(
+            update(salaries)
+            .where(salaries.c.id == salary_id)
+            .values(**salary.model_dump())
+            .returning(*salaries.c),
+        ).mappings().one()
+        changed = refresh_validity_intervals(
+            session, [previous[0], salary.employee_id],
+        )
+        seqs = record_changes(
+            session, salaries, CHANGE_UPDATE, [salary_id, *changed],
+        )
+        return dict(updated), *previous, seqs
+
+    result = execute_write(db, write)
+    if result is None:
         return None
+    updated, previous_employee_id, previous_effective_date, seqs = result
+    workforce.invalidate(
+        [previous_employee_id, salary.employee_id], salary_id=salary_id,
+    )
+    closed_months.invalidate_from(
+        min(filter(None, [previous_effective_date, salary.effective_date])), seqs,
+    )
+    return updated
+
+def delete_salary(salary_id: int, db: Session) -> bool:
+    """Delete a salary from the database by ID with one ``DELETE ... RETURNING``.
 
-    return max(salaries, key=lambda s: s.monthly_income)
+    An archived salary is deleted from the archive. The previous salary of
+    the employee takes over its interval, so it is restored if archived.
+    """
+    def write(session: Session) -> tuple[int, date, list[int]] | None:
+        for salaries in (Salary.__table__, SalaryArchive.__table__):
+            deleted = session.execute(
+                delete(salaries)
+                .where(salaries.c.id == salary_id)
+                .returning(salaries.c.employee_id, salaries.c.effective_date),
+            ).first()
+            if deleted is not None:
+                break
+        else:
+            return None
+        restore_salaries(session, [deleted[0]], deleted[1])
+        seqs = record_changes(session, Salary.__table__, CHANGE_DELETE, [salary_id])
+        seqs += record_changes(
+            session, Salary.__table__, CHANGE_UPDATE,
+            refresh_validity_intervals(session, [deleted[0]]),
+        )
+        return *deleted, seqs
+
+    deleted = execute_write(db, write)
+    if deleted is None:
+        return False
+    employee_id, effective_date, seqs = deleted
+    workforce.invalidate([employee_id])
+    closed_months.invalidate_from(effective_date, seqs)
+    return True
+
+def six_months_ago() -> datetime:
+    """Return the start of the window the aguinaldo is computed over."""
+    return datetime.now(tz=timezone.utc) - timedelta(days=180)
+
+def get_highest_salary_in_last_six_months(employee_id: int, db: Session) -> Row | None:
+    """Retrieve the highest salary in the last six months for the given employee.
+
+    Only reads the hot table: the archive horizon is always older than six
+    months.
+    """
+    return db.execute(
+        _HIGHEST_SALARY_SINCE,
+        {"employee_id": employee_id, "since": six_months_ago()},
+    ).first()
 
 def get_historic_average_salary(db: Session) -> float:
-    """Get the average salary from the database."""
-    avg_salary = db.query(Salary).with_entities(
-        func.avg(Salary.monthly_income),
-    ).scalar()
+    """Get the average of every salary, archived ones included."""
+    history = salary_history()
+    avg_salary = db.execute(select(func.avg(history.c.monthly_income))).scalar()
     return avg_salary if avg_salary is not None else 0.0
 
-def get_current_average_salary(db: Session) -> float:
-    """Get the average of the most recent salary for each employee."""
+def get_current_average_salary(db: Session, as_of: date | None = None) -> float:
+    """Get the average of the most recent salary for each employee.
+
+    :param db: Database session
+    :param as_of: Average the salaries in effect on this day instead
+    """
+    if as_of is not None:
+        history = salary_history()
+        avg_salary = db.execute(
+            select(func.avg(history.c.monthly_income)).where(valid_on(as_of, history)),
+        ).scalar()
+        return avg_salary if avg_salary is not None else 0.0
+
     subquery = (
         db.query(Salary.employee_id, func.max(Salary.effective_date).label("max_date"))
         .group_by(Salary.employee_id)
@@ -0,0 +1,63 @@
+"""Median and percentile statistics of the current monthly salaries.
+
+They are computed exactly from the current salaries held in the workforce
+snapshot of ``analytics_service``, which follows every write. The snapshot
+is already in memory, so selecting the values of a group and partitioning
+them costs about as much as reading a quantile sketch would; exact answers
+need no error bound and no structure to keep up to date.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.services.analytics_service import workforce
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+def _exact(values: np.ndarray, percentiles: list[float]) -> dict:
+    return {
+        "count": int(values.size),
+        "percentiles": {
+            f"p{p:g}": float(np.quantile(values, p / 100, method="inverted_cdf"))
+            for p in percentiles
+        },
+    }
+
+
+def get_salary_percentiles(
+        db: Session,
+        percentiles: list[float] | None = None,
+        department_id: int | None = None,
+        job_title_id: int | None = None,
+    ) -> dict | None:
+    """Return exact percentiles of the current monthly incomes.
+
+    At most one of ``department_id`` and ``job_title_id`` may be given; with
+    neither the statistics are company-wide.
+
+    :param db: Database session
+    :param percentiles: Percentiles in [0, 100], by default p50, p90 and p99
+    :param department_id: Restrict to the employees of this department
+    :param job_title_id: Restrict to the employees with this job title
+    :return: Count and percentiles, or None when there are no salaries
+    """
+    if department_id is not None and job_title_id is not None:
+        msg = "Filter by department or by job title, not both"
+        raise ValueError(msg)
+    percentiles = list(percentiles or DEFAULT_PERCENTILES)
+    if any(not 0 <= p <= 100 for p in percentiles):
+        msg = "Percentiles must be between 0 and 100"
+        raise ValueError(msg)
+
+    frame = workforce.frame(db)
+    if department_id is not None:
+        frame = frame[frame["department_id"] == department_id]
+    elif job_title_id is not None:
+        frame = frame[frame["job_title_id"] == job_title_id]
+    values = frame["monthly_income"].dropna().to_numpy()
+    if values.size == 0:
+        return None
+    return {**_exact(values, percentiles), "exact": True, "rank_error": 0.0}
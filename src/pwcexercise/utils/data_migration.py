@@ -0,0 +1,259 @@
+"""Chunked, resumable data migrations for Alembic revisions.
+
+Alembic runs a migration in one transaction, and a statement that rewrites
+a whole table holds the SQLite write lock until it commits, so the API
+cannot write for as long as the table takes. ``backfill`` instead commits
+the migration so far and rewrites the table in batches of primary keys,
+each in its own short transaction. Between batches it sleeps for at least
+``pause`` seconds and long enough that it holds the lock no more than
+``duty_cycle`` of the time, so the write queue of the API gets its turn.
+
+After each batch the last key done is saved in ``data_migrations`` in the
+same transaction, so an interrupted upgrade resumes where it stopped when
+it is run again. The checkpoint is deleted when the backfill ends. The
+table is created on first use and left out of autogenerate. Progress is
+logged and passed to ``report``.
+
+A backfill only covers the rows that exist when it starts, and batches may
+be applied twice after a crash, so:
+
+- Write the statement so that running it again is harmless.
+- Make the code writing new rows fill the new columns before running it.
+- Guard the schema changes before it with ``has_column``, since they are
+  committed when the backfill starts and are not undone if it fails.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from alembic import op
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    bindparam,
+    func,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+
+# A child of alembic's logger, so alembic's logging configuration shows it.
+logger = logging.getLogger("alembic.data_migration")
+
+BATCH_SIZE = 1000
+PAUSE = 0.05
+DUTY_CYCLE = 0.5
+LOCK_RETRIES = 20
+LOG_EVERY = 5.0
+
+CHECKPOINT_TABLE = "data_migrations"
+
+# Owned by the migrations themselves, not by the application models.
+checkpoints = Table(
+    CHECKPOINT_TABLE,
+    MetaData(),
+    Column("name", String(128), primary_key=True),
+    Column("last_key", Integer, nullable=False),
+    Column("high_water", Integer, nullable=False),
+    Column("rows", Integer, nullable=False),
+    Column("total", Integer, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Batch = Callable[[Connection, int, int], object]
+
+
+@dataclass(frozen=True)
+class Progress:
+    """Progress of a backfill after a batch."""
+
+    name: str
+    last_key: int
+    high_water: int
+    rows: int
+    total: int
+    elapsed: float
+
+    @property
+    def fraction(self) -> float:
+        """Share of the rows done, between 0 and 1."""
+        return 1.0 if self.total == 0 else min(self.rows / self.total, 1.0)
+
+
+def has_column(table: str, column: str) -> bool:
+    """Return whether ``table`` has ``column``, to guard a resumed revision."""
+    columns = inspect(op.get_bind()).get_columns(table)
+    return any(existing["name"] == column for existing in columns)
+
+
+def _now() -> datetime:
+    return datetime.now(tz=timezone.utc).replace(tzinfo=None)
+
+
+def _in_transaction(connection: Connection, work: Callable[[], object]) -> object:
+    """Run ``work`` in a write transaction, waiting for the lock if the API holds it."""
+    for attempt in range(LOCK_RETRIES):
+        try:
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+        except OperationalError as error:
+            if "locked" not in str(error) or attempt == LOCK_RETRIES - 1:
+                raise
+            time.sleep(PAUSE * (attempt + 1))
+            continue
+        try:
+            result = work()
+        except BaseException:
+            connection.exec_driver_sql("ROLLBACK")
+            raise
+        connection.exec_driver_sql("COMMIT")
+        return result
+    return None  # pragma: no cover - the last attempt raises
+
+
+def run_batches(
+        connection: Connection,
+        name: str,
+        table: str,
+        batch: str | Batch,
+        key: str = "id",
+        batch_size: int = BATCH_SIZE,
+        pause: float = PAUSE,
+        duty_cycle: float = DUTY_CYCLE,
+        report: Callable[[Progress], None] | None = None,
+    ) -> int:
+    """Apply ``batch`` to ``table`` in ranges of ``key``, committing each one.
+
+    :param connection: Connection in autocommit mode, outside any transaction
+    :param name: Unique name of the backfill, used for its checkpoint
+    :param table: Table to walk
+    :param batch: SQL statement, or function of the connection, run for the
+        keys in ``(:low, :high]``
+    :param key: Integer primary key of ``table``
+    :param batch_size: Rows per batch
+    :param pause: Shortest sleep between batches, in seconds
+    :param duty_cycle: Largest share of the time spent holding the lock
+    :param report: Called with the ``Progress`` after each batch
+    :return: The number of rows walked
+    """
+    checkpoints.create(connection, checkfirst=True)
+    walked = Table(table, MetaData(), Column(key, Integer, primary_key=True))
+    keys = walked.c[key]
+    statement = text(batch) if isinstance(batch, str) else None
+    window = (
+        select(keys).where(keys > bindparam("low")).order_by(keys)
+        .limit(batch_size).subquery()
+    )
+    next_high = select(func.max(window.c[key]))
+
+    saved = connection.execute(
+        select(checkpoints).where(checkpoints.c.name == name),
+    ).mappings().first()
+    if saved is None:
+        last_key, rows = 0, 0
+        high_water = connection.execute(select(func.max(keys))).scalar() or 0
+        total = connection.execute(select(func.count()).select_from(walked)).scalar()
+    else:
+        last_key, rows = saved["last_key"], saved["rows"]
+        high_water, total = saved["high_water"], saved["total"]
+        logger.info("%s: resuming after %s %d", name, key, last_key)
+
+    start = logged = time.monotonic()
+    while last_key < high_water:
+        high = connection.execute(next_high, {"low": last_key}).scalar()
+        if high is None:
+            break
+        high = min(high, high_water)
+        count = connection.execute(
+            select(func.count()).select_from(walked)
+            .where(keys > last_key, keys <= high),
+        ).scalar()
+
+        def apply(low: int = last_key, high: int = high, count: int = count) -> None:
+            if statement is not None:
+                connection.execute(statement, {"low": low, "high": high})
+            else:
+                batch(connection, low, high)
+            connection.execute(
+                insert(checkpoints)
+                .values(
+                    name=name, last_key=high, high_water=high_water,
+                    rows=rows + count, total=total, updated_at=_now(),
+                )
+                .on_conflict_do_update(
+                    index_elements=[checkpoints.c.name],
+                    set_={"last_key": high, "rows": rows + count,
+                          "updated_at": _now()},
+                ),
+            )
+
+        began = time.monotonic()
+        _in_transaction(connection, apply)
+        held = time.monotonic() - began
+        last_key, rows = high, rows + count
+
+        progress = Progress(
+            name, last_key, high_water, rows, total, time.monotonic() - start,
+        )
+        if report is not None:
+            report(progress)
+        if time.monotonic() - logged >= LOG_EVERY:
+            logged = time.monotonic()
+            logger.info(
+                "%s: %d/%d rows (%.0f%%), %.0f rows/s", name, rows, total,
+                progress.fraction * 100, rows / max(logged - start, 1e-9),
+            )
+        time.sleep(max(pause, held * (1 - duty_cycle) / duty_cycle))
+
+    _in_transaction(connection, lambda: connection.execute(
+        checkpoints.delete().where(checkpoints.c.name == name),
+    ))
+    logger.info(
+        "%s: %d rows of %s done in %.1f s", name, rows, table, time.monotonic() - start,
+    )
+    return rows
+
+
+def backfill(
+        name: str,
+        table: str,
+        batch: str | Batch,
+        key: str = "id",
+        batch_size: int = BATCH_SIZE,
+        pause: float = PAUSE,
+        duty_cycle: float = DUTY_CYCLE,
+        report: Callable[[Progress], None] | None = None,
+    ) -> int:
+    """Run a chunked data migration from an Alembic revision, see ``run_batches``.
+
+    Everything the migration did before is committed first. For example::
+
+        backfill(
+            "salaries_monthly_income", "salaries",
+            "UPDATE salaries SET monthly_income = salary_amount "
+            "WHERE id > :low AND id <= :high",
+        )
+
+    :return: The number of rows walked
+    :raises RuntimeError: In offline (``--sql``) mode, which cannot commit batches
+    """
+    context = op.get_context()
+    if context.as_sql:
+        msg = f"{name} migrates data in batches and cannot run in offline mode"
+        raise RuntimeError(msg)
+    with context.autocommit_block():
+        return run_batches(
+            op.get_bind(), name, table, batch, key, batch_size, pause,
+            duty_cycle, report,
+        )
@@ -0,0 +1,132 @@
+"""Content negotiation and compression for large API responses.
+
+JSON is always available. MessagePack and Brotli are used only when the
+``msgpack`` and ``brotli`` packages are installed; otherwise clients asking
+for them fall back to JSON and gzip respectively.
+"""
+
+from __future__ import annotations
+
+import gzip
+from functools import cache
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _qualities(header: str) -> list[tuple[float, int, str]]:
+    """Return the values of an ``Accept``-style header with their quality and position."""
+    values = []
+    for position, part in enumerate(header.split(",")):
+        value, *params = (item.strip() for item in part.split(";"))
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if value:
+            values.append((quality, position, value.lower()))
+    return values
+
+
+def _accepted(header: str) -> list[str]:
+    """Return the values of an ``Accept``-style header, best first.
+
+    Values with ``q=0`` are dropped; ties keep the client's order.
+    """
+    values = [
+        (-quality, position, value)
+        for quality, position, value in _qualities(header)
+        if quality > 0
+    ]
+    return [value for _, _, value in sorted(values)]
+
+
+def choose_media_type(request: Request) -> str:
+    """Pick the response media type from the request ``Accept`` header."""
+    for media_type in _accepted(request.headers.get("accept", "")):
+        if media_type in MSGPACK_MEDIA_TYPES and msgpack is not None:
+            return media_type
+        if media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            return JSON_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def choose_encoding(request: Request) -> str | None:
+    """Pick the content coding from the request ``Accept-Encoding`` header.
+
+    ``*`` stands for any coding the client did not refuse with ``q=0``.
+    """
+    header = request.headers.get("accept-encoding", "")
+    refused = {value for quality, _, value in _qualities(header) if quality <= 0}
+    available = ["gzip", "br"] if brotli is not None else ["gzip"]
+    for coding in _accepted(header):
+        if coding == "br" and brotli is not None:
+            return "br"
+        if coding == "gzip":
+            return "gzip"
+        if coding == "*":
+            return next((c for c in available if c not in refused), None)
+    return None
+
+
+def encode_body(content: Any, adapter: TypeAdapter, media_type: str) -> bytes:
+    """Validate ``content`` against ``adapter`` and serialize it as ``media_type``."""
+    validated = adapter.validate_python(content, from_attributes=True)
+    if media_type in MSGPACK_MEDIA_TYPES:
+        return msgpack.packb(adapter.dump_python(validated, mode="json"))
+    return adapter.dump_json(validated)
+
+
+def compress_body(body: bytes, encoding: str | None) -> bytes:
+    """Compress ``body`` with ``encoding``; ``None`` returns it unchanged."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+
+@cache
+def adapter_for(schema: Any) -> TypeAdapter:
+    """Return a cached ``TypeAdapter`` for ``schema``."""
+    return TypeAdapter(schema)
+
+
+def negotiated_response(request: Request, content: Any, schema: Any) -> Response:
+    """Build a response encoded and compressed as the client asked for.
+
+    :param request: Incoming request whose ``Accept`` headers are honoured
+    :param content: Data to send, dicts or ORM instances matching ``schema``
+    :param schema: Response type, e.g. ``list[SalarySchema]``
+    :return: Response with the negotiated body and headers
+    """
+    media_type = choose_media_type(request)
+    body = encode_body(content, adapter_for(schema), media_type)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if len(body) >= MIN_COMPRESS_SIZE:
+        encoding = choose_encoding(request)
+        if encoding is not None:
+            body = compress_body(body, encoding)
+            headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -0,0 +1,34 @@
+"""Resolve a list of keys to rows with a single ``IN`` query."""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Sequence
+
+from sqlalchemy import Column, FromClause, select
+from sqlalchemy.orm import Session
+
+
+def lookup_rows(
+        db: Session, table: FromClause, column: Column, keys: Sequence[Hashable],
+    ) -> tuple[list[dict], list]:
+    """Fetch the rows of ``table`` whose ``column`` is in ``keys``.
+
+    ``column`` should be the primary key or a unique indexed column, so the
+    lookup is one index probe per key.
+
+    :param db: Database session
+    :param table: Table or derived table to read
+    :param column: Column the keys are matched against
+    :param keys: Keys to look up; repeated keys are returned once
+    :return: Rows in the order of their first key, and the keys not found
+    """
+    unique_keys = list(dict.fromkeys(keys))
+    if not unique_keys:
+        return [], []
+    found = {
+        row[column.name]: dict(row)
+        for row in db.execute(select(table).where(column.in_(unique_keys))).mappings()
+    }
+    rows = [found[key] for key in unique_keys if key in found]
+    missing = [key for key in unique_keys if key not in found]
+    return rows, missing
@@ -0,0 +1,79 @@
+"""Fixtures running the tests on a copy of the seeded database."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app import app
+from src.pwcexercise.config.db import get_db
+from src.pwcexercise.seeds.seeder import BASE_DIR
+from src.pwcexercise.seeds.snapshots import (
+    clone_to_memory,
+    current_snapshot,
+    isolated_session,
+)
+
+
+@pytest.fixture(scope="session")
+def seeded_engine() -> Iterator[Engine]:
+    """Engine on an in-memory copy of the seeded snapshot, built once if missing."""
+    engine = clone_to_memory(current_snapshot())
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(seeded_engine: Engine) -> Iterator[Session]:
+    """Session of the test, lent to the routes and rolled back at its end."""
+    with isolated_session(seeded_engine) as session:
+        app.dependency_overrides[get_db] = lambda: session
+        try:
+            yield session
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def client(db: Session) -> TestClient:
+    """Client of the application on the test's session."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def statements(seeded_engine: Engine) -> Iterator[list[str]]:
+    """Record the SQL statements run on the test database, transactions aside."""
+    executed = []
+
+    def record(*args: object) -> None:
+        statement = str(args[2])
+        if not statement.lstrip().upper().startswith(
+            ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK", "COMMIT"),
+        ):
+            executed.append(statement)
+
+    event.listen(seeded_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(seeded_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> Iterator[tuple[Path, Config]]:
+    """A copy of the seeded database and the Alembic configuration that migrates it."""
+    path = tmp_path / "migrated.db"
+    with closing(sqlite3.connect(current_snapshot())) as source, \
+            closing(sqlite3.connect(path)) as target:
+        source.backup(target)
+    config = Config()
+    config.set_main_option("script_location", str(BASE_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    yield path, config
@@ -0,0 +1,135 @@
+"""Tests of the hot/cold partitioning of the salary and review history."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.performance_review import (
+    PerformanceReview,
+    PerformanceReviewArchive,
+)
+from src.pwcexercise.models.salary import Salary, SalaryArchive
+from src.pwcexercise.services import archive_service
+
+TODAY = date.today()
+
+
+def stored_in(db: Session, model: type, row_id: int) -> bool:
+    """Whether the row with ``row_id`` is in the table of ``model``."""
+    return db.execute(
+        select(func.count()).select_from(model).where(model.id == row_id),
+    ).scalar() == 1
+
+
+@pytest.fixture
+def archived(client: TestClient, db: Session) -> dict:
+    """Give an employee paid for years an older salary and review, then archive."""
+    current = db.scalars(
+        select(Salary)
+        .where(Salary.effective_date < TODAY - timedelta(days=800))
+        .limit(1),
+    ).one()
+    employee_id = current.employee_id
+    salary = client.post("/salaries/", json={
+        "employee_id": employee_id,
+        "monthly_income": 1234.0,
+        "hourly_rate": 10.0,
+        "effective_date": (current.effective_date - timedelta(days=400)).isoformat(),
+    }).json()
+    review = client.post("/performance_reviews/", json={
+        "employee_id": employee_id,
+        "review_date": (TODAY - timedelta(days=1000)).isoformat(),
+        "score": 2,
+        "comments": "Archived punctuality remarks",
+    }).json()
+
+    result = archive_service.archive_history(db, archive_service.archive_horizon())
+
+    assert result["salaries"] == 1
+    assert result["performance_reviews"] == 1
+    return {"employee_id": employee_id, "salary": salary, "review": review}
+
+
+def test_old_history_moves_to_the_archive(db: Session, archived: dict) -> None:
+    assert not stored_in(db, Salary, archived["salary"]["id"])
+    assert stored_in(db, SalaryArchive, archived["salary"]["id"])
+    assert not stored_in(db, PerformanceReview, archived["review"]["id"])
+    assert stored_in(db, PerformanceReviewArchive, archived["review"]["id"])
+
+
+def test_history_reads_still_see_archived_rows(
+        client: TestClient, archived: dict,
+    ) -> None:
+    employee_id, salary = archived["employee_id"], archived["salary"]
+
+    detail = client.get(f"/employees/{employee_id}").json()
+    as_of = client.get(
+        f"/employees/{employee_id}/active_salary",
+        params={"as_of": salary["effective_date"]},
+    ).json()
+    found = client.get(
+        "/performance_reviews/search", params={"q": "punctuality"},
+    ).json()["items"]
+
+    assert salary["id"] in {s["id"] for s in detail["salaries"]}
+    assert archived["review"]["id"] in {r["id"] for r in detail["performance_reviews"]}
+    assert as_of["active_salary"]["id"] == salary["id"]
+    assert [item["id"] for item in found] == [archived["review"]["id"]]
+
+
+def test_updating_an_archived_review_restores_it(
+        client: TestClient, db: Session, archived: dict,
+    ) -> None:
+    review = archived["review"]
+
+    response = client.put(f"/performance_reviews/{review['id']}", json={
+        **{key: review[key] for key in ("employee_id", "review_date", "comments")},
+        "score": 5,
+    })
+
+    assert response.status_code == 200
+    assert response.json()["score"] == 5
+    assert stored_in(db, PerformanceReview, review["id"])
+    assert not stored_in(db, PerformanceReviewArchive, review["id"])
+
+
+def test_deleting_the_latest_review_restores_the_archived_one(
+        client: TestClient, db: Session, archived: dict,
+    ) -> None:
+    employee_id = archived["employee_id"]
+    latest = client.get(f"/employees/{employee_id}/latest_performance_review").json()
+
+    client.delete(f"/performance_reviews/{latest['latest_performance_review']['id']}")
+
+    assert stored_in(db, PerformanceReview, archived["review"]["id"])
+    assert client.get(
+        f"/employees/{employee_id}/latest_performance_review",
+    ).json()["latest_performance_review"]["id"] == archived["review"]["id"]
+
+
+def test_salary_inside_an_archived_interval_restores_it(
+        client: TestClient, db: Session, archived: dict,
+    ) -> None:
+    salary = archived["salary"]
+    inside = date.fromisoformat(salary["effective_date"]) + timedelta(days=100)
+
+    client.post("/salaries/", json={
+        "employee_id": archived["employee_id"],
+        "monthly_income": 1500.0,
+        "hourly_rate": 12.0,
+        "effective_date": inside.isoformat(),
+    })
+
+    restored = db.get(Salary, salary["id"])
+    assert restored is not None
+    assert restored.effective_to == inside
+
+
+def test_horizon_must_leave_the_aguinaldo_window_hot() -> None:
+    with pytest.raises(ValueError, match="at least"):
+        archive_service.archive_horizon(archive_service.MIN_HORIZON_DAYS - 1)
@@ -0,0 +1,39 @@
+"""Tests of the size limit of ``POST /batch``."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+from fastapi.testclient import TestClient
+
+from src.pwcexercise.services.batch_service import MAX_BATCH_BYTES
+
+OVERSIZED = b"[" * (MAX_BATCH_BYTES + 1)
+
+
+def test_declared_oversized_body_is_refused_before_parsing(client: TestClient) -> None:
+    response = client.post(
+        "/batch", content=OVERSIZED, headers={"content-type": "application/json"},
+    )
+
+    assert response.status_code == 413
+
+
+def test_streamed_oversized_body_is_refused(client: TestClient) -> None:
+    def chunks() -> Iterator[bytes]:
+        for start in range(0, len(OVERSIZED), 64 * 1024):
+            yield OVERSIZED[start:start + 64 * 1024]
+
+    response = client.post(
+        "/batch", content=chunks(), headers={"content-type": "application/json"},
+    )
+
+    assert response.status_code == 413
+
+
+def test_malformed_small_body_is_still_validated(client: TestClient) -> None:
+    response = client.post(
+        "/batch", content=b"[", headers={"content-type": "application/json"},
+    )
+
+    assert response.status_code == 422
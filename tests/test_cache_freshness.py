@@ -0,0 +1,67 @@
+"""The in-process caches see the writes of other worker processes at once."""
+
+from __future__ import annotations
+
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.change import CHANGE_UPDATE
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.salary import Salary
+from src.pwcexercise.services.change_log_service import record_changes
+
+
+def write_as_another_worker(db: Session, salary_id: int, raise_by: float) -> None:
+    """Raise a salary as another process would: logged, without invalidating."""
+    salaries = Salary.__table__
+    db.execute(
+        update(salaries)
+        .where(salaries.c.id == salary_id)
+        .values(monthly_income=salaries.c.monthly_income + raise_by),
+    )
+    record_changes(db, salaries, CHANGE_UPDATE, [salary_id])
+    db.commit()
+
+
+def salary_in_department(db: Session, department_id: int) -> int:
+    """Return a salary of the department in effect since a closed month."""
+    return db.execute(
+        select(Salary.id)
+        .join(Employee, Employee.id == Salary.employee_id)
+        .where(
+            Employee.department_id == department_id,
+            Salary.effective_date < date.today().replace(day=1),
+        )
+        .limit(1),
+    ).scalar_one()
+
+
+def test_department_average_sees_other_workers_writes(
+        client: TestClient, db: Session,
+    ) -> None:
+    path = "/departments/1/medium_salary"
+    before = client.get(path).json()["medium_salary"]
+
+    write_as_another_worker(db, salary_in_department(db, 1), 1e6)
+
+    assert client.get(path).json()["medium_salary"] > before
+
+
+def test_closed_payroll_months_see_other_workers_writes(
+        client: TestClient, db: Session,
+    ) -> None:
+    def closed_months_payroll() -> float:
+        series = client.get(
+            "/salaries/payroll_timeseries", params={"department_id": 1},
+        ).json()["series"]
+        # The last point is the open month, which is never cached.
+        return sum(point["payroll"] for point in series[0]["points"][:-1])
+
+    before = closed_months_payroll()
+
+    write_as_another_worker(db, salary_in_department(db, 1), 1e6)
+
+    assert closed_months_payroll() > before
@@ -0,0 +1,92 @@
+"""Tests of the change data feed and of its compaction."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.change import Change
+from src.pwcexercise.services import change_log_service
+
+EMPLOYEE = {
+    "emp_id": "ZZ001", "age": 30, "department_id": 1,
+    "hire_date": "2020-01-01", "job_title_id": 1,
+}
+
+
+def follow(client: TestClient, since: int = 0, limit: int = 2) -> list[tuple]:
+    """Page through the whole feed from ``since`` as a consumer would."""
+    seen = []
+    while True:
+        page = client.get("/changes/", params={"since": since, "limit": limit}).json()
+        seen += [
+            (change["table_name"], change["row_id"], change["operation"])
+            for change in page["changes"]
+        ]
+        assert page["next_since"] >= since
+        since = page["next_since"]
+        if not page["has_more"]:
+            assert since == page["latest_seq"]
+            return seen
+
+
+@pytest.fixture
+def written(client: TestClient) -> int:
+    """Create, update and delete an employee; return its ID."""
+    employee_id = client.post("/employees/", json=EMPLOYEE).json()["id"]
+    client.put(f"/employees/{employee_id}", json={**EMPLOYEE, "age": 31})
+    client.put(f"/employees/{employee_id}", json={**EMPLOYEE, "age": 32})
+    client.delete(f"/employees/{employee_id}")
+    return employee_id
+
+
+def test_pages_list_every_write_in_order(client: TestClient, written: int) -> None:
+    assert follow(client) == [
+        ("employees", written, "insert"),
+        ("employees", written, "update"),
+        ("employees", written, "update"),
+        ("employees", written, "delete"),
+    ]
+
+
+def test_failed_writes_are_not_logged(client: TestClient) -> None:
+    assert client.put("/employees/999999", json=EMPLOYEE).status_code == 404
+    assert client.post("/departments/", json={}).status_code == 422
+
+    assert client.get("/changes/").json() == {
+        "changes": [], "next_since": 0, "has_more": False, "latest_seq": 0,
+    }
+
+
+def test_compaction_drops_superseded_changes(
+        client: TestClient, db: Session, written: int,
+    ) -> None:
+    result = change_log_service.compact_changes(db, batch_size=2)
+
+    assert result == {"purged_through": 0, "expired": 0, "superseded": 3}
+    assert follow(client) == [("employees", written, "delete")]
+
+
+def test_expired_changes_answer_410(
+        client: TestClient, db: Session, written: int,
+    ) -> None:
+    first, *_ = db.execute(select(Change.seq).order_by(Change.seq)).scalars()
+    db.execute(
+        update(Change)
+        .where(Change.seq <= first + 1)
+        .values(changed_at=datetime.now() - timedelta(days=31)),
+    )
+    db.commit()
+
+    result = change_log_service.compact_changes(db)
+
+    assert result["purged_through"] == first + 1
+    assert result["expired"] == 2
+    response = client.get("/changes/", params={"since": first})
+    assert response.status_code == 410
+    assert "resync" in response.json()["detail"]
+    assert follow(client, since=first + 1) == [("employees", written, "delete")]
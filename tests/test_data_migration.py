@@ -0,0 +1,125 @@
+"""Tests of the chunked, resumable data migrations."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.engine import Connection
+
+from src.pwcexercise.utils.data_migration import (
+    Progress,
+    checkpoints,
+    run_batches,
+)
+
+DOUBLE = "UPDATE items SET value = value * 2 WHERE id > :low AND id <= :high"
+
+
+@pytest.fixture
+def connection(tmp_path: Path) -> Iterator[Connection]:
+    """Autocommit connection to a database with ten items, IDs 1 to 10."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'items.db'}", isolation_level="AUTOCOMMIT",
+    )
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, value)"))
+        connection.execute(text(
+            "INSERT INTO items (id, value) VALUES"
+            " (1, 1), (2, 2), (3, 3), (4, 4), (5, 5),"
+            " (6, 6), (7, 7), (8, 8), (9, 9), (10, 10)",
+        ))
+        yield connection
+    engine.dispose()
+
+
+def values(connection: Connection) -> list[int]:
+    """Return the values of the items in ID order."""
+    return connection.execute(
+        text("SELECT value FROM items ORDER BY id"),
+    ).scalars().all()
+
+
+def test_batches_cover_every_row_and_report_progress(connection: Connection) -> None:
+    reported: list[Progress] = []
+
+    rows = run_batches(
+        connection, "double", "items", DOUBLE,
+        batch_size=4, pause=0, report=reported.append,
+    )
+
+    assert rows == 10
+    assert values(connection) == [2 * value for value in range(1, 11)]
+    assert [(p.last_key, p.rows, p.fraction) for p in reported] == [
+        (4, 4, 0.4), (8, 8, 0.8), (10, 10, 1.0),
+    ]
+    assert connection.execute(select(checkpoints)).all() == []
+
+
+def test_an_interrupted_backfill_resumes_after_its_last_batch(
+        connection: Connection,
+    ) -> None:
+    ranges, interrupt_at = [], [4]
+
+    def double(conn: Connection, low: int, high: int) -> None:
+        if low in interrupt_at:
+            interrupt_at.clear()
+            msg = "interrupted"
+            raise RuntimeError(msg)
+        conn.execute(text(DOUBLE), {"low": low, "high": high})
+        ranges.append((low, high))
+
+    with pytest.raises(RuntimeError, match="interrupted"):
+        run_batches(connection, "double", "items", double, batch_size=4, pause=0)
+    saved = connection.execute(select(checkpoints)).mappings().one()
+
+    assert (saved["last_key"], saved["rows"], saved["total"]) == (4, 4, 10)
+    assert values(connection) == [2, 4, 6, 8, 5, 6, 7, 8, 9, 10]
+
+    rows = run_batches(connection, "double", "items", double, batch_size=4, pause=0)
+
+    assert rows == 10
+    assert ranges == [(0, 4), (4, 8), (8, 10)]
+    assert values(connection) == [2 * value for value in range(1, 11)]
+
+
+def test_rows_inserted_after_the_start_are_left_alone(connection: Connection) -> None:
+    def insert_then_double(conn: Connection, low: int, high: int) -> None:
+        conn.execute(text("INSERT OR IGNORE INTO items (id, value) VALUES (11, 11)"))
+        conn.execute(text(DOUBLE), {"low": low, "high": high})
+
+    assert run_batches(
+        connection, "double", "items", insert_then_double, batch_size=4, pause=0,
+    ) == 10
+    assert values(connection)[-1] == 11
+
+
+def test_revisions_backfill_the_salaries_both_ways(
+        database: tuple[Path, Config],
+    ) -> None:
+    path, config = database
+    query = (
+        "SELECT id, employee_id, monthly_income, hourly_rate, effective_date,"
+        " effective_to FROM salaries ORDER BY id"
+    )
+    with closing(sqlite3.connect(path)) as conn:
+        before = conn.execute(query).fetchall()
+
+    command.downgrade(config, "base")
+    with closing(sqlite3.connect(path)) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(salaries)")}
+        assert "salary_amount" in columns
+        assert "monthly_income" not in columns
+    command.upgrade(config, "head")
+
+    with closing(sqlite3.connect(path)) as conn:
+        assert conn.execute(query).fetchall() == before
+        assert conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'data_migrations'",
+        ).fetchall() == [("data_migrations",)]
@@ -0,0 +1,80 @@
+"""Tests of the filters, sorting and pagination of the employee listing."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.salary import OPEN_END, Salary
+
+
+@pytest.fixture
+def workforce(db: Session) -> list[dict]:
+    """Every employee with their current monthly income, read from the tables."""
+    rows = db.execute(
+        select(Employee.__table__, Salary.monthly_income.label("salary"))
+        .outerjoin(
+            Salary,
+            (Salary.employee_id == Employee.id) & (Salary.effective_to == OPEN_END),
+        ),
+    ).mappings()
+    return [dict(row) for row in rows]
+
+
+def listed_ids(client: TestClient, **params: object) -> list[int]:
+    """Return the IDs of the compact listing for ``params``."""
+    response = client.get("/employees/", params={"view": "compact", **params})
+    assert response.status_code == 200
+    return [item["id"] for item in response.json()]
+
+
+@pytest.mark.parametrize(("params", "keep"), [
+    ({"age_min": 30, "age_max": 40}, lambda e: 30 <= e["age"] <= 40),
+    ({"department_id": 2, "job_title_id": 5},
+     lambda e: e["department_id"] == 2 and e["job_title_id"] == 5),
+    ({"hired_from": "2020-01-01", "hired_to": "2020-12-31"},
+     lambda e: date(2020, 1, 1) <= e["hire_date"] <= date(2020, 12, 31)),
+    ({"emp_id_prefix": "RM1"}, lambda e: e["emp_id"].startswith("RM1")),
+    ({"salary_min": 3000, "salary_max": 5000},
+     lambda e: e["salary"] is not None and 3000 <= e["salary"] <= 5000),
+])
+def test_filters_select_the_matching_employees(
+        client: TestClient, workforce: list[dict], params: dict,
+        keep: Callable[[dict], bool],
+    ) -> None:
+    expected = sorted(e["id"] for e in workforce if keep(e))
+
+    assert expected
+    assert listed_ids(client, **params) == expected
+
+
+@pytest.mark.parametrize("sort", ["age", "-hire_date", "emp_id", "-salary"])
+def test_sorting_breaks_ties_by_id(
+        client: TestClient, workforce: list[dict], sort: str,
+    ) -> None:
+    key = sort.lstrip("-")
+    # Sorting is stable, also in reverse: equal keys stay in ID order.
+    expected = sorted(workforce, key=lambda e: e["id"])
+    expected.sort(key=lambda e: e[key], reverse=sort.startswith("-"))
+
+    assert listed_ids(client, sort=sort) == [e["id"] for e in expected]
+
+
+def test_pages_follow_each_other(client: TestClient) -> None:
+    everything = listed_ids(client, sort="-age")
+    pages = [
+        listed_ids(client, sort="-age", limit=100, offset=offset)
+        for offset in range(0, len(everything), 100)
+    ]
+
+    assert [i for page in pages for i in page] == everything
+
+
+def test_invalid_sort_key_is_refused(client: TestClient) -> None:
+    assert client.get("/employees/", params={"sort": "name"}).status_code == 422
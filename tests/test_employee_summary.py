@@ -0,0 +1,91 @@
+"""Tests of the employee summary and the routes it stands in for."""
+
+from __future__ import annotations
+
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+
+def test_summary_takes_two_statements_with_the_reference_cache_warm(
+        client: TestClient, statements: list[str],
+    ) -> None:
+    client.get("/employees/1/summary")
+    statements.clear()
+
+    response = client.get("/employees/1/summary")
+
+    assert response.status_code == 200
+    assert response.json()["errors"] == {}
+    assert len(statements) <= 2
+
+
+def test_summary_breaks_date_ties_like_the_single_routes(client: TestClient) -> None:
+    today = date.today().isoformat()
+    for score in (2, 4):
+        client.post("/performance_reviews/", json={
+            "employee_id": 1, "review_date": today, "score": score,
+        })
+    for income in (3000.0, 3100.0):
+        client.post("/salaries/", json={
+            "employee_id": 1,
+            "monthly_income": income,
+            "hourly_rate": 20.0,
+            "effective_date": today,
+        })
+
+    summary = client.get("/employees/1/summary").json()
+
+    review = client.get("/employees/1/latest_performance_review").json()
+    salary = client.get("/employees/1/active_salary").json()
+    assert summary["latest_performance_review"] == review["latest_performance_review"]
+    assert summary["latest_performance_review"]["score"] == 4
+    assert summary["active_salary"] == salary["active_salary"]
+    assert summary["active_salary"]["monthly_income"] == 3100.0
+
+
+def test_compact_listing_breaks_review_date_ties_like_the_single_route(
+        client: TestClient,
+    ) -> None:
+    today = date.today().isoformat()
+    for score in (2, 4):
+        client.post("/performance_reviews/", json={
+            "employee_id": 1, "review_date": today, "score": score,
+        })
+
+    listing = client.get(
+        "/employees/", params={"view": "compact", "sort": "id", "limit": 1},
+    ).json()
+
+    review = client.get("/employees/1/latest_performance_review").json()
+    assert listing[0]["id"] == 1
+    latest = review["latest_performance_review"]
+    assert listing[0]["latest_performance_review"] == latest
+
+
+def test_summary_of_a_missing_employee_answers_404(client: TestClient) -> None:
+    assert client.get("/employees/999999/summary").status_code == 404
+
+
+def test_history_limit_keeps_the_newest_entries(client: TestClient) -> None:
+    today = date.today().isoformat()
+    for score in (2, 4):
+        client.post("/performance_reviews/", json={
+            "employee_id": 1, "review_date": today, "score": score,
+        })
+    full = client.get("/employees/1").json()
+
+    detail = client.get("/employees/1", params={"history_limit": 2}).json()
+    listed = client.get(
+        "/employees/", params={"sort": "id", "limit": 1, "history_limit": 1},
+    ).json()[0]
+    looked_up = client.get(
+        "/employees/lookup", params={"ids": [1], "history_limit": 1},
+    ).json()["items"][0]
+
+    assert len(full["performance_reviews"]) == 3
+    assert [r["score"] for r in detail["performance_reviews"]] == [2, 4]
+    assert detail["salaries"] == full["salaries"]
+    for employee in (listed, looked_up):
+        assert [r["score"] for r in employee["performance_reviews"]] == [4]
+        assert len(employee["salaries"]) == 1
@@ -0,0 +1,37 @@
+"""Tests of the content coding negotiation."""
+
+from __future__ import annotations
+
+import pytest
+from starlette.requests import Request
+
+from src.pwcexercise.utils import encoding
+from src.pwcexercise.utils.encoding import choose_encoding
+
+
+def request_accepting(value: str) -> Request:
+    return Request({"type": "http", "headers": [(b"accept-encoding", value.encode())]})
+
+
+@pytest.mark.parametrize(("header", "expected"), [
+    ("gzip", "gzip"),
+    ("*", "gzip"),
+    ("gzip;q=0, *", None),
+    ("gzip;q=0, br;q=0, *", None),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding(
+        monkeypatch: pytest.MonkeyPatch, header: str, expected: str | None,
+    ) -> None:
+    monkeypatch.setattr(encoding, "brotli", None)
+
+    assert choose_encoding(request_accepting(header)) == expected
+
+
+def test_wildcard_falls_back_to_brotli_when_gzip_is_refused(
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+    monkeypatch.setattr(encoding, "brotli", object())
+
+    assert choose_encoding(request_accepting("gzip;q=0, *")) == "br"
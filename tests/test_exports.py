@@ -0,0 +1,75 @@
+"""Tests of the columnar snapshot exports."""
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pyarrow.dataset as ds
+import pytest
+from sqlalchemy import Select, func, select
+from sqlalchemy.engine import Engine
+
+from src.pwcexercise.exports import snapshot
+from src.pwcexercise.models.department import Department
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.salary import Salary
+
+
+def count(engine: Engine, statement: Select) -> int:
+    """Return the first column of the only row of ``statement``."""
+    with engine.connect() as conn:
+        return conn.execute(statement).scalar_one()
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_snapshot_holds_every_row(
+        seeded_engine: Engine, tmp_path: Path, file_format: str,
+    ) -> None:
+    manifest = snapshot.export_snapshot(
+        seeded_engine, tmp_path, file_format=file_format, batch_size=500,
+    )
+
+    target = tmp_path / manifest.snapshot_id
+    employees = manifest.tables["employees"]
+    assert employees.rows == count(seeded_engine, select(func.count(Employee.id)))
+    assert employees.files == [f"employees.{file_format}"]
+    table = ds.dataset(target / employees.files[0], format=file_format).to_table()
+    assert table.num_rows == employees.rows
+    with seeded_engine.connect() as conn:
+        departments = conn.execute(
+            select(Department.name)
+            .join(Employee, Employee.department_id == Department.id)
+            .order_by(Employee.id),
+        ).scalars().all()
+    assert table.column("department").to_pylist() == departments
+    assert snapshot.read_manifest(manifest.snapshot_id, tmp_path) == manifest.to_dict()
+
+
+def test_history_is_partitioned_by_month_and_since_keeps_the_later_months(
+        seeded_engine: Engine, tmp_path: Path,
+    ) -> None:
+    since = date.today().replace(day=1)
+    full = snapshot.export_snapshot(seeded_engine, tmp_path)
+    recent = snapshot.export_snapshot(seeded_engine, tmp_path, since=since)
+
+    months = [path.split("/")[1] for path in full.tables["salaries"].files]
+    assert months == sorted(set(months))
+    assert all(month.startswith("effective_date_month=") for month in months)
+    assert recent.tables["salaries"].rows == count(
+        seeded_engine,
+        select(func.count(Salary.id)).where(Salary.effective_date >= since),
+    )
+    assert recent.tables["employees"].rows == full.tables["employees"].rows
+
+
+def test_only_listed_files_are_served(seeded_engine: Engine, tmp_path: Path) -> None:
+    manifest = snapshot.export_snapshot(seeded_engine, tmp_path)
+
+    assert snapshot.snapshot_file(
+        manifest.snapshot_id, "employees.parquet", tmp_path,
+    ) == tmp_path / manifest.snapshot_id / "employees.parquet"
+    assert snapshot.snapshot_file(
+        manifest.snapshot_id, "../manifest.json", tmp_path,
+    ) is None
+    assert snapshot.read_manifest("../etc", tmp_path) is None
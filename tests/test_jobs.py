@@ -0,0 +1,155 @@
+"""Tests of the background jobs, run inline on the test's database."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.job import JOB_FAILED, JOB_SUCCEEDED
+from src.pwcexercise.services import job_service
+
+
+class InlineExecutor:
+    """Run a job as soon as it is submitted, on the caller's thread.
+
+    The test sessions share one connection, which must not be used by two
+    threads at once.
+    """
+
+    def submit(self, fn, *args) -> Future:  # noqa: ANN001
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+class DeferredExecutor:
+    """Keep the jobs submitted until ``run_all`` runs them on the caller's thread."""
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        self.pending: list[tuple] = []
+
+    def submit(self, fn, *args) -> None:  # noqa: ANN001
+        self.pending.append((fn, args))
+
+    def run_all(self) -> None:
+        # The test session's savepoint would enclose the jobs' writes on the
+        # shared connection, and its next rollback would undo them.
+        self.db.rollback()
+        while self.pending:
+            fn, args = self.pending.pop(0)
+            fn(*args)
+
+
+@pytest.fixture(autouse=True)
+def inline_jobs(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Run the jobs inline and keep their results in a scratch directory."""
+    monkeypatch.setattr(job_service, "_get_executor", InlineExecutor)
+    monkeypatch.setattr(job_service, "JOB_DIR", tmp_path)
+
+
+@pytest.fixture
+def deferred(db: Session, monkeypatch: pytest.MonkeyPatch) -> DeferredExecutor:
+    """Leave the jobs queued until the test runs them."""
+    executor = DeferredExecutor(db)
+    monkeypatch.setattr(job_service, "_get_executor", lambda: executor)
+    return executor
+
+
+AGGREGATE = {
+    "kind": "aggregate",
+    "params": {"metric": "monthly_income", "agg": "mean", "group_by": "department_id"},
+}
+
+
+def test_job_result_matches_the_synchronous_route(client: TestClient) -> None:
+    response = client.post("/jobs/", json=AGGREGATE)
+
+    assert response.status_code == 202
+    job = client.get(response.headers["Location"]).json()
+    assert job["status"] == JOB_SUCCEEDED
+    assert job["progress"] == 1.0
+    assert job["started_at"] <= job["finished_at"]
+    result = client.get(job["result_url"]).json()
+    assert result == client.get(
+        "/analytics/aggregate", params=AGGREGATE["params"],
+    ).json()
+
+
+def test_identical_pending_submission_returns_the_same_job(
+        client: TestClient, deferred: DeferredExecutor,
+    ) -> None:
+    first = client.post("/jobs/", json=AGGREGATE)
+    second = client.post("/jobs/", json=AGGREGATE)
+
+    assert (first.status_code, second.status_code) == (202, 200)
+    assert first.json()["id"] == second.json()["id"]
+    assert len(deferred.pending) == 1
+    assert client.get(f"/jobs/{first.json()['id']}/result").status_code == 409
+
+    deferred.run_all()
+    assert client.get(f"/jobs/{first.json()['id']}").json()["status"] == JOB_SUCCEEDED
+    assert client.post("/jobs/", json=AGGREGATE).status_code == 202
+
+
+def test_failing_job_records_its_error(
+        client: TestClient, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+    def fail(db: Session, params: object, report: object) -> None:
+        msg = "no luck"
+        raise RuntimeError(msg)
+
+    model, _ = job_service.JOB_KINDS["histogram"]
+    monkeypatch.setitem(job_service.JOB_KINDS, "histogram", (model, fail))
+
+    job_id = client.post("/jobs/", json={"kind": "histogram"}).json()["id"]
+
+    job = client.get(f"/jobs/{job_id}").json()
+    assert (job["status"], job["error"], job["result_url"]) == (
+        JOB_FAILED, "no luck", None,
+    )
+
+
+def test_invalid_parameters_answer_400(client: TestClient) -> None:
+    response = client.post(
+        "/jobs/", json={"kind": "histogram", "params": {"bins": 0}},
+    )
+
+    assert response.status_code == 400
+    assert client.get("/jobs/999999").status_code == 404
+
+
+def test_compaction_is_submitted_once_per_interval(db: Session) -> None:
+    job = job_service.compact_changes_if_due(db)
+
+    assert job is not None
+    db.refresh(job)
+    assert job.kind == "compact_changes"
+    assert job.status == JOB_SUCCEEDED
+    assert job_service.compact_changes_if_due(db) is None
+    assert job_service.compact_changes_if_due(db, timedelta(0)) is not None
+
+
+def test_compaction_is_scheduled_at_once_and_then_periodically(
+        db: Session, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+    checks = threading.Semaphore(0)
+    monkeypatch.setattr(
+        job_service, "compact_changes_if_due",
+        lambda _db, _interval: checks.release(),
+    )
+
+    stop = job_service.schedule_compaction(
+        Session, timedelta(milliseconds=10),
+    )
+    try:
+        assert checks.acquire(timeout=5)
+        assert checks.acquire(timeout=5)
+    finally:
+        stop.set()
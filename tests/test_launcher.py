@@ -0,0 +1,101 @@
+"""Tests of the multi-process launcher, serving a tiny app that names its worker."""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections.abc import Iterator
+
+import pytest
+
+from src.pwcexercise.server import launcher
+
+
+async def pid_app(scope: dict, receive, send) -> None:  # noqa: ANN001
+    """ASGI app answering with the pid of the worker that served the request."""
+    if scope["type"] != "http":
+        return
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json")],
+    })
+    body = json.dumps(os.getpid()).encode()
+    await send({"type": "http.response.body", "body": body})
+
+
+def free_port() -> int:
+    """Return a port nothing listens on right now."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def served_by(port: int) -> int:
+    """Return the pid of the worker answering one request."""
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=5) as response:
+        return json.loads(response.read())
+
+
+@pytest.fixture
+def server() -> Iterator[tuple[subprocess.Popen, int]]:
+    """Two workers recycled after five requests each."""
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, "-m", "src.pwcexercise.server.launcher",
+        "--app", "tests.test_launcher:pid_app", "--port", str(port),
+        "--workers", "2", "--max-requests", "5", "--max-requests-jitter", "0",
+        "--graceful-timeout", "5", "--no-access-log",
+    ])
+    deadline = time.monotonic() + 20
+    while True:
+        try:
+            served_by(port)
+            break
+        except OSError:
+            if time.monotonic() > deadline or process.poll() is not None:
+                process.kill()
+                pytest.fail("The launcher did not start serving")
+            time.sleep(0.1)
+    yield process, port
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+def test_workers_are_recycled_and_the_master_stops_on_sigterm(
+        server: tuple[subprocess.Popen, int],
+    ) -> None:
+    process, port = server
+
+    pids = set()
+    deadline = time.monotonic() + 20
+    while len(pids) < 3 and time.monotonic() < deadline:
+        try:
+            pids.add(served_by(port))
+        except OSError:
+            time.sleep(0.05)
+    process.send_signal(signal.SIGTERM)
+
+    assert len(pids) >= 3
+    assert process.pid not in pids
+    assert process.wait(timeout=15) == 0
+
+
+def test_worker_count_comes_from_web_concurrency(
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert launcher.default_workers() == 3
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "0")
+    assert launcher.default_workers() == 1
+
+    monkeypatch.delenv("WEB_CONCURRENCY")
+    assert launcher.default_workers() == (os.cpu_count() or 1)
@@ -0,0 +1,87 @@
+"""The load-test profiles only send requests the API answers successfully."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from benchmarks.loadtest import (
+    PROFILES,
+    Dataset,
+    EndpointStats,
+    LoadRun,
+    Operation,
+    discover,
+)
+
+# Exports are written from the application's own engine, not the test database.
+SKIPPED = {"POST /exports/"}
+
+
+@pytest.fixture
+def dataset(client: TestClient) -> Dataset:
+    """The keys the load test would discover on the test database."""
+    async def read() -> Dataset:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+                transport=transport, base_url="http://test",
+            ) as http:
+            return await discover(http)
+
+    return asyncio.run(read())
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [op for op in PROFILES["mixed"] if op.endpoint not in SKIPPED],
+    ids=lambda operation: operation.endpoint,
+)
+def test_every_operation_succeeds(
+        client: TestClient, dataset: Dataset, operation: Operation,
+    ) -> None:
+    rng = random.Random(0)
+    for _ in range(3):
+        method, url, body = operation.build(rng, dataset)
+        response = client.request(method, url, json=body)
+        assert response.status_code < 400, (url, response.text)
+
+
+def test_closed_loop_records_every_request(dataset: Dataset) -> None:
+    operations = [op for op in PROFILES["hr_clerk"] if op.endpoint not in SKIPPED]
+
+    async def run() -> LoadRun:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+                transport=transport, base_url="http://test",
+            ) as http:
+            load_run = LoadRun(http, operations, dataset, seed=1)
+            await load_run.closed_loop(duration=0.3, concurrency=1)
+            return load_run
+
+    load_run = asyncio.run(run())
+
+    assert load_run.stats
+    for stats in load_run.stats.values():
+        assert stats.errors == 0
+        assert sum(stats.statuses.values()) == len(stats.latencies)
+
+
+def test_endpoint_summary() -> None:
+    stats = EndpointStats()
+    outcomes = ((0.010, 200), (0.020, 200), (0.030, 500), (0.040, "ReadTimeout"))
+    for latency, status in outcomes:
+        stats.record(latency, status)
+
+    summary = stats.summary(elapsed=2.0)
+
+    assert summary["requests"] == 4
+    assert summary["errors"] == 2
+    assert summary["error_rate"] == 0.5
+    assert summary["throughput_rps"] == 2.0
+    assert summary["latency_ms"]["max"] == 40.0
+    assert summary["status_codes"] == {"200": 2, "500": 1, "ReadTimeout": 1}
@@ -0,0 +1,109 @@
+"""Tests of the multi-get lookups and of the unique emp_id behind them."""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.schemas.lookup import MAX_LOOKUP_KEYS
+
+BEFORE_UNIQUE_EMP_ID = "d2e6f4a8c913"
+UNIQUE_EMP_ID = "f4b7a2c9e150"
+
+
+def test_employees_come_back_in_the_order_asked_with_the_misses(
+        client: TestClient, db: Session,
+    ) -> None:
+    first, second = db.execute(
+        select(Employee.emp_id).order_by(Employee.id).limit(2),
+    ).scalars()
+    emp_ids = [second, "NOPE", first, second]
+
+    by_query = client.get("/employees/lookup", params={"emp_ids": emp_ids}).json()
+    by_body = client.post("/employees/lookup", json={"emp_ids": emp_ids}).json()
+
+    assert by_query == by_body
+    assert [item["emp_id"] for item in by_query["items"]] == [second, first]
+    assert by_query["missing"] == ["NOPE"]
+
+
+@pytest.mark.parametrize("path", ["/salaries/lookup", "/performance_reviews/lookup"])
+def test_history_lookups_by_id(client: TestClient, path: str) -> None:
+    body = client.get(path, params={"ids": [3, 1, 999_999, 3]}).json()
+
+    assert [item["id"] for item in body["items"]] == [3, 1]
+    assert body["missing"] == [999_999]
+
+
+def test_too_many_keys_are_refused(client: TestClient) -> None:
+    ids = list(range(1, MAX_LOOKUP_KEYS + 2))
+
+    assert client.post("/employees/lookup", json={"ids": ids}).status_code == 422
+
+
+def test_taken_emp_id_answers_409(client: TestClient, db: Session) -> None:
+    taken = db.execute(select(Employee.emp_id).where(Employee.id == 1)).scalar_one()
+    employee = {"emp_id": taken, "age": 30, "department_id": 1,
+                "hire_date": "2020-01-01", "job_title_id": 1}
+
+    assert client.post("/employees/", json=employee).status_code == 409
+    assert client.put("/employees/2", json=employee).status_code == 409
+
+
+def test_emp_id_migration_merges_duplicates_and_downgrade_restores_them(
+        database: tuple[Path, Config],
+    ) -> None:
+    path, config = database
+    command.downgrade(config, BEFORE_UNIQUE_EMP_ID)
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.execute(
+            "INSERT INTO employees (id, emp_id, age, department_id, hire_date,"
+            " job_title_id) SELECT 100000, emp_id, 50, department_id, hire_date,"
+            " job_title_id FROM employees WHERE id = 1",
+        )
+        conn.execute(
+            "INSERT INTO salaries (id, employee_id, monthly_income, hourly_rate,"
+            " effective_date, effective_to) VALUES"
+            " (100000, 100000, 1.0, 1.0, '2001-01-01', '9999-12-31')",
+        )
+        before = conn.execute(
+            "SELECT employee_id, effective_to FROM salaries ORDER BY id",
+        ).fetchall()
+
+    command.upgrade(config, UNIQUE_EMP_ID)
+    with closing(sqlite3.connect(path)) as conn:
+        assert conn.execute(
+            "SELECT COUNT(*) FROM employees WHERE id = 100000",
+        ).fetchone() == (0,)
+        assert conn.execute(
+            "SELECT employee_id FROM salaries WHERE id = 100000",
+        ).fetchone() == (1,)
+        assert conn.execute(
+            "SELECT old_id, new_id FROM merged_employee_ids",
+        ).fetchall() == [(100000, 1)]
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute(
+                "INSERT INTO employees (emp_id, age, department_id, hire_date)"
+                " SELECT emp_id, 1, 1, hire_date FROM employees WHERE id = 1",
+            )
+
+    command.downgrade(config, BEFORE_UNIQUE_EMP_ID)
+    with closing(sqlite3.connect(path)) as conn:
+        assert conn.execute(
+            "SELECT age FROM employees WHERE id = 100000",
+        ).fetchone() == (50,)
+        assert conn.execute(
+            "SELECT employee_id, effective_to FROM salaries ORDER BY id",
+        ).fetchall() == before
+        assert conn.execute(
+            "SELECT name FROM sqlite_master WHERE name LIKE 'merged_employee%'",
+        ).fetchall() == []
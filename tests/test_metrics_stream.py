@@ -0,0 +1,139 @@
+"""Tests of the live workforce metrics streamed as Server-Sent Events."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.pwcexercise.services import metrics_stream_service
+from src.pwcexercise.services.metrics_stream_service import (
+    RETRY_MS,
+    SLOW_CLIENT_TIMEOUT,
+    MetricsBroadcaster,
+    TooManySubscribersError,
+    compute_metrics,
+)
+
+
+def metrics_of(event: bytes) -> tuple[int, dict]:
+    """Return the ID and the metrics of an encoded event."""
+    seq, kind, data = event.decode().strip().split("\n")
+    assert kind == "event: metrics"
+    return int(seq.removeprefix("id: ")), json.loads(data.removeprefix("data: "))
+
+
+@pytest.fixture
+def broadcaster(db: Session) -> MetricsBroadcaster:
+    """A broadcaster reading the test database."""
+    return MetricsBroadcaster(sessionmaker(
+        bind=db.get_bind(), join_transaction_mode="create_savepoint",
+    ))
+
+
+@pytest.fixture
+def idle(broadcaster: MetricsBroadcaster) -> MetricsBroadcaster:
+    """A broadcaster whose polls find nothing, publishing only what a test hands it."""
+    broadcaster._poll = lambda: None
+    return broadcaster
+
+
+def test_metrics_match_the_polled_routes(client: TestClient, db: Session) -> None:
+    metrics = compute_metrics(db)
+
+    assert metrics["current_average"] == (
+        client.get("/salaries/current_average").json()["current_average"]
+    )
+    assert metrics["historic_average"] == (
+        client.get("/salaries/historic_average").json()["historic_average"]
+    )
+    for department in metrics["departments"]:
+        path = f"/departments/{department['department_id']}"
+        assert department["name"] == client.get(path).json()["name"]
+        assert department["medium_salary"] == pytest.approx(
+            client.get(f"{path}/medium_salary").json()["medium_salary"], abs=0.01,
+        )
+        assert department["average_performance_score"] == pytest.approx(
+            client.get(f"{path}/average_performance_score").json()[
+                "average_performance_score"
+            ],
+            abs=0.01,
+        )
+    assert sum(d["headcount"] for d in metrics["departments"]) == 1470
+
+
+def test_metrics_are_recomputed_only_when_they_change(
+        client: TestClient, broadcaster: MetricsBroadcaster, statements: list[str],
+    ) -> None:
+    first, metrics = metrics_of(broadcaster._poll())
+    statements.clear()
+
+    assert broadcaster._poll() is None
+    assert len(statements) == 1
+    # Logged, but the metrics stay the same: no new event.
+    client.put("/departments/1", json={"name": metrics["departments"][0]["name"]})
+    assert broadcaster._poll() is None
+
+    salary = client.get("/employees/1/active_salary").json()["active_salary"]
+    client.put(f"/salaries/{salary['id']}", json={
+        **salary, "monthly_income": salary["monthly_income"] + 100_000,
+    })
+    seq, raised = metrics_of(broadcaster._poll())
+
+    assert seq > first
+    assert raised["current_average"] > metrics["current_average"]
+
+
+def test_slow_clients_only_get_the_latest_event(idle: MetricsBroadcaster) -> None:
+    async def scenario() -> None:
+        subscriber = idle.subscribe()
+        idle._publish(b"id: 1\n\n")
+        idle._publish(b"id: 2\n\n")
+
+        assert subscriber.queue.get_nowait() == b"id: 2\n\n"
+        assert subscriber.dropped == 1
+
+        idle._publish(b"id: 3\n\n")
+        subscriber.waiting_since -= SLOW_CLIENT_TIMEOUT + 1
+        idle._publish(b"id: 4\n\n")
+
+        assert subscriber.queue.get_nowait() is None
+        assert idle.subscribers == 0
+
+    asyncio.run(scenario())
+
+
+def test_stream_skips_the_event_a_reconnecting_client_has(
+        idle: MetricsBroadcaster,
+    ) -> None:
+    async def scenario() -> list[bytes]:
+        idle._publish(b"id: 7\nevent: metrics\ndata: {}\n\n")
+        subscriber = idle.subscribe()
+        stream = idle.stream(subscriber, last_event_id="7")
+        received = [await anext(stream)]
+        idle._publish(b"id: 8\nevent: metrics\ndata: {}\n\n")
+        received.append(await anext(stream))
+        await stream.aclose()
+        return received
+
+    received = asyncio.run(scenario())
+
+    assert received == [
+        f"retry: {RETRY_MS}\n\n".encode(), b"id: 8\nevent: metrics\ndata: {}\n\n",
+    ]
+    assert idle.subscribers == 0
+
+
+def test_connections_beyond_the_limit_are_refused(
+        client: TestClient, idle: MetricsBroadcaster,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+    idle.max_connections = 0
+    monkeypatch.setattr(metrics_stream_service, "broadcaster", idle)
+
+    with pytest.raises(TooManySubscribersError):
+        idle.subscribe()
+    assert client.get("/analytics/stream").status_code == 503
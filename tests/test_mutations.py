@@ -0,0 +1,90 @@
+"""The writes answer from their RETURNING rows and keep dependent rows consistent."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.performance_review import PerformanceReview
+from src.pwcexercise.models.salary import Salary
+
+EMPLOYEE = {
+    "emp_id": "ZZ001", "age": 30, "department_id": 1,
+    "hire_date": "2020-01-01", "job_title_id": 1,
+}
+REVIEW = {"employee_id": 1, "review_date": "2026-01-01", "score": 4}
+SALARY = {
+    "employee_id": 1, "monthly_income": 4000.0, "hourly_rate": 25.0,
+    "effective_date": "2026-01-01",
+}
+
+
+@pytest.mark.parametrize(("method", "path", "body", "table"), [
+    ("post", "/employees/", EMPLOYEE, "employees"),
+    ("put", "/employees/2", EMPLOYEE, "employees"),
+    ("post", "/performance_reviews/", REVIEW, "performance_reviews"),
+    ("put", "/performance_reviews/1", REVIEW, "performance_reviews"),
+    ("put", "/salaries/1", SALARY, "salaries"),
+])
+def test_write_returns_its_row_without_reading_it_back(
+        client: TestClient, statements: list[str],
+        method: str, path: str, body: dict, table: str,
+    ) -> None:
+    response = getattr(client, method)(path, json=body)
+
+    # Salary writes follow theirs with the refresh of the validity intervals.
+    write = next(
+        i for i, statement in enumerate(statements)
+        if statement.lstrip().startswith((f"INSERT INTO {table} ", f"UPDATE {table} "))
+    )
+    assert response.status_code == 200
+    assert "RETURNING" in statements[write]
+    assert not any(
+        statement.lstrip().startswith("SELECT") and f"FROM {table} " in statement
+        for statement in statements[write + 1:]
+    )
+    stored = client.get(f"/{path.split('/')[1]}/{response.json()['id']}").json()
+    assert {key: stored[key] for key in body} == {
+        key: response.json()[key] for key in body
+    }
+
+
+@pytest.mark.parametrize("path", [
+    "/performance_reviews/999999", "/salaries/999999", "/employees/999999",
+])
+def test_writing_a_missing_row_answers_404(client: TestClient, path: str) -> None:
+    body = {
+        "performance_reviews": REVIEW, "salaries": SALARY, "employees": EMPLOYEE,
+    }[path.split("/")[1]]
+
+    assert client.put(path, json=body).status_code == 404
+    assert client.delete(path).status_code == 404
+
+
+def test_deleting_an_employee_deletes_their_history(
+        client: TestClient, db: Session,
+    ) -> None:
+    assert client.delete("/employees/1").status_code == 204
+
+    for model in (Salary, PerformanceReview):
+        assert db.execute(
+            select(func.count()).select_from(model).where(model.employee_id == 1),
+        ).scalar() == 0
+
+
+def test_deleting_a_department_detaches_its_employees(
+        client: TestClient, db: Session,
+    ) -> None:
+    members = db.execute(
+        select(func.count()).where(Employee.department_id == 3),
+    ).scalar()
+
+    assert client.delete("/departments/3").status_code == 204
+    assert client.get("/departments/3").status_code == 404
+    assert members > 0
+    assert db.execute(
+        select(func.count()).where(Employee.department_id.is_(None)),
+    ).scalar() == members
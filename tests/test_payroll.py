@@ -0,0 +1,111 @@
+"""Tests of the monthly payroll time series and its closed-month cache."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.salary import Salary
+from src.pwcexercise.services import payroll_service
+from src.pwcexercise.services.salary_service import valid_on
+from tests.test_cache_freshness import write_as_another_worker
+
+PATH = "/salaries/payroll_timeseries"
+
+
+def measured(db: Session, department_id: int, day: date) -> tuple[float, int]:
+    """Return the payroll and headcount of a department on ``day``, from the tables."""
+    payroll = db.execute(
+        select(func.coalesce(func.sum(Salary.monthly_income), 0.0))
+        .join(Employee, Employee.id == Salary.employee_id)
+        .where(Employee.department_id == department_id, valid_on(day)),
+    ).scalar_one()
+    headcount = db.execute(
+        select(func.count())
+        .where(Employee.department_id == department_id, Employee.hire_date <= day),
+    ).scalar_one()
+    return payroll, headcount
+
+
+@pytest.fixture
+def swept(monkeypatch: pytest.MonkeyPatch) -> list[list[date]]:
+    """Record the days each call had to compute instead of reading the cache."""
+    calls = []
+    sweep = payroll_service._sweep  # noqa: SLF001
+
+    def recording_sweep(db: Session, points: list[date]) -> dict:
+        calls.append(points)
+        return sweep(db, points)
+
+    monkeypatch.setattr(payroll_service, "_sweep", recording_sweep)
+    return calls
+
+
+def test_write_to_the_current_month_keeps_older_months_cached(
+        client: TestClient, swept: list[list[date]],
+    ) -> None:
+    client.get(PATH)
+    response = client.post("/salaries/", json={
+        "employee_id": 1,
+        "monthly_income": 5000.0,
+        "hourly_rate": 30.0,
+        "effective_date": date.today().isoformat(),
+    })
+    client.get(PATH)
+
+    assert response.status_code == 200
+    assert len(swept[0]) == 5 * 12
+    assert swept[1] == [date.today()]
+
+
+def test_other_workers_write_only_drops_the_months_from_its_date(
+        client: TestClient, db: Session, swept: list[list[date]],
+    ) -> None:
+    first_open = date.today().replace(day=1)
+    salary_id, effective_date = db.execute(
+        select(Salary.id, Salary.effective_date)
+        .where(
+            Salary.effective_date >= first_open - timedelta(days=365),
+            Salary.effective_date < first_open - timedelta(days=62),
+        )
+        .limit(1),
+    ).one()
+    client.get(PATH)
+
+    write_as_another_worker(db, salary_id, 1e6)
+    client.get(PATH)
+
+    assert min(swept[1]) >= effective_date
+    assert min(swept[1]) < effective_date + timedelta(days=31)
+    assert len(swept[1]) < len(swept[0])
+
+
+def test_points_add_up_the_salaries_in_effect_at_each_month_end(
+        client: TestClient, db: Session,
+    ) -> None:
+    today = date.today()
+    [series] = client.get(PATH, params={"years": 1, "department_id": 1}).json()[
+        "series"
+    ]
+
+    assert series["department_id"] == 1
+    assert len(series["points"]) == 12
+    for point in series["points"][-3:]:
+        month = date.fromisoformat(f"{point['month']}-01")
+        next_month = (month + timedelta(days=32)).replace(day=1)
+        day = min(next_month - timedelta(days=1), today)
+        payroll, headcount = measured(db, 1, day)
+        assert point["payroll"] == pytest.approx(payroll, abs=0.01)
+        assert point["headcount"] == headcount
+    assert series["points"][-1]["month"] == today.strftime("%Y-%m")
+
+
+def test_years_beyond_the_limit_are_refused(client: TestClient) -> None:
+    years = payroll_service.MAX_YEARS + 1
+
+    assert client.get(PATH, params={"years": years}).status_code == 422
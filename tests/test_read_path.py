@@ -0,0 +1,51 @@
+"""The Core list endpoints answer what the ORM would load."""
+
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.performance_review import PerformanceReview
+from src.pwcexercise.models.salary import Salary
+from src.pwcexercise.schemas.employee import EmployeeSchema
+from src.pwcexercise.schemas.performance_review import PerformanceReviewSchema
+from src.pwcexercise.schemas.salary import SalarySchema
+
+
+def by_id(rows: list[dict]) -> list[dict]:
+    """Return ``rows`` in ID order."""
+    return sorted(rows, key=lambda row: row["id"])
+
+
+def test_employee_list_matches_the_orm_objects(client: TestClient, db: Session) -> None:
+    listed = client.get("/employees/", params={"sort": "id", "limit": 50}).json()
+
+    employees = db.scalars(select(Employee).order_by(Employee.id).limit(50))
+    expected = [
+        EmployeeSchema.model_validate(employee).model_dump(mode="json")
+        for employee in employees
+    ]
+    assert len(listed) == 50
+    for item, orm in zip(listed, expected):
+        assert by_id(item.pop("salaries")) == by_id(orm.pop("salaries"))
+        assert by_id(item.pop("performance_reviews")) == by_id(
+            orm.pop("performance_reviews"),
+        )
+        assert item == orm
+
+
+def test_salary_and_review_lists_match_the_orm_objects(
+        client: TestClient, db: Session,
+    ) -> None:
+    salaries = db.scalars(select(Salary))
+    reviews = db.scalars(select(PerformanceReview))
+
+    assert by_id(client.get("/salaries/").json()) == by_id(
+        [SalarySchema.model_validate(s).model_dump(mode="json") for s in salaries],
+    )
+    assert by_id(client.get("/performance_reviews/").json()) == by_id([
+        PerformanceReviewSchema.model_validate(r).model_dump(mode="json")
+        for r in reviews
+    ])
@@ -0,0 +1,102 @@
+"""Tests of the process-wide cache of the departments and job titles."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.department import Department
+from src.pwcexercise.models.reference_version import ReferenceVersion
+from src.pwcexercise.services import reference_data_service
+from src.pwcexercise.services.reference_data_service import (
+    ReferenceTable,
+    bump_version,
+)
+
+DEPARTMENTS = Department.__table__
+
+EMPLOYEE = {
+    "emp_id": "ZZ001", "age": 30, "department_id": 1,
+    "hire_date": "2020-01-01", "job_title_id": 1,
+}
+
+
+def written_by_another_worker(db: Session, statement: object) -> None:
+    """Run a write to the departments without refreshing this process' cache."""
+    db.execute(statement)
+    bump_version(db, DEPARTMENTS)
+    db.flush()
+
+
+def test_cached_reads_run_no_query(db: Session, statements: list[str]) -> None:
+    departments = ReferenceTable(DEPARTMENTS, check_interval=3600)
+    departments.all(db)
+    statements.clear()
+
+    name = departments.get(db, 1).name
+    listed = departments.all(db)
+
+    assert statements == []
+    assert listed[0].name == name
+
+
+def test_a_write_bumps_the_version_and_reloads(
+        client: TestClient, db: Session,
+    ) -> None:
+    def version() -> int:
+        return db.execute(
+            select(ReferenceVersion.version)
+            .where(ReferenceVersion.table_name == "departments"),
+        ).scalar() or 0
+
+    client.get("/departments/")
+    before = version()
+
+    client.put("/departments/1", json={"name": "Renamed"})
+
+    assert version() == before + 1
+    assert reference_data_service.departments.get(db, 1).name == "Renamed"
+    assert client.get("/departments/1").json()["name"] == "Renamed"
+
+
+def test_a_row_created_elsewhere_is_found_on_the_first_miss(db: Session) -> None:
+    departments = ReferenceTable(DEPARTMENTS, check_interval=3600)
+    departments.all(db)
+
+    written_by_another_worker(db, insert(DEPARTMENTS).values(id=999, name="New"))
+
+    assert departments.get(db, 999).name == "New"
+
+
+def test_a_rename_elsewhere_is_seen_after_the_interval(db: Session) -> None:
+    departments = ReferenceTable(DEPARTMENTS, check_interval=0.05)
+    old_name = departments.get(db, 1).name
+
+    written_by_another_worker(
+        db, update(DEPARTMENTS).where(DEPARTMENTS.c.id == 1).values(name="Renamed"),
+    )
+
+    assert departments.get(db, 1).name == old_name
+    time.sleep(0.06)
+    assert departments.get(db, 1).name == "Renamed"
+
+
+@pytest.mark.parametrize(("field", "detail"), [
+    ("department_id", "Department not found"),
+    ("job_title_id", "Job title not found"),
+])
+def test_an_employee_with_missing_references_answers_404(
+        client: TestClient, field: str, detail: str,
+    ) -> None:
+    employee = {**EMPLOYEE, field: 999}
+
+    for response in (
+        client.post("/employees/", json=employee),
+        client.put("/employees/1", json=employee),
+    ):
+        assert response.status_code == 404
+        assert response.json()["detail"] == detail
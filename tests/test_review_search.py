@@ -0,0 +1,69 @@
+"""Tests of the full-text search over performance review comments."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+PATH = "/performance_reviews/search"
+
+
+@pytest.fixture
+def review(client: TestClient) -> dict:
+    """A review whose comment shares no word with the seeded ones."""
+    return client.post("/performance_reviews/", json={
+        "employee_id": 3,
+        "review_date": "2026-01-02",
+        "score": 5,
+        "comments": "Exceptional mentoring of the juniors",
+    }).json()
+
+
+def search(client: TestClient, q: str, **params: object) -> list[dict]:
+    """Return the matches of ``q`` on the page ``params`` select."""
+    response = client.get(PATH, params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()["items"]
+
+
+def test_words_prefixes_and_phrases_match(client: TestClient, review: dict) -> None:
+    for q in ("mentor*", '"mentoring of the juniors"', "mentoring"):
+        items = search(client, q)
+        assert [item["id"] for item in items] == [review["id"]]
+    assert items[0]["snippet"] == "Exceptional [mentoring] of the juniors"
+
+
+def test_filters_restrict_the_matches(client: TestClient, review: dict) -> None:
+    assert search(client, "mentoring", employee_id=4) == []
+    assert search(client, "mentoring", date_from="2026-01-03") == []
+    assert len(search(client, "mentoring", employee_id=3, date_to="2026-01-02")) == 1
+
+
+def test_index_follows_updates_and_deletes(client: TestClient, review: dict) -> None:
+    client.put(f"/performance_reviews/{review['id']}", json={
+        **{key: review[key] for key in ("employee_id", "review_date", "score")},
+        "comments": "Outstanding coaching",
+    })
+    assert search(client, "mentoring") == []
+    assert [item["id"] for item in search(client, "coaching")] == [review["id"]]
+
+    client.delete(f"/performance_reviews/{review['id']}")
+    assert search(client, "coaching") == []
+
+
+def test_pages_are_ordered_by_rank(client: TestClient) -> None:
+    first = client.get(PATH, params={"q": "review", "limit": 5}).json()
+    second = search(client, "review", limit=5, offset=5)
+
+    ranks = [item["rank"] for item in first["items"] + second]
+    assert ranks == sorted(ranks)
+    assert first["next_offset"] == 5
+    assert not {item["id"] for item in first["items"]} & {i["id"] for i in second}
+
+
+def test_invalid_query_answers_400(client: TestClient) -> None:
+    response = client.get(PATH, params={"q": '"unbalanced'})
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid search query")
+    assert client.get(PATH, params={"q": "review", "limit": 1}).status_code == 200
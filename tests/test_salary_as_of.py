@@ -0,0 +1,84 @@
+"""Tests of the as-of salary queries and the validity intervals behind them."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.salary import OPEN_END, Salary
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def raised(client: TestClient, db: Session) -> tuple[Salary, dict]:
+    """Give an employee paid since a year ago a raise effective a month ago."""
+    old = db.scalars(
+        select(Salary)
+        .where(Salary.effective_date < TODAY - timedelta(days=365))
+        .limit(1),
+    ).one()
+    response = client.post("/salaries/", json={
+        "employee_id": old.employee_id,
+        "monthly_income": old.monthly_income + 500,
+        "hourly_rate": old.hourly_rate,
+        "effective_date": (TODAY - timedelta(days=30)).isoformat(),
+    })
+    assert response.status_code == 200
+    return old, response.json()
+
+
+def active_salary(client: TestClient, employee_id: int, day: date) -> dict | None:
+    """Return the salary of the employee on ``day``, or None when they had none."""
+    response = client.get(
+        f"/employees/{employee_id}/active_salary", params={"as_of": day.isoformat()},
+    )
+    return response.json().get("active_salary")
+
+
+def test_each_day_is_answered_with_the_salary_then_in_effect(
+        client: TestClient, db: Session, raised: tuple[Salary, dict],
+    ) -> None:
+    old, new = raised
+    db.refresh(old)
+
+    assert old.effective_to == TODAY - timedelta(days=30)
+    assert active_salary(client, old.employee_id, TODAY)["id"] == new["id"]
+    assert active_salary(
+        client, old.employee_id, TODAY - timedelta(days=31),
+    )["id"] == old.id
+    assert active_salary(
+        client, old.employee_id, old.effective_date - timedelta(days=1),
+    ) is None
+
+
+def test_bulk_as_of_and_listing_agree(
+        client: TestClient, raised: tuple[Salary, dict],
+    ) -> None:
+    old, _ = raised
+    day = (TODAY - timedelta(days=45)).isoformat()
+
+    bulk = client.post("/salaries/as_of", json={
+        "as_of": day, "employee_ids": [old.employee_id],
+    }).json()
+    listed = client.get("/salaries/", params={"as_of": day}).json()
+
+    assert [salary["id"] for salary in bulk] == [old.id]
+    assert old.id in {salary["id"] for salary in listed}
+    assert len({salary["employee_id"] for salary in listed}) == len(listed)
+
+
+def test_deleting_the_raise_reopens_the_previous_interval(
+        client: TestClient, db: Session, raised: tuple[Salary, dict],
+    ) -> None:
+    old, new = raised
+
+    assert client.delete(f"/salaries/{new['id']}").status_code == 204
+
+    db.refresh(old)
+    assert old.effective_to == OPEN_END
+    assert active_salary(client, old.employee_id, TODAY)["id"] == old.id
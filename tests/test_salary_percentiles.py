@@ -0,0 +1,77 @@
+"""Tests of the exact salary percentiles."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.models.employee import Employee
+from src.pwcexercise.models.salary import OPEN_END, Salary
+
+
+def current_incomes(db: Session, **filters: int) -> list[float]:
+    """Return the sorted current incomes, read straight from the tables."""
+    statement = (
+        select(Salary.monthly_income)
+        .join(Employee, Employee.id == Salary.employee_id)
+        .where(Salary.effective_to == OPEN_END)
+    )
+    for column, value in filters.items():
+        statement = statement.where(getattr(Employee, column) == value)
+    return sorted(db.execute(statement).scalars())
+
+
+def order_statistic(values: list[float], percentile: int) -> float:
+    """Return the smallest value with ``percentile``% of the values at or below it."""
+    rank = -(-len(values) * percentile // 100)
+    return values[max(rank - 1, 0)]
+
+
+@pytest.mark.parametrize(("path", "filters"), [
+    ("/salaries/percentiles", {}),
+    ("/departments/1/salary_percentiles", {"department_id": 1}),
+    ("/job_titles/1/salary_percentiles", {"job_title_id": 1}),
+])
+def test_percentiles_are_the_exact_order_statistics(
+        client: TestClient, db: Session, path: str, filters: dict,
+    ) -> None:
+    incomes = current_incomes(db, **filters)
+    response = client.get(path, params={"q": [0, 10, 50, 90, 99, 100]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == len(incomes)
+    assert body["exact"] is True
+    assert body["rank_error"] == 0.0
+    assert body["percentiles"] == {
+        f"p{p}": order_statistic(incomes, p) for p in (0, 10, 50, 90, 99, 100)
+    }
+
+
+def test_percentiles_follow_salary_writes(client: TestClient, db: Session) -> None:
+    employee_id = db.execute(
+        select(Employee.id).where(Employee.department_id == 1).limit(1),
+    ).scalar_one()
+    path = "/departments/1/salary_percentiles"
+    before = client.get(path, params={"q": [100]}).json()["percentiles"]["p100"]
+
+    client.post("/salaries/", json={
+        "employee_id": employee_id,
+        "monthly_income": before + 1000,
+        "hourly_rate": 10.0,
+        "effective_date": date.today().isoformat(),
+    })
+
+    assert client.get(path, params={"q": [100]}).json()["percentiles"] == {
+        "p100": before + 1000,
+    }
+
+
+def test_percentiles_outside_0_to_100_are_refused(client: TestClient) -> None:
+    response = client.get("/salaries/percentiles", params={"q": [101]})
+
+    assert response.status_code == 400
@@ -0,0 +1,52 @@
+"""Tests of the seeded snapshot fixtures."""
+
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.config.db import SessionLocal
+from src.pwcexercise.config.write_queue import queue_of, write_queue
+from src.pwcexercise.models.department import Department
+from src.pwcexercise.models.salary import Salary
+
+NEW_SALARY = {
+    "employee_id": 1,
+    "monthly_income": 123456.0,
+    "hourly_rate": 10.0,
+    "effective_date": "2030-01-01",
+}
+
+
+def test_writes_are_visible_within_the_test(client: TestClient, db: Session) -> None:
+    department = client.post("/departments/", json={"name": "Fixture department"})
+    salary = client.post("/salaries/", json=NEW_SALARY)
+
+    assert department.status_code == 200
+    assert salary.status_code == 200
+    assert "Fixture department" in [
+        row["name"] for row in client.get("/departments/").json()
+    ]
+    assert client.get(f"/salaries/{salary.json()['id']}").json()["monthly_income"] == (
+        NEW_SALARY["monthly_income"]
+    )
+
+
+def test_each_test_starts_from_the_snapshot(db: Session) -> None:
+    assert db.execute(
+        select(func.count()).where(Department.name == "Fixture department"),
+    ).scalar() == 0
+    assert db.execute(
+        select(func.count())
+        .where(Salary.monthly_income == NEW_SALARY["monthly_income"]),
+    ).scalar() == 0
+    assert db.execute(select(func.count()).select_from(Department)).scalar() > 0
+
+
+def test_writes_use_a_queue_of_the_test(client: TestClient, db: Session) -> None:
+    response = client.post("/departments/", json={"name": "Queued in the test"})
+
+    assert response.status_code == 200
+    assert queue_of(db) is not write_queue
+    assert write_queue.session_factory is SessionLocal
@@ -0,0 +1,95 @@
+"""The prebuilt hot lookups read the right rows from SQLAlchemy's compiled cache."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.orm import Session
+
+from src.pwcexercise.services import (
+    employee_service,
+    performance_review_service,
+    salary_service,
+)
+
+LOOKUPS = [
+    employee_service.get_employee_by_id,
+    employee_service.get_active_salary,
+    employee_service.get_latest_performance_review,
+    salary_service.get_salary_by_id,
+    salary_service.get_highest_salary_in_last_six_months,
+    performance_review_service.get_performance_review_by_id,
+]
+
+
+@pytest.fixture
+def cache_stats(seeded_engine: Engine) -> Iterator[list[CacheStats]]:
+    """Record whether each statement run was compiled or found in the cache."""
+    stats = []
+
+    def record(*args: object) -> None:
+        stats.append(args[4].cache_hit)
+
+    event.listen(seeded_engine, "before_cursor_execute", record)
+    yield stats
+    event.remove(seeded_engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("lookup", LOOKUPS, ids=lambda lookup: lookup.__name__)
+def test_repeated_lookups_reuse_the_compiled_statement(
+        db: Session, cache_stats: list[CacheStats],
+        lookup: Callable[[int, Session], object],
+    ) -> None:
+    lookup(1, db)
+    cache_stats.clear()
+
+    lookup(2, db)
+
+    assert cache_stats == [CacheStats.CACHE_HIT]
+
+
+@pytest.mark.parametrize("lookup", LOOKUPS, ids=lambda lookup: lookup.__name__)
+def test_missing_ids_find_nothing(
+        db: Session, lookup: Callable[[int, Session], object],
+    ) -> None:
+    assert lookup(999_999, db) is None
+
+
+@pytest.mark.parametrize(("path", "lookup"), [
+    ("/employees/{}", employee_service.get_employee_by_id),
+    ("/salaries/{}", salary_service.get_salary_by_id),
+    (
+        "/performance_reviews/{}",
+        performance_review_service.get_performance_review_by_id,
+    ),
+])
+def test_lookups_return_the_rows_the_routes_serve(
+        client: TestClient, db: Session,
+        path: str, lookup: Callable[[int, Session], object],
+    ) -> None:
+    row = jsonable_encoder(lookup(5, db)._asdict())
+    served = client.get(path.format(5)).json()
+
+    assert {key: served[key] for key in row if key in served} == {
+        key: value for key, value in row.items() if key in served
+    }
+
+
+def test_active_salary_and_latest_review_match_their_routes(
+        client: TestClient, db: Session,
+    ) -> None:
+    salary = employee_service.get_active_salary(5, db)
+    review = employee_service.get_latest_performance_review(5, db)
+
+    assert client.get("/employees/5/active_salary").json()["active_salary"]["id"] == (
+        salary.id
+    )
+    assert client.get(
+        "/employees/5/latest_performance_review",
+    ).json()["latest_performance_review"]["id"] == review.id
@@ -0,0 +1,157 @@
+"""Tests of the group-committing write queue."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.pwcexercise.config.db import use_explicit_transactions
+from src.pwcexercise.config.write_queue import (
+    WRITE_QUEUE_KEY,
+    WriteQueue,
+    execute_write,
+)
+from src.pwcexercise.models.base import Base
+from src.pwcexercise.models.department import Department
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> Iterator[tuple[Path, Engine]]:
+    path = tmp_path / "writes.db"
+    engine = create_engine(f"sqlite:///{path}")
+    use_explicit_transactions(engine)
+    Base.metadata.create_all(engine)
+    yield path, engine
+    engine.dispose()
+
+
+def count_departments(path: Path) -> int:
+    """Count the departments committed, as another process sees them."""
+    with sqlite3.connect(path) as outsider:
+        return outsider.execute("SELECT count(*) FROM departments").fetchone()[0]
+
+
+def add_department(name: str) -> object:
+    def mutation(session: Session) -> int:
+        return session.execute(
+            insert(Department).values(name=name).returning(Department.id),
+        ).scalar_one()
+    return mutation
+
+
+def test_batch_is_invisible_until_its_single_commit(
+        database: tuple[Path, Engine],
+    ) -> None:
+    path, engine = database
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, *args) -> None:  # noqa: ANN001
+        statements.append(statement)
+
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+
+    queue = WriteQueue(sessionmaker(bind=engine), max_batch=3, max_delay=5)
+    futures = [
+        queue.submit(add_department("Sales")),
+        queue.submit(add_department("Legal")),
+        # Runs after the other two, in the same transaction.
+        queue.submit(lambda session: count_departments(path)),
+    ]
+    results = [future.result(10) for future in futures]
+    queue.close()
+
+    assert results[2] == 0
+    assert count_departments(path) == 2
+    assert len(commits) == 1
+    assert statements.count("BEGIN IMMEDIATE") == 1
+    assert statements.index("BEGIN IMMEDIATE") < statements.index(
+        "SAVEPOINT sa_savepoint_1",
+    )
+
+
+def test_failing_mutation_only_rolls_back_its_savepoint(
+        database: tuple[Path, Engine],
+    ) -> None:
+    path, engine = database
+    queue = WriteQueue(sessionmaker(bind=engine), max_batch=3, max_delay=5)
+    futures = [
+        queue.submit(add_department("Sales")),
+        queue.submit(add_department("Sales")),
+        queue.submit(add_department("Legal")),
+    ]
+    queue.close()
+
+    assert futures[0].result(10) == 1
+    with pytest.raises(Exception, match="UNIQUE"):
+        futures[1].result(10)
+    assert futures[2].result(10) is not None
+    assert count_departments(path) == 2
+
+
+def test_timed_out_mutation_is_cancelled(database: tuple[Path, Engine]) -> None:
+    path, engine = database
+    release = threading.Event()
+    queue = WriteQueue(sessionmaker(bind=engine), max_batch=1, max_delay=0)
+    blocking = queue.submit(lambda session: release.wait(10))
+
+    with pytest.raises(TimeoutError, match="not applied"):
+        queue.execute(add_department("Sales"), timeout=0.05)
+    release.set()
+    blocking.result(10)
+    queue.close()
+
+    assert count_departments(path) == 0
+
+
+def test_caller_reads_its_own_write(database: tuple[Path, Engine]) -> None:
+    _, engine = database
+    factory = sessionmaker(bind=engine)
+    queue = WriteQueue(factory)
+    factory.configure(info={WRITE_QUEUE_KEY: queue})
+    count = select(func.count()).select_from(Department)
+
+    with factory() as db:
+        assert db.execute(count).scalar() == 0
+        execute_write(db, add_department("Sales"))
+        assert db.execute(count).scalar() == 1
+    queue.close()
+
+
+@pytest.mark.parametrize(("path", "table"), [
+    ("/departments/", "departments"),
+    ("/job_titles/", "job_titles"),
+])
+def test_reference_writes_go_through_the_writer(
+        client: TestClient, seeded_engine: Engine, path: str, table: str,
+    ) -> None:
+    written = (f"INSERT INTO {table} ", f"UPDATE {table} ", f"DELETE FROM {table} ")
+    writers = []
+
+    def record(conn, cursor, statement, *args) -> None:  # noqa: ANN001
+        if statement.startswith(written):
+            writers.append(threading.current_thread().name)
+
+    event.listen(seeded_engine, "before_cursor_execute", record)
+    try:
+        created = client.post(path, json={"name": "Written by the queue"})
+        updated = client.put(
+            f"{path}{created.json()['id']}", json={"name": "Renamed by the queue"},
+        )
+        deleted = client.delete(f"{path}{created.json()['id']}")
+    finally:
+        event.remove(seeded_engine, "before_cursor_execute", record)
+
+    assert (created.status_code, updated.status_code) == (200, 200)
+    assert updated.json()["name"] == "Renamed by the queue"
+    assert deleted.status_code == 204
+    assert writers == ["db-writer"] * 3